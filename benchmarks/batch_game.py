@@ -0,0 +1,78 @@
+"""Plies per second of random playouts with `Game` and with `BatchGame`.
+
+Run from the repository root with `python -m benchmarks.batch_game`.
+
+Each run plays games with uniformly random moves from the initial
+position until they are over, or until `--max-plies`.
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.game.batch_game import NO_MOVE, BatchGame, random_moves
+from src.game.game import Game
+
+
+def scalar_playouts(count: int, max_plies: int, seed: int = 0) -> int:
+    """Play `count` games with `Game`, and return the plies played."""
+    rng = random.Random(seed)
+    plies = 0
+    for _ in range(count):
+        game = Game()
+        for _ in range(max_plies):
+            moves = game.available_move_codes()
+            if game.is_game_over() or not moves:
+                break
+            game.ply_code(rng.choice(moves))
+            plies += 1
+
+    return plies
+
+
+def batch_playouts(count: int, max_plies: int, seed: int = 0) -> int:
+    """Play `count` games with a `BatchGame`, and return the plies played.
+
+    The games that are over are dropped from the batch.
+    """
+    rng = np.random.default_rng(seed)
+    games = BatchGame(count)
+    plies = 0
+    for _ in range(max_plies):
+        moves = random_moves(games.legal_moves(), rng)
+        playing = moves != NO_MOVE
+        if not playing.all():
+            games = games.take(np.flatnonzero(playing))
+            moves = moves[playing]
+        if not len(games):
+            break
+        games.ply(moves)
+        plies += len(games)
+
+    return plies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument("--scalar-games", type=int, default=200)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[64, 1024, 16384]
+    )
+    args = parser.parse_args()
+
+    runs = [("Game", args.scalar_games, scalar_playouts)]
+    runs += [("BatchGame", size, batch_playouts) for size in args.batch_sizes]
+
+    print(f"{'simulator':<10} {'games':>6} {'plies':>9} {'plies/s':>11}")
+    for name, count, playouts in runs:
+        start = time.perf_counter()
+        plies = playouts(count, args.max_plies)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} {count:>6} {plies:>9} {plies / elapsed:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
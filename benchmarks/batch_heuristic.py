@@ -0,0 +1,92 @@
+"""Cost per leaf of `heuristic` against `heuristic_batch`.
+
+Run from the repository root with `python -m benchmarks.batch_heuristic`.
+"""
+
+import argparse
+import time
+from random import Random
+from typing import List
+
+from src.game.game import Game
+from src.minimax.batch_heuristics import boards_from_masks, heuristic_batch
+from src.minimax.heuristics import heuristic
+from src.minimax.search import search_best_move
+
+
+def random_positions(count: int, seed: int = 0) -> List[Game]:
+    random = Random(seed)
+    games = []
+    while len(games) < count:
+        game = Game()
+        for _ in range(random.randrange(0, 60)):
+            moves = game.available_moves()
+            if game.is_game_over() or not moves:
+                break
+            game.ply(random.choice(moves))
+        games.append(game)
+
+    return games
+
+
+def per_leaf_costs(games: List[Game], batch_size: int, repeat: int) -> tuple:
+    """Return the microseconds per position of the scalar and batch paths."""
+    games = games[:batch_size]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for game in games:
+            heuristic(game)
+    scalar = (time.perf_counter() - start) / (repeat * len(games))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        # Includes building the arrays from the boards, as the search does
+        boards = boards_from_masks(
+            [game.board.tigers for game in games],
+            [game.board.goats for game in games],
+        )
+        heuristic_batch(
+            boards,
+            [game.game_state.positioned_goats for game in games],
+            [game.game_state.captured_goats for game in games],
+        )
+    batch = (time.perf_counter() - start) / (repeat * len(games))
+
+    return scalar * 1e6, batch * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cutoff", type=int, default=3)
+    args = parser.parse_args()
+
+    games = random_positions(10_000)
+    print(f"{'batch size':>10} {'scalar us':>10} {'batch us':>10}")
+    for batch_size in (1, 8, 20, 100, 1_000, 10_000):
+        repeat = max(1, 20_000 // batch_size)
+        scalar, batch = per_leaf_costs(games, batch_size, repeat)
+        print(f"{batch_size:>10} {scalar:>10.2f} {batch:>10.2f}")
+
+    print()
+    print(f"Search from the initial position, cutoff {args.cutoff}")
+    for name, batch_heuristic in (
+        ("scalar", None),
+        ("batch", heuristic_batch),
+    ):
+        result = search_best_move(
+            Game(),
+            heuristic,
+            cutoff=args.cutoff,
+            batch_heuristic=batch_heuristic,
+        )
+        statistics = result.statistics
+        print(
+            f"{name:>7}: move {result.move}, value {result.value},"
+            f" {statistics.leaves} leaves in {statistics.time:.3f}s"
+            f" ({statistics.time / statistics.leaves * 1e6:.1f} us per leaf)"
+        )
+
+
+if __name__ == "__main__":
+    main()
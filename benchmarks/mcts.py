@@ -0,0 +1,51 @@
+"""Iterations per second of the Monte Carlo tree search, by the number of
+leaves whose playouts are played together.
+
+Run from the repository root with `python -m benchmarks.mcts`.
+
+Each position of the benchmark suite, and some random ones, is searched
+for `--time` seconds with each batch size, without and with the heuristic
+as a prior. A batch of 1 plays each playout alone.
+"""
+
+import argparse
+
+from benchmarks.suite import POSITIONS, position, random_positions
+from src.minimax.heuristics import heuristic
+from src.minimax.mcts import MonteCarloTreeSearch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--time", type=float, default=1.0)
+    parser.add_argument("--random", type=int, default=4)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128]
+    )
+    args = parser.parse_args()
+
+    games = [position(name) for name in POSITIONS]
+    games += random_positions(args.random)
+
+    print(f"{'prior':<6} {'batch':>5} {'iterations/s':>12} {'depth':>6}")
+    for prior in (None, heuristic):
+        for batch_size in args.batch_sizes:
+            iterations = 0
+            seconds = 0.0
+            depth = 0
+            for game in games:
+                mcts = MonteCarloTreeSearch(
+                    heuristic=prior, batch_size=batch_size, seed=0
+                )
+                result = mcts.search(game, time_budget=args.time)
+                iterations += result.statistics.nodes
+                seconds += result.statistics.time
+                depth += result.statistics.max_depth
+            print(
+                f"{'yes' if prior else 'no':<6} {batch_size:>5}"
+                f" {iterations / seconds:>12.0f} {depth / len(games):>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
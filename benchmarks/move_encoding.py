@@ -0,0 +1,102 @@
+"""Memory and allocations of a depth-4 search, and of the move lists.
+
+Run from the repository root with `python -m benchmarks.move_encoding`.
+
+For each position of the benchmark suite, a search without
+transposition table is run three times: once timed, once under
+`tracemalloc` for its peak memory, and once counting the move objects
+(`BoardSquare`, `Movement` and `Capture`) created while it runs.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from benchmarks.suite import POSITIONS, position
+from src.game.game_types import BoardSquare, Capture, Movement
+from src.minimax.heuristics import heuristic
+from src.minimax.search import search_best_move
+
+
+def search(game, cutoff: int):
+    return search_best_move(game, heuristic, cutoff=cutoff)
+
+
+def move_objects(name: str, cutoff: int) -> int:
+    """Return the number of move objects created by the search."""
+    created = 0
+    originals = {}
+
+    def counting(init):
+        def counted(*args, **kwargs):
+            nonlocal created
+            created += 1
+            init(*args, **kwargs)
+
+        return counted
+
+    game = position(name)
+    for kind in (BoardSquare, Movement, Capture):
+        originals[kind] = kind.__init__
+        kind.__init__ = counting(kind.__init__)
+    try:
+        search(game, cutoff)
+    finally:
+        for kind, init in originals.items():
+            kind.__init__ = init
+
+    return created
+
+
+def peak_memory(name: str, cutoff: int) -> int:
+    game = position(name)
+    tracemalloc.start()
+    search(game, cutoff)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def move_list_size(name: str) -> int:
+    """Return the bytes of the moves of the position, as generated for the
+    search, not counting the objects shared by all the lists."""
+    game = position(name)
+    if hasattr(game, "available_move_codes"):
+        return sys.getsizeof(game.available_move_codes())
+
+    moves = game.available_moves()
+    size = sys.getsizeof(moves)
+    for move, again in zip(moves, game.available_moves()):
+        if move is not again:
+            # A new object in each call
+            size += sys.getsizeof(move)
+            if hasattr(move, "__dict__"):
+                size += sys.getsizeof(move.__dict__)
+
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cutoff", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'position':<10} {'nodes':>7} {'time':>7} {'peak KiB':>9}"
+        f" {'objects':>8} {'moves B':>7}"
+    )
+    for name in POSITIONS:
+        start = time.perf_counter()
+        result = search(position(name), args.cutoff)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<10} {result.statistics.nodes:>7} {elapsed:>6.2f}s"
+            f" {peak_memory(name, args.cutoff) / 1024:>9.0f}"
+            f" {move_objects(name, args.cutoff):>8}"
+            f" {move_list_size(name):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
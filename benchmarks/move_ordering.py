@@ -0,0 +1,66 @@
+"""Nodes searched at fixed depth from the initial position, with and
+without move ordering.
+
+Run from the repository root with `python -m benchmarks.move_ordering`.
+"""
+
+import argparse
+import time
+
+from src.game.game import Game
+from src.minimax.heuristics import heuristic
+from src.minimax.minimax import alpha_beta_search
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search_tree import SearchTree
+from src.minimax.transposition_table import TranspositionTable
+
+
+def count_nodes(node: SearchTree) -> int:
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def run(cutoff: int, ordered: bool, with_table: bool) -> tuple:
+    """Return the nodes, time and root value of a search of `Game()`."""
+    start = time.perf_counter()
+    root = alpha_beta_search(
+        game=Game(),
+        cutoff=cutoff,
+        heuristic=heuristic,
+        table=TranspositionTable() if with_table else None,
+        ordering=MoveOrdering() if ordered else None,
+    )
+    elapsed = time.perf_counter() - start
+
+    return count_nodes(root), elapsed, root.value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-cutoff", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'cutoff':>6} {'table':>5} {'plain':>9} {'ordered':>9}"
+        f" {'reduction':>9} {'time':>15}"
+    )
+    for cutoff in range(1, args.max_cutoff + 1):
+        for with_table in (False, True):
+            plain, plain_time, plain_value = run(cutoff, False, with_table)
+            ordered, ordered_time, ordered_value = run(
+                cutoff, True, with_table
+            )
+            if plain_value != ordered_value:
+                raise AssertionError(
+                    f"Different values at cutoff {cutoff}:"
+                    f" {plain_value} != {ordered_value}"
+                )
+
+            print(
+                f"{cutoff:>6} {'yes' if with_table else 'no':>5}"
+                f" {plain:>9} {ordered:>9} {1 - ordered / plain:>9.1%}"
+                f" {plain_time:>6.2f}s -> {ordered_time:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
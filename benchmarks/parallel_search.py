@@ -0,0 +1,86 @@
+"""Speedup of the root-split parallel search over the sequential search,
+on placement positions.
+
+Run from the repository root with `python -m benchmarks.parallel_search`.
+The speedup is bounded by the number of CPUs of the machine.
+"""
+
+import argparse
+import os
+import random
+import time
+
+from src.game.game import Game
+from src.minimax.heuristics import heuristic
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.parallel import ParallelSearch
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+
+def placement_positions(count: int, seed: int) -> list:
+    """Return `count` positions reached by random placement moves."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = Game()
+        for _ in range(rng.randrange(0, 16)):
+            game.ply(rng.choice(game.available_moves()))
+        if game.get_winner() is None:
+            positions.append(game)
+
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cutoff", type=int, default=4)
+    parser.add_argument("--positions", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16]
+    )
+    args = parser.parse_args()
+
+    positions = placement_positions(args.positions, args.seed)
+
+    start = time.perf_counter()
+    moves = [
+        search_best_move(
+            game,
+            heuristic,
+            cutoff=args.cutoff,
+            table=TranspositionTable(),
+            ordering=MoveOrdering(),
+        ).move
+        for game in positions
+    ]
+    sequential = time.perf_counter() - start
+
+    print(f"CPUs: {os.cpu_count()}    sequential: {sequential:.2f}s")
+    print(f"{'workers':>7} {'time':>8} {'speedup':>7} {'nodes':>9}")
+    for workers in args.workers:
+        with ParallelSearch(heuristic, workers) as parallel:
+            # Start the processes before timing
+            parallel.search(Game(), 0)
+
+            start = time.perf_counter()
+            nodes = 0
+            for game, move in zip(positions, moves):
+                result = parallel.search(game, args.cutoff)
+                nodes += result.statistics.nodes
+                if result.move != move:
+                    raise AssertionError(
+                        f"Different move with {workers} workers:"
+                        f" {result.move} != {move}"
+                    )
+            elapsed = time.perf_counter() - start
+
+        print(
+            f"{workers:>7} {elapsed:>7.2f}s {sequential / elapsed:>6.2f}x"
+            f" {nodes:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Reply times of an engine with and without pondering.
+
+Run from the repository root with `python -m benchmarks.pondering`.
+
+From each position of the benchmark suite, and some random ones, the
+engine searches its move, then the opponent "thinks" for `--think`
+seconds and plays either the move the engine expected or a random one.
+The time the engine takes to reply is measured with a new table for each
+move, as `main.py` searches without pondering, and with a `Ponderer`
+that searched during the opponent's turn.
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.suite import POSITIONS, position, random_positions
+from src.minimax.heuristics import heuristic
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.pondering import Ponderer
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+
+def reply_times(game, cutoff: int, think: float, expected: bool, rng):
+    """Return the seconds the engine takes to reply to the opponent's
+    move in `game`, without and with pondering, and if the reply was found
+    while pondering, or None if the game ends before the reply."""
+    ponderer = Ponderer(heuristic, cutoff)
+    result = ponderer.search(game)
+    if result.move is None:
+        return None
+    game.ply(result.move)
+    if game.is_game_over():
+        return None
+
+    ponderer.start(game, _expected_move(result))
+    time.sleep(think)
+
+    moves = game.available_moves()
+    move = _expected_move(result) if expected else None
+    if move is None or move not in moves:
+        move = rng.choice(moves)
+    game.ply(move)
+    if game.is_game_over():
+        ponderer.stop()
+        return None
+
+    start = time.perf_counter()
+    search_best_move(
+        game,
+        heuristic,
+        cutoff=cutoff,
+        table=TranspositionTable(),
+        ordering=MoveOrdering(),
+    )
+    without = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ponderer.search(game)
+    return without, time.perf_counter() - start, ponderer.hits > 0
+
+
+def _expected_move(result):
+    line = result.principal_variation
+    return line[1] if len(line) > 1 else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cutoff", type=int, default=6)
+    parser.add_argument("--think", type=float, default=1.0)
+    parser.add_argument("--random", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    print(
+        f"{'opponent':<10} {'replies':>7} {'pondered':>8}"
+        f" {'without':>8} {'with':>8}"
+    )
+    for expected in (True, False):
+        times = []
+        games = [position(name) for name in POSITIONS]
+        for game in games + random_positions(args.random):
+            replies = reply_times(game, args.cutoff, args.think, expected, rng)
+            if replies is not None:
+                times.append(replies)
+
+        without = sum(reply[0] for reply in times) / len(times)
+        with_pondering = sum(reply[1] for reply in times) / len(times)
+        pondered = sum(reply[2] for reply in times)
+        print(
+            f"{'expected' if expected else 'random':<10} {len(times):>7}"
+            f" {pondered:>8} {without:>7.3f}s {with_pondering:>7.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Size and speed of the binary game records.
+
+Run from the repository root with `python -m benchmarks.records`.
+
+Random games, played with `BatchGame`, are appended to a record file,
+then read back in order with `read_records`, and by index with
+`GameRecords`. Their boards are also replayed. The same games are written
+as the JSON lines of `src.tournament`, for comparison.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.game.batch_game import NO_MOVE, BatchGame, random_moves
+from src.game.records import (
+    GameRecord,
+    GameRecords,
+    append_records,
+    read_records,
+)
+
+
+def random_records(count: int, max_plies: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    games = BatchGame(count)
+    moves = np.full((count, max_plies), NO_MOVE, dtype=np.intp)
+    winners = np.zeros(count, dtype=np.int8)
+    for ply in range(max_plies):
+        legal = games.legal_moves()
+        winners = np.where(winners == 0, games.winners(legal), winners)
+        moves[:, ply] = random_moves(legal, rng)
+        games.ply(moves[:, ply])
+
+    return [
+        GameRecord(
+            "heuristic:time:0.1",
+            "mcts:time:0.1",
+            int(winner) or None,
+            bytes(codes[codes != NO_MOVE].tolist()),
+        )
+        for codes, winner in zip(moves, winners)
+    ]
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--max-plies", type=int, default=200)
+    args = parser.parse_args()
+
+    records = random_records(args.games, args.max_plies)
+    plies = sum(len(record.moves) for record in records)
+    print(f"{args.games} games, {plies / args.games:.1f} plies per game\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "games.bcr")
+        _, seconds = _timed(lambda: append_records(path, records))
+        print(f"write          {args.games / seconds:>10.0f} games/s")
+        size = os.path.getsize(path)
+
+        json_path = os.path.join(directory, "games.jsonl")
+        with open(json_path, "w") as file:
+            for record in records:
+                line = {
+                    "goat": record.goat,
+                    "tiger": record.tiger,
+                    "winner": record.winner,
+                    "moves": [str(play) for play in record.plays],
+                }
+                file.write(json.dumps(line) + "\n")
+        json_size = os.path.getsize(json_path)
+
+        count, seconds = _timed(lambda: sum(1 for _ in read_records(path)))
+        print(f"stream         {count / seconds:>10.0f} games/s")
+        mapped, seconds = _timed(lambda: GameRecords(path))
+        print(f"open (index)   {len(mapped) / seconds:>10.0f} games/s")
+        indexes = np.random.default_rng(1).integers(0, len(mapped), 10000)
+        _, seconds = _timed(lambda: [mapped[int(i)] for i in indexes])
+        print(f"random access  {len(indexes) / seconds:>10.0f} games/s")
+        _, seconds = _timed(
+            lambda: [records[int(i)].boards() for i in indexes[:1000]]
+        )
+        print(f"replay boards  {1000 / seconds:>10.0f} games/s")
+        del mapped
+
+    print(
+        f"\n{size / args.games:.1f} bytes per game,"
+        f" {json_size / args.games:.1f} as JSON lines"
+    )
+
+
+if __name__ == "__main__":
+    main()
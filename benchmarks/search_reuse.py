@@ -0,0 +1,122 @@
+"""Nodes searched in a game when the engines keep their transposition
+tables and move orderings between moves, and when they don't.
+
+Run from the repository root with `python -m benchmarks.search_reuse`.
+
+Games are played from random openings by engines searching up to
+`--cutoff` with new tables for each move. Their moves are then searched
+again, in order, by engines that keep one table and ordering per side for
+the whole game, as `play_alg_vs_alg` does. Both are also given a time per
+move, `--time`, to compare the depth they reach.
+"""
+
+import argparse
+import random
+import time
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.minimax.heuristics import heuristic
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+
+def play(seed: int, cutoff: int, plies: int, opening_plies: int = 4):
+    """Return the positions of a game, before each searched move."""
+    rng = random.Random(seed)
+    game = Game()
+    for _ in range(opening_plies):
+        game.ply(rng.choice(game.available_moves()))
+
+    positions = []
+    while not game.is_game_over() and len(positions) < plies:
+        positions.append(_copy(game))
+        result = search(game, cutoff=cutoff)
+        game.ply(result.move)
+
+    return positions
+
+
+def search(game, table=None, ordering=None, **limit):
+    if table is None:
+        table, ordering = TranspositionTable(), MoveOrdering()
+    else:
+        table.new_search()
+        ordering.age()
+
+    return search_best_move(
+        game, heuristic, table=table, ordering=ordering, **limit
+    )
+
+
+def replay(positions: list, keep: bool, **limit) -> dict:
+    """Search each of `positions`, and return the totals of the searches."""
+    engines = {
+        player: (TranspositionTable(), MoveOrdering()) if keep else (None,)
+        for player in (GOAT_PLAYER, TIGER_PLAYER)
+    }
+    totals = {"nodes": 0, "time": 0.0, "depth": 0, "moves": []}
+    for game in positions:
+        start = time.perf_counter()
+        result = search(game, *engines[game.game_state.player], **limit)
+        totals["time"] += time.perf_counter() - start
+        totals["nodes"] += result.statistics.nodes
+        totals["depth"] += result.statistics.cutoff
+        totals["moves"].append(result.move)
+
+    return totals
+
+
+def _copy(game: Game) -> Game:
+    copy = Game()
+    copy.board.restore(game.board.snapshot())
+    state = game.game_state
+    copy.game_state.player = state.player
+    copy.game_state.positioned_goats = state.positioned_goats
+    copy.game_state.captured_goats = state.captured_goats
+    return copy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cutoff", type=int, default=5)
+    parser.add_argument("--time", type=float, default=0.2)
+    parser.add_argument("--games", type=int, default=4)
+    parser.add_argument("--plies", type=int, default=40)
+    args = parser.parse_args()
+
+    positions = []
+    for seed in range(args.games):
+        positions.append(play(seed, args.cutoff, args.plies))
+    count = sum(len(game) for game in positions)
+    print(f"{count} positions from {args.games} games\n")
+
+    print(
+        f"{'search':<10} {'tables':<7} {'nodes':>9} {'time':>8} {'depth':>6}"
+    )
+    for name, limit in (
+        (f"cutoff {args.cutoff}", {"cutoff": args.cutoff}),
+        (f"time {args.time}", {"time_budget": args.time}),
+    ):
+        for keep in (False, True):
+            totals = {"nodes": 0, "time": 0.0, "depth": 0}
+            moves = []
+            for game in positions:
+                game_totals = replay(game, keep, **limit)
+                moves += game_totals.pop("moves")
+                for key, value in game_totals.items():
+                    totals[key] += value
+            if not keep:
+                fresh_moves = moves
+            print(
+                f"{name:<10} {'kept' if keep else 'new':<7}"
+                f" {totals['nodes']:>9} {totals['time']:>7.2f}s"
+                f" {totals['depth'] / count:>6.2f}"
+            )
+        changed = sum(a != b for a, b in zip(fresh_moves, moves))
+        print(f"{'':<10} {changed} of {count} moves changed\n")
+
+
+if __name__ == "__main__":
+    main()
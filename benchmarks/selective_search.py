@@ -0,0 +1,63 @@
+"""Nodes searched with quiescence and late move reductions.
+
+Run from the repository root with `python -m benchmarks.selective_search`.
+
+Each position of the benchmark suite, and some random ones, is searched
+at each cutoff with a transposition table and move ordering, with and
+without each option of the selective search. Their effect on the play is
+measured with a tournament, such as
+
+    python -m src.tournament results.jsonl time:0.1 \\
+        time:0.1:quiescence:reductions
+"""
+
+import argparse
+import time
+
+from benchmarks.suite import POSITIONS, position, random_positions
+from src.minimax.heuristics import heuristic
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+OPTIONS = {
+    "plain": {},
+    "quiescence": {"quiescence": True},
+    "reductions": {"reductions": True},
+    "both": {"quiescence": True, "reductions": True},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--cutoffs", type=int, nargs="+", default=[3, 4, 5])
+    parser.add_argument("--random", type=int, default=12)
+    args = parser.parse_args()
+
+    games = [position(name) for name in POSITIONS]
+    games += random_positions(args.random)
+
+    print(f"{'options':<11} {'cutoff':>6} {'nodes':>8} {'time':>7}")
+    for name, options in OPTIONS.items():
+        for cutoff in args.cutoffs:
+            nodes = 0
+            start = time.perf_counter()
+            for game in games:
+                result = search_best_move(
+                    game,
+                    heuristic,
+                    cutoff=cutoff,
+                    table=TranspositionTable(),
+                    ordering=MoveOrdering(),
+                    **options,
+                )
+                nodes += result.statistics.nodes
+            elapsed = time.perf_counter() - start
+            print(f"{name:<11} {cutoff:>6} {nodes:>8} {elapsed:>6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
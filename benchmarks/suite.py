@@ -0,0 +1,253 @@
+"""Benchmark suite: perft counts, move generation, heuristic and search
+throughput.
+
+Run from the repository root with
+
+    python -m benchmarks.suite --output results.json
+
+and compare against an earlier run with `--baseline baseline.json`. The
+perft counts must match the baseline exactly, and each throughput may
+drop at most `--threshold` (a fraction) below it; otherwise the run exits
+with an error.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from random import Random
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER, TOTAL_NUMBER_OF_GOATS
+from src.game.game import Game
+from src.minimax.heuristics import heuristic
+from src.minimax.minimax import alpha_beta_search
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+_PIECES = {"T": TIGER_PLAYER, "G": GOAT_PLAYER, ".": 0}
+
+# Positions as lines of the board, the player to move, and the placed
+# and captured goats
+POSITIONS = {
+    "initial": (None, GOAT_PLAYER, 0, 0),
+    "placement": (
+        "T...T/.G.G./..G../.G.../T...T",
+        TIGER_PLAYER,
+        4,
+        0,
+    ),
+    "movement": (
+        "TGGG./GG.GT/G.TGG/GG.GG/TGG.G",
+        GOAT_PLAYER,
+        TOTAL_NUMBER_OF_GOATS,
+        4,
+    ),
+    "captures": (
+        "T.G.T/.GGG./GGT.G/.GGG./T.G..",
+        TIGER_PLAYER,
+        12,
+        1,
+    ),
+}
+
+
+def position(name: str) -> Game:
+    board, player, positioned, captured = POSITIONS[name]
+    game = Game()
+    if board is not None:
+        game.board.board = np.array(
+            [[_PIECES[piece] for piece in line] for line in board.split("/")]
+        )
+    game.game_state.player = player
+    game.game_state.positioned_goats = positioned
+    game.game_state.captured_goats = captured
+    return game
+
+
+def perft(game: Game, depth: int) -> int:
+    """Return the number of move sequences of `depth` plies from `game`.
+
+    Sequences that end the game earlier aren't counted.
+    """
+    if depth == 0:
+        return 1
+    if game.is_game_over():
+        return 0
+
+    count = 0
+    for move in game.available_moves():
+        record = game.ply(move)
+        count += perft(game, depth - 1)
+        game.undo(record)
+
+    return count
+
+
+def random_positions(count: int, seed: int = 0) -> List[Game]:
+    random = Random(seed)
+    games = []
+    while len(games) < count:
+        game = Game()
+        for _ in range(random.randrange(0, 60)):
+            if game.is_game_over():
+                break
+            game.ply(random.choice(game.available_moves()))
+        if not game.is_game_over():
+            games.append(game)
+
+    return games
+
+
+def _rate(
+    function: Callable[[], int], min_time: float, rounds: int = 3
+) -> float:
+    """Return the operations per second of `function`, which returns the
+    number of operations it made.
+
+    The function is called for at least `min_time` seconds, split in
+    `rounds`, and the best round is kept, as the slower ones were slowed
+    down by something else.
+    """
+    best = 0
+    for _ in range(rounds):
+        operations = 0
+        start = time.perf_counter()
+        while True:
+            operations += function()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time / rounds:
+                break
+        best = max(best, operations / elapsed)
+
+    return best
+
+
+def run_perft(max_depth: int, min_time: float) -> tuple:
+    """Return the perft counts of each position, and the leaves per
+    second over all of them."""
+    games = {name: position(name) for name in POSITIONS}
+    counts = {
+        name: [perft(game, depth) for depth in range(1, max_depth + 1)]
+        for name, game in games.items()
+    }
+
+    def count_leaves() -> int:
+        return sum(perft(game, max_depth) for game in games.values())
+
+    return counts, _rate(count_leaves, min_time)
+
+
+def run_throughput(min_time: float) -> Dict[str, float]:
+    games = random_positions(200)
+
+    def generate_and_play() -> int:
+        count = 0
+        for game in games:
+            for move in game.available_moves():
+                game.undo(game.ply(move))
+                count += 1
+        return count
+
+    def evaluate() -> int:
+        for game in games:
+            heuristic(game)
+        return len(games)
+
+    def tree_search() -> int:
+        root = alpha_beta_search(game=Game(), cutoff=3, heuristic=heuristic)
+        return _count_nodes(root)
+
+    def depth_first_search() -> int:
+        result = search_best_move(
+            position("movement"),
+            heuristic,
+            cutoff=4,
+            table=TranspositionTable(),
+            ordering=MoveOrdering(),
+        )
+        return result.statistics.nodes
+
+    return {
+        "moves_per_second": _rate(generate_and_play, min_time),
+        "heuristic_per_second": _rate(evaluate, min_time),
+        "alpha_beta_nodes_per_second": _rate(tree_search, min_time),
+        "search_nodes_per_second": _rate(depth_first_search, min_time),
+    }
+
+
+def _count_nodes(node) -> int:
+    return 1 + sum(_count_nodes(child) for child in node.children)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return the differences from the baseline that count as failures."""
+    failures = []
+    for name, counts in baseline["perft"].items():
+        current = results["perft"].get(name)
+        depth = min(len(counts), len(current or []))
+        if current is None or current[:depth] != counts[:depth]:
+            failures.append(f"perft {name}: {current} != {counts}")
+
+    for name, value in baseline["throughput"].items():
+        current = results["throughput"].get(name)
+        if current is not None and current < value * (1 - threshold):
+            failures.append(
+                f"{name}: {current:.0f} is {1 - current / value:.1%}"
+                f" below {value:.0f}"
+            )
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--perft-depth", type=int, default=4)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1.0,
+        help="seconds spent measuring each throughput",
+    )
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="JSON file of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    counts, perft_rate = run_perft(args.perft_depth, args.min_time)
+    throughput = run_throughput(args.min_time)
+    throughput["perft_leaves_per_second"] = perft_rate
+    results = {
+        "python": platform.python_version(),
+        "perft": counts,
+        "throughput": throughput,
+    }
+
+    for name, name_counts in counts.items():
+        print(f"perft {name:<10} {name_counts}")
+    for name, value in throughput.items():
+        print(f"{name:<28} {value:>12.0f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            failures = compare(results, json.load(file), args.threshold)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
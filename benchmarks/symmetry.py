@@ -0,0 +1,60 @@
+"""Nodes searched from the initial position with and without the board
+symmetries.
+
+Run from the repository root with `python -m benchmarks.symmetry`.
+"""
+
+import argparse
+import time
+
+from src.game.game import Game
+from src.minimax.heuristics import heuristic
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+
+def run(cutoff: int, symmetry: bool) -> tuple:
+    """Return the result and time of a search of `Game()`."""
+    start = time.perf_counter()
+    result = search_best_move(
+        Game(),
+        heuristic,
+        cutoff=cutoff,
+        table=TranspositionTable(),
+        ordering=MoveOrdering(),
+        symmetry=symmetry,
+    )
+
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-cutoff", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'cutoff':>6} {'plain':>9} {'symmetry':>9} {'reduction':>9}"
+        f" {'time':>15}"
+    )
+    for cutoff in range(1, args.max_cutoff + 1):
+        plain, plain_time = run(cutoff, False)
+        reduced, reduced_time = run(cutoff, True)
+        if plain.value != reduced.value:
+            raise AssertionError(
+                f"Different values at cutoff {cutoff}:"
+                f" {plain.value} != {reduced.value}"
+            )
+
+        plain_nodes = plain.statistics.nodes
+        reduced_nodes = reduced.statistics.nodes
+        print(
+            f"{cutoff:>6} {plain_nodes:>9} {reduced_nodes:>9}"
+            f" {1 - reduced_nodes / plain_nodes:>9.1%}"
+            f" {plain_time:>6.2f}s -> {reduced_time:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Nodes searched with and without principal variation search and
+aspiration windows.
+
+Run from the repository root with `python -m benchmarks.window_search`.
+
+Each position of the benchmark suite, and some random ones, is searched
+at each cutoff with a plain alpha-beta window and with PVS, and then with
+iterative deepening up to the last cutoff with and without aspiration
+windows. The values must be the same, and so must the moves, except
+between equally good moves when the move ordering has seen different
+cutoffs.
+"""
+
+import argparse
+
+from benchmarks.suite import POSITIONS, position, random_positions
+from src.minimax.heuristics import heuristic
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+
+def search(game, ordered: bool, **kwargs):
+    return search_best_move(
+        game,
+        heuristic,
+        table=TranspositionTable() if ordered else None,
+        ordering=MoveOrdering() if ordered else None,
+        **kwargs,
+    )
+
+
+def compare(games: list, ordered: bool, first: dict, second: dict) -> tuple:
+    """Return the total nodes of the searches of `games` with the
+    arguments `first` and `second`, checking that they agree."""
+    nodes = [0, 0]
+    for game in games:
+        results = [
+            search(game, ordered, **kwargs) for kwargs in (first, second)
+        ]
+        if results[0].value != results[1].value or (
+            not ordered and results[0].move != results[1].move
+        ):
+            raise AssertionError(f"Different results with {second}")
+        for index, result in enumerate(results):
+            nodes[index] += result.statistics.nodes
+
+    return tuple(nodes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-cutoff", type=int, default=5)
+    parser.add_argument("--random-positions", type=int, default=12)
+    parser.add_argument("--aspiration-window", type=float, default=20)
+    args = parser.parse_args()
+
+    games = [position(name) for name in POSITIONS]
+    games += random_positions(args.random_positions, seed=5)
+
+    print(f"{'search':<22} {'plain':>9} {'improved':>9} {'reduction':>9}")
+    rows = []
+    for ordered in (False, True):
+        suffix = " +table" if ordered else ""
+        for cutoff in range(3, args.max_cutoff + 1):
+            nodes = compare(
+                games,
+                ordered,
+                {"cutoff": cutoff, "pvs": False},
+                {"cutoff": cutoff, "pvs": True},
+            )
+            rows.append((f"pvs, cutoff {cutoff}{suffix}", nodes))
+
+    iterative = {"time_budget": 1e9, "max_cutoff": args.max_cutoff}
+    nodes = compare(
+        games,
+        True,
+        iterative,
+        {**iterative, "aspiration_window": args.aspiration_window},
+    )
+    rows.append((f"aspiration {args.aspiration_window:g}", nodes))
+
+    for name, (plain, improved) in rows:
+        print(
+            f"{name:<22} {plain:>9} {improved:>9}"
+            f" {1 - improved / plain:>9.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
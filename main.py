@@ -1,12 +1,23 @@
+import os
 import time
 
-from numpy import argmax, argmin
-
-from minimax.heuristics import heuristic
-from minimax.minimax import alpha_beta_search
-from minimax.search_tree import SearchTree
+from src.minimax.heuristics import heuristic
+from src.minimax.mcts import MonteCarloTreeSearch
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.opening_book import OpeningBook
+from src.minimax.parallel import ParallelSearch
+from src.minimax.pondering import Ponderer
+from src.minimax.search import SearchResult, search_best_move
+from src.minimax.statistics import log_statistics
+from src.minimax.transposition_table import TranspositionTable
 from src.constants import GOAT_PLAYER, TIGER_PLAYER
 from src.game.game import Game
+from src.game.records import GameRecord, append_records
+
+# Built with `python -m src.minimax.opening_book opening_book.bin`
+OPENING_BOOK_PATH = "opening_book.bin"
+# Every game played from the menu is appended to it
+GAME_RECORDS_PATH = "games.bcr"
 
 
 def main():
@@ -32,82 +43,299 @@ def main():
     print(f"Winner: {winner}")
 
 
-def play_alg_vs_alg(h_1=None, cutoff_1=None, h_2=None, cutoff_2=None):
+def play_alg_vs_alg(
+    h_1=None,
+    cutoff_1=None,
+    h_2=None,
+    cutoff_2=None,
+    time_1=None,
+    time_2=None,
+    workers=None,
+    book=None,
+    statistics_log=None,
+    mcts_1=None,
+    mcts_2=None,
+    record_path=None,
+):
+    """Play a game between two engines.
+
+    Each engine searches up to its `cutoff`, or, if a time budget (in
+    seconds) is given, deepens the search until the time per move runs out.
+    With a number of `workers`, the searches up to a cutoff are split
+    between that many processes. Positions in the opening `book` are
+    played from it, without searching. The statistics of each search are
+    appended to the `statistics_log` file, if given, as JSON lines.
+
+    Each engine keeps its transposition table and move ordering for the
+    whole game, so the positions it searched in its previous moves, such
+    as the reply it expected, start out in the table. Symmetric positions
+    share their entries (see `search_best_move`).
+
+    An engine given a `MonteCarloTreeSearch` (`mcts_1` or `mcts_2`) uses
+    it instead of alpha-beta, running `cutoff` iterations or for its time
+    budget, and keeps its tree between its moves.
+
+    The game is appended to the game records file at `record_path`, if
+    given (see `src.game.records`).
+    """
     game = Game()
-    while not game.is_game_over():
+    moves = []
+    pool_1 = _parallel_search(h_1, cutoff_1, workers, mcts_1)
+    pool_2 = _parallel_search(h_2, cutoff_2, workers, mcts_2)
+    table_1, ordering_1 = TranspositionTable(), MoveOrdering()
+    table_2, ordering_2 = TranspositionTable(), MoveOrdering()
+    winner = game.get_winner()
+    while winner is None:
         print(
             f"\nPlayer: {'Cabra' if game.game_state.player == GOAT_PLAYER else 'Tigre'}\n"
         )
         start = time.time()
         if game.game_state.player == GOAT_PLAYER:
-            node: SearchTree = alpha_beta_search(
-                game=game,
-                cutoff=cutoff_1,
-                heuristic=h_1,
+            result = _search(
+                game,
+                h_1,
+                cutoff_1,
+                time_1,
+                pool_1,
+                book,
+                table=table_1,
+                ordering=ordering_1,
+                mcts=mcts_1,
             )
-            best_move = argmax([children.value for children in node.children])
         else:
-            node: SearchTree = alpha_beta_search(
-                game=game,
-                cutoff=cutoff_2,
-                heuristic=h_2,
+            result = _search(
+                game,
+                h_2,
+                cutoff_2,
+                time_2,
+                pool_2,
+                book,
+                table=table_2,
+                ordering=ordering_2,
+                mcts=mcts_2,
             )
-            best_move = argmin([children.value for children in node.children])
-        move = node.children[best_move].move
+        move = result.move
 
+        _log_statistics(statistics_log, game, result)
         game.ply(move)
+        moves.append(move)
+        winner = game.get_winner()
         end = time.time()
         print(f"Time: {end - start:.5f}")
+        _print_search_info(result)
         print(f"Selected move: {move}")
         print("-" * 80)
 
-    print("*" * 80)
-    print(game.print_game_info())
-    result = game.get_winner()
-    if result == GOAT_PLAYER:
-        print("Cabra venceu")
-    else:
-        print("Tigre venceu")
+    _close(pool_1, pool_2)
+    _append_record(
+        record_path,
+        winner,
+        moves,
+        _engine_name(cutoff_1, time_1, mcts_1),
+        _engine_name(cutoff_2, time_2, mcts_2),
+    )
+    _print_winner(game, winner)
 
 
 def play_human_vs_alg(
-    human_player: int = GOAT_PLAYER, heuristic=None, cutoff=None
+    human_player: int = GOAT_PLAYER,
+    heuristic=None,
+    cutoff=None,
+    time_budget=None,
+    workers=None,
+    book=None,
+    statistics_log=None,
+    ponder=False,
+    mcts=None,
+    record_path=None,
 ):
+    """Play a game between a human, choosing moves in the terminal, and an
+    engine, as in `play_alg_vs_alg`.
+
+    With `ponder`, the engine keeps searching while the human chooses a
+    move, and searches with a single process. The `MonteCarloTreeSearch`
+    engine, if given, doesn't ponder.
+    """
     game = Game()
-    while not game.is_game_over():
+    ponderer = None
+    pool = None
+    moves = []
+    if ponder and mcts is None:
+        ponderer = Ponderer(heuristic, cutoff, time_budget, symmetry=True)
+    else:
+        pool = _parallel_search(heuristic, cutoff, workers, mcts)
+    expected_move = None
+    winner = game.get_winner()
+    while winner is None:
         print(
             f"\nPlayer: {'Cabra' if game.game_state.player == GOAT_PLAYER else 'Tigre'}\n"
         )
         if human_player == game.game_state.player:
+            if ponderer is not None:
+                ponderer.start(game, expected_move)
             selected_move = _select_move(game)
             game.ply(selected_move)
+            moves.append(selected_move)
+            winner = game.get_winner()
         else:
             start = time.time()
-            node: SearchTree = alpha_beta_search(
-                game=game,
-                cutoff=cutoff,
-                heuristic=heuristic,
+            hits = ponderer.hits if ponderer is not None else 0
+            result = _search(
+                game,
+                heuristic,
+                cutoff,
+                time_budget,
+                pool,
+                book,
+                ponderer,
+                mcts=mcts,
             )
-            best_move = argmax([children.value for children in node.children])
-
-            move = node.children[best_move].move
+            move = result.move
 
+            _log_statistics(statistics_log, game, result)
             game.ply(move)
+            moves.append(move)
+            winner = game.get_winner()
             end = time.time()
             print(f"Time: {end - start:.5f}")
+            if ponderer is not None and ponderer.hits > hits:
+                print("Reply found while pondering")
+            _print_search_info(result)
 
             print(f"Selected move: {move}")
             print("-" * 80)
+            # The human's move the engine expects, to be pondered first
+            line = result.principal_variation
+            expected_move = line[1] if len(line) > 1 else None
+
+    _close(pool)
+    if ponderer is not None:
+        ponderer.stop()
+    engine = _engine_name(cutoff, time_budget, mcts)
+    if human_player == GOAT_PLAYER:
+        _append_record(record_path, winner, moves, "human", engine)
+    else:
+        _append_record(record_path, winner, moves, engine, "human")
+    _print_winner(game, winner)
+
+
+def _search(
+    game,
+    heuristic,
+    cutoff,
+    time_budget,
+    pool=None,
+    book=None,
+    ponderer=None,
+    table=None,
+    ordering=None,
+    mcts=None,
+) -> SearchResult:
+    if book is not None:
+        result = book.lookup(game)
+        if result is not None:
+            return result
+
+    if mcts is not None:
+        return mcts.search(game, iterations=cutoff, time_budget=time_budget)
+
+    if ponderer is not None:
+        return ponderer.search(game)
+
+    if table is None:
+        table, ordering = TranspositionTable(), MoveOrdering()
+    else:
+        # Kept from the engine's previous moves
+        table.new_search()
+        ordering.age()
+
+    if pool is not None and time_budget is None:
+        return pool.search(game, cutoff, table, ordering)
+
+    return search_best_move(
+        game,
+        heuristic,
+        cutoff=cutoff,
+        time_budget=time_budget,
+        table=table,
+        ordering=ordering,
+        symmetry=True,
+    )
+
+
+def _parallel_search(
+    heuristic, cutoff, workers, mcts=None
+) -> ParallelSearch | None:
+    if workers is None or cutoff is None or mcts is not None:
+        return None
+
+    return ParallelSearch(heuristic, workers)
+
+
+def _close(*pools):
+    for pool in pools:
+        if pool is not None:
+            pool.close()
+
 
+def _engine_name(cutoff, time_budget, mcts) -> str:
+    """Return the settings of an engine, written as in `src.tournament`."""
+    prefix = "mcts" if mcts is not None else "heuristic"
+    if time_budget is not None:
+        return f"{prefix}:time:{time_budget}"
+    if mcts is not None:
+        return f"{prefix}:iterations:{cutoff}"
+    return f"{prefix}:cutoff:{cutoff}"
+
+
+def _append_record(path, winner, moves, goat, tiger):
+    if path is None:
+        return
+
+    record = GameRecord.from_plays(goat, tiger, winner, moves)
+    append_records(path, [record])
+
+
+def _print_winner(game, winner):
     print("*" * 80)
     print(game.print_game_info())
-    result = game.get_winner()
-    if result == GOAT_PLAYER:
+    if winner == GOAT_PLAYER:
         print("Cabra venceu")
     else:
         print("Tigre venceu")
 
 
+def _log_statistics(path, game, result: SearchResult):
+    if path is None:
+        return
+
+    state = game.game_state
+    log_statistics(
+        path,
+        result.statistics,
+        player=state.player,
+        positioned_goats=state.positioned_goats,
+        captured_goats=state.captured_goats,
+        move=str(result.move),
+        value=result.value,
+    )
+
+
+def _print_search_info(result: SearchResult):
+    statistics = result.statistics
+    print(
+        f"Value: {result.value}    Depth: {statistics.cutoff}"
+        f"    Nodes: {statistics.nodes}"
+    )
+    print(
+        f"Max depth: {statistics.max_depth}"
+        f"    Branching factor: {statistics.effective_branching_factor:.2f}"
+        f"    First move cutoffs: {statistics.first_move_cutoff_rate:.0%}"
+        f"    Table hits: {statistics.table_hit_rate:.0%}"
+    )
+    print(f"Expected line: {', '.join(map(str, result.principal_variation))}")
+
+
 def _select_move(game):
     moves = game.available_moves()
     print(game.print_game_info())
@@ -135,6 +363,73 @@ def _select_cutoff():
     return int(selected_depth)
 
 
+def _select_iterations():
+    selected_iterations = input("The iterations must be a positive integer: ")
+    while not selected_iterations.isdigit() or int(selected_iterations) < 1:
+        selected_iterations = input(
+            "The iterations must be a positive integer: "
+        )
+
+    return int(selected_iterations)
+
+
+def _select_time_budget():
+    selected_time = input(
+        "The time per move must be a positive number of seconds: "
+    )
+    while not _is_positive_number(selected_time):
+        selected_time = input(
+            "The time per move must be a positive number of seconds: "
+        )
+
+    return float(selected_time)
+
+
+def _is_positive_number(value: str) -> bool:
+    try:
+        return float(value) > 0
+    except ValueError:
+        return False
+
+
+def _load_book():
+    if os.path.exists(OPENING_BOOK_PATH):
+        return OpeningBook(OPENING_BOOK_PATH)
+
+    return None
+
+
+def _select_engine():
+    """Ask for the search of an engine, and return the
+    `MonteCarloTreeSearch` to use, or None for alpha-beta."""
+    print("1: Alpha-beta\n" "2: Monte Carlo tree search\n")
+    selected_engine = input("Choose the search: ")
+    while selected_engine not in ("1", "2"):
+        selected_engine = input("Choose the search: ")
+
+    if selected_engine == "1":
+        return None
+
+    return MonteCarloTreeSearch()
+
+
+def _select_search_limit(mcts=None):
+    """Ask for a search depth (or iterations, for a Monte Carlo tree search)
+    or a time per move, and return (cutoff, time)."""
+    fixed = "iterations" if mcts is not None else "depth"
+    print(f"1: Fixed {fixed}\n" "2: Time per move\n")
+    selected_limit = input("Choose how to limit the search: ")
+    while selected_limit not in ("1", "2"):
+        selected_limit = input("Choose how to limit the search: ")
+
+    if selected_limit == "1" and mcts is not None:
+        return _select_iterations(), None
+    if selected_limit == "1":
+        return _select_cutoff(), None
+
+    return None, _select_time_budget()
+
+
 if __name__ == "__main__":
     print("1: Computer x Computer\n" "2: Player x Computer\n")
     selected_mode = input("Choose a mode: ")
@@ -146,16 +441,28 @@ if __name__ == "__main__":
         selected_mode = input("Choose a mode: ")
 
     if int(selected_mode) == 1:
-        print("Select search depth for the first player")
-        cutoff_1 = _select_cutoff()
-        print("Select search depth for the second player")
-        cutoff_2 = _select_cutoff()
+        print("Select the search for the first player")
+        mcts_1 = _select_engine()
+        cutoff_1, time_1 = _select_search_limit(mcts_1)
+        print("Select the search for the second player")
+        mcts_2 = _select_engine()
+        cutoff_2, time_2 = _select_search_limit(mcts_2)
         play_alg_vs_alg(
-            cutoff_1=cutoff_1, h_1=heuristic, cutoff_2=cutoff_2, h_2=heuristic
+            cutoff_1=cutoff_1,
+            h_1=heuristic,
+            cutoff_2=cutoff_2,
+            h_2=heuristic,
+            time_1=time_1,
+            time_2=time_2,
+            book=_load_book(),
+            mcts_1=mcts_1,
+            mcts_2=mcts_2,
+            record_path=GAME_RECORDS_PATH,
         )
     else:
-        print("Select search depth for the computer player")
-        cutoff = _select_cutoff()
+        print("Select the search for the computer player")
+        mcts = _select_engine()
+        cutoff, time_budget = _select_search_limit(mcts)
 
         print("1: Play as GOAT\n" "2: Play as TIGER\n")
         selected_mode = input("Choose your pieces: ")
@@ -166,7 +473,22 @@ if __name__ == "__main__":
         ):
             selected_mode = input("Choose your pieces: ")
 
-        if int(selected_mode) == 1:
-            play_human_vs_alg(GOAT_PLAYER, heuristic, cutoff)
-        else:
-            play_human_vs_alg(TIGER_PLAYER, heuristic, cutoff)
+        human_player = GOAT_PLAYER if int(selected_mode) == 1 else TIGER_PLAYER
+
+        selected_ponder = "2"
+        if mcts is None:
+            print("1: Let the computer think in your turn\n" "2: Don't\n")
+            selected_ponder = input("Choose: ")
+            while selected_ponder not in ("1", "2"):
+                selected_ponder = input("Choose: ")
+
+        play_human_vs_alg(
+            human_player,
+            heuristic,
+            cutoff,
+            time_budget,
+            book=_load_book(),
+            ponder=selected_ponder == "1",
+            mcts=mcts,
+            record_path=GAME_RECORDS_PATH,
+        )
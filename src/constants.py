@@ -24,15 +24,40 @@ AVAILABLE_DIAGONAL_MOVEMENTS: Final = {
     BoardSquare(0, 2): [BoardSquare(1, 1), BoardSquare(1, 3)],
     BoardSquare(0, 4): [BoardSquare(1, 3)],
     # L1
-    BoardSquare(1, 1): [BoardSquare(0, 0), BoardSquare(0, 2), BoardSquare(2, 0), BoardSquare(2, 2)],
-    BoardSquare(1, 3): [BoardSquare(0, 2), BoardSquare(0, 4), BoardSquare(2, 2), BoardSquare(2, 4)],
+    BoardSquare(1, 1): [
+        BoardSquare(0, 0),
+        BoardSquare(0, 2),
+        BoardSquare(2, 0),
+        BoardSquare(2, 2),
+    ],
+    BoardSquare(1, 3): [
+        BoardSquare(0, 2),
+        BoardSquare(0, 4),
+        BoardSquare(2, 2),
+        BoardSquare(2, 4),
+    ],
     # L2
     BoardSquare(2, 0): [BoardSquare(1, 1), BoardSquare(3, 1)],
-    BoardSquare(2, 2): [BoardSquare(1, 1), BoardSquare(1, 3), BoardSquare(3, 1), BoardSquare(3, 3)],
+    BoardSquare(2, 2): [
+        BoardSquare(1, 1),
+        BoardSquare(1, 3),
+        BoardSquare(3, 1),
+        BoardSquare(3, 3),
+    ],
     BoardSquare(2, 4): [BoardSquare(1, 3), BoardSquare(3, 3)],
     # L3
-    BoardSquare(3, 1): [BoardSquare(2, 0), BoardSquare(2, 2), BoardSquare(4, 0), BoardSquare(4, 2)],
-    BoardSquare(3, 3): [BoardSquare(2, 2), BoardSquare(2, 4), BoardSquare(4, 2), BoardSquare(4, 4)],
+    BoardSquare(3, 1): [
+        BoardSquare(2, 0),
+        BoardSquare(2, 2),
+        BoardSquare(4, 0),
+        BoardSquare(4, 2),
+    ],
+    BoardSquare(3, 3): [
+        BoardSquare(2, 2),
+        BoardSquare(2, 4),
+        BoardSquare(4, 2),
+        BoardSquare(4, 4),
+    ],
     # L4
     BoardSquare(4, 0): [BoardSquare(3, 1)],
     BoardSquare(4, 2): [BoardSquare(3, 1), BoardSquare(3, 3)],
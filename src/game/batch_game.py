@@ -0,0 +1,278 @@
+"""Vectorized version of `Game`, playing many games at once.
+
+The K games are kept as a (K, 25) int8 array of boards, with the same
+values as `Board.board` in the order of the square indexes of
+`src.game.topology`, and a vector for each field of `GameState`. Moves are
+given by their codes (see `src.game.moves`): the legal moves of all the
+games are a (K, NUMBER_OF_MOVES) mask, and a move per game is played with
+a few NumPy operations over all of them, so there are no Python loops
+over the games.
+
+Both arrays are stored transposed, as a row per square or per move code,
+and exposed as views. The operations then work on whole rows, which are
+contiguous in memory, and are several times faster than on columns.
+"""
+
+from typing import List
+
+import numpy as np
+import numpy.typing as npt
+
+from src.constants import (
+    CAPTURED_GOATS_TO_WIN,
+    CLEAN_SQUARE,
+    GOAT_PLAYER,
+    TIGER_PLAYER,
+    TOTAL_NUMBER_OF_GOATS,
+)
+from src.game.game import Game
+from src.game.moves import (
+    CAPTURE,
+    MOVE_ENDS,
+    MOVE_KINDS,
+    MOVE_OVERS,
+    MOVE_STARTS,
+    MOVEMENT,
+    NO_SQUARE,
+    NUMBER_OF_MOVES,
+    PLACEMENT,
+)
+from src.game.topology import NUMBER_OF_SQUARES
+
+# Code of "no move", for the games that are over
+NO_MOVE = -1
+
+# Games whose move counts fit in a 64-bit integer
+_LANES = 8
+# Games up to which the moves are counted per game, as the loop over the
+# codes costs more than it saves
+_SMALL_BATCH = 256
+
+_KINDS = np.array(MOVE_KINDS, dtype=np.int8)
+_STARTS = np.array(MOVE_STARTS, dtype=np.intp)
+_OVERS = np.array(MOVE_OVERS, dtype=np.intp)
+_ENDS = np.array(MOVE_ENDS, dtype=np.intp)
+
+# The codes of each kind of move, which are consecutive, and the squares
+# of those moves
+_PLACEMENTS = slice(MOVE_KINDS.index(PLACEMENT), MOVE_KINDS.index(MOVEMENT))
+_MOVEMENTS = slice(MOVE_KINDS.index(MOVEMENT), MOVE_KINDS.index(CAPTURE))
+_CAPTURES = slice(MOVE_KINDS.index(CAPTURE), NUMBER_OF_MOVES)
+_PLACEMENT_ENDS = _ENDS[_PLACEMENTS]
+_MOVEMENT_STARTS = _STARTS[_MOVEMENTS]
+_MOVEMENT_ENDS = _ENDS[_MOVEMENTS]
+_CAPTURE_STARTS = _STARTS[_CAPTURES]
+_CAPTURE_OVERS = _OVERS[_CAPTURES]
+_CAPTURE_ENDS = _ENDS[_CAPTURES]
+
+
+class BatchGame:
+    """K games of Bagh-Chal, played together.
+
+    The games start from the initial position, or from copies of the given
+    `Game` objects. Games that are over (see `game_over`) have no legal
+    moves and aren't changed by `ply`. As in `Game`, the player to move
+    loses when it has no legal moves.
+    """
+
+    def __init__(self, count: int = 0, games: List[Game] | None = None):
+        if games is None:
+            games = [Game()]
+            indexes = np.zeros(count, dtype=np.intp)
+        else:
+            indexes = np.arange(len(games))
+
+        boards = np.array(
+            [game.board.board.reshape(NUMBER_OF_SQUARES) for game in games],
+            dtype=np.int8,
+        ).reshape(len(games), NUMBER_OF_SQUARES)
+        # A row per square, with a column per game
+        self._squares: npt.NDArray[np.int8] = boards[indexes].T.copy()
+        self.player: npt.NDArray[np.int8] = np.array(
+            [game.game_state.player for game in games], dtype=np.int8
+        )[indexes]
+        self.positioned_goats: npt.NDArray[np.int8] = np.array(
+            [game.game_state.positioned_goats for game in games], dtype=np.int8
+        )[indexes]
+        self.captured_goats: npt.NDArray[np.int8] = np.array(
+            [game.game_state.captured_goats for game in games], dtype=np.int8
+        )[indexes]
+
+    @classmethod
+    def from_arrays(
+        cls,
+        boards: npt.ArrayLike,
+        player: npt.ArrayLike,
+        positioned_goats: npt.ArrayLike,
+        captured_goats: npt.ArrayLike,
+    ) -> "BatchGame":
+        """Return the games with the (K, 25) `boards`, and the fields of
+        their game states as vectors."""
+        games = cls()
+        games._squares = np.asarray(boards, dtype=np.int8).T.copy()
+        games.player = np.array(player, dtype=np.int8)
+        games.positioned_goats = np.array(positioned_goats, dtype=np.int8)
+        games.captured_goats = np.array(captured_goats, dtype=np.int8)
+        return games
+
+    def __len__(self) -> int:
+        return self._squares.shape[1]
+
+    @property
+    def boards(self) -> npt.NDArray[np.int8]:
+        """The (K, 25) boards, as a view that can be written to."""
+        return self._squares.T
+
+    def take(self, indexes: npt.ArrayLike) -> "BatchGame":
+        """Return a copy of the games at `indexes`."""
+        games = BatchGame()
+        games._squares = self._squares[:, indexes]
+        games.player = self.player[indexes]
+        games.positioned_goats = self.positioned_goats[indexes]
+        games.captured_goats = self.captured_goats[indexes]
+        return games
+
+    def game(self, index: int) -> Game:
+        """Return the game at `index` as a `Game`."""
+        game = Game()
+        game.board.board = (
+            self.boards[index].reshape(game.board.board.shape).astype(int)
+        )
+        game.game_state.player = int(self.player[index])
+        game.game_state.positioned_goats = int(self.positioned_goats[index])
+        game.game_state.captured_goats = int(self.captured_goats[index])
+        return game
+
+    def legal_moves(self) -> npt.NDArray[np.bool_]:
+        """Return the (K, NUMBER_OF_MOVES) mask of the legal move codes of
+        each game, as given by `Game.available_move_codes`.
+
+        As in `Game`, when the tigers can capture they must, and the games
+        that are over have no legal moves.
+        """
+        squares = self._squares
+        empty = squares == CLEAN_SQUARE
+        playing = self.captured_goats < CAPTURED_GOATS_TO_WIN
+        goat_turn = self.player == GOAT_PLAYER
+        placing = self.positioned_goats < TOTAL_NUMBER_OF_GOATS
+
+        # The codes are ordered by kind, so each kind is a slice of rows
+        legal = np.empty((NUMBER_OF_MOVES, len(self)), dtype=np.bool_)
+        placements = legal[_PLACEMENTS]
+        movements = legal[_MOVEMENTS]
+        captures = legal[_CAPTURES]
+
+        np.equal(squares[_CAPTURE_STARTS], TIGER_PLAYER, out=captures)
+        captures &= squares[_CAPTURE_OVERS] == GOAT_PLAYER
+        captures &= empty[_CAPTURE_ENDS]
+        captures &= ~goat_turn & playing
+
+        # Goats move once they are all placed, and tigers when they can't
+        # capture
+        moving = np.where(goat_turn, ~placing, ~captures.any(axis=0))
+        np.take(squares == self.player, _MOVEMENT_STARTS, 0, out=movements)
+        movements &= empty[_MOVEMENT_ENDS]
+        movements &= moving & playing
+
+        np.logical_and(
+            empty[_PLACEMENT_ENDS],
+            goat_turn & placing & playing,
+            out=placements,
+        )
+        return legal.T
+
+    def game_over(
+        self, legal: npt.NDArray[np.bool_] | None = None
+    ) -> npt.NDArray[np.bool_]:
+        """Return which games are over, as `Game.is_game_over`.
+
+        The `legal_moves` of the games can be given, if already computed.
+        """
+        return self.winners(legal) != 0
+
+    def winners(
+        self, legal: npt.NDArray[np.bool_] | None = None
+    ) -> npt.NDArray[np.int8]:
+        """Return the winner of each game, as `Game.get_winner`, with 0 for
+        the games that aren't over."""
+        if legal is None:
+            legal = self.legal_moves()
+
+        blocked = ~legal.any(axis=1)
+        return np.select(
+            [self.captured_goats >= CAPTURED_GOATS_TO_WIN, blocked],
+            [TIGER_PLAYER, -self.player],
+            0,
+        ).astype(np.int8)
+
+    def ply(self, codes: npt.ArrayLike):
+        """Play the move with the code in `codes` in each game.
+
+        The moves must be legal. Games given `NO_MOVE` aren't changed.
+        """
+        codes = np.asarray(codes, dtype=np.intp)
+        playing = codes != NO_MOVE
+        games = np.flatnonzero(playing)
+        codes = codes[playing]
+        kinds = _KINDS[codes]
+        starts = _STARTS[codes]
+        overs = _OVERS[codes]
+
+        squares = self._squares
+        pieces = self.player[games]
+        moved = starts != NO_SQUARE
+        squares[starts[moved], games[moved]] = CLEAN_SQUARE
+        captured = overs != NO_SQUARE
+        squares[overs[captured], games[captured]] = CLEAN_SQUARE
+        squares[_ENDS[codes], games] = pieces
+
+        self.positioned_goats[games] += kinds == PLACEMENT
+        self.captured_goats[games] += kinds == CAPTURE
+        self.player[games] = -pieces
+
+
+def random_moves(
+    legal: npt.NDArray[np.bool_], rng: np.random.Generator
+) -> npt.NDArray[np.intp]:
+    """Return a legal move code chosen uniformly at random for each game of
+    the `legal` mask, or `NO_MOVE` for the games without legal moves."""
+    games = legal.shape[0]
+    if games <= _SMALL_BATCH:
+        counts = np.cumsum(legal, axis=1, dtype=np.uint8)
+        count = counts[:, -1]
+        chosen = (rng.random(games, dtype=np.float32) * count).astype(np.uint8)
+        moves = (counts <= chosen[:, None]).sum(axis=1).astype(np.intp)
+        moves[count == 0] = NO_MOVE
+        return moves
+
+    # A row per move code, as returned by `BatchGame.legal_moves`, with the
+    # games padded to a multiple of 8
+    rows = legal.T.view(np.uint8)
+    if games % _LANES or not rows.flags.c_contiguous:
+        padded = np.zeros(
+            (NUMBER_OF_MOVES, -(-games // _LANES) * _LANES), dtype=np.uint8
+        )
+        padded[:, :games] = rows
+        rows = padded
+
+    # Running count of the legal moves up to each code. There are fewer
+    # than 256 moves, so the counts of 8 games are added at once as the
+    # bytes of a 64-bit integer, without carries between them.
+    counts = np.empty(rows.shape, dtype=np.uint8)
+    words = counts.view(np.uint64)
+    count = np.zeros(words.shape[1], dtype=np.uint64)
+    for code, row in enumerate(rows.view(np.uint64)):
+        count += row
+        words[code] = count
+
+    count = counts[-1, :games]
+    chosen = (rng.random(games, dtype=np.float32) * count).astype(np.uint8)
+    # The chosen move is the first code with more than `chosen` legal moves
+    # up to it
+    moves = (
+        (counts[:, :games] <= chosen)
+        .view(np.uint8)
+        .sum(axis=0, dtype=np.uint8)
+    ).astype(np.intp)
+    moves[count == 0] = NO_MOVE
+    return moves
@@ -6,178 +6,358 @@ import numpy.typing as npt
 from src.constants import (
     BOARD_COLS,
     BOARD_LINES,
-    CLEAN_SQUARE,
     GOAT_PLAYER,
     TIGER_PLAYER,
     TOTAL_NUMBER_OF_GOATS,
 )
 from src.game.game_state import GameState
 from src.game.game_types import BoardSquare, Capture, Movement, Play
-from src.utils import neighboring_squares
+from src.game.moves import (
+    CAPTURE,
+    CAPTURE_CODES,
+    MOVE_ENDS,
+    MOVE_KINDS,
+    MOVE_OVERS,
+    MOVE_STARTS,
+    MOVEMENT,
+    MOVEMENT_CODES,
+    MOVES,
+    encode_move,
+)
+from src.game.topology import (
+    FULL_BOARD_MASK,
+    JUMP_OVER_MASKS,
+    JUMPS,
+    NEIGHBOR_MASKS,
+    NUMBER_OF_SQUARES,
+    SQUARES,
+    TIGER_INFLUENCE_MASKS,
+    square_index,
+)
+from src.game.zobrist import GOAT_KEYS, TIGER_KEYS, pieces_hash
+
+
+def _bits(mask: int):
+    """Yield the index of each set bit in `mask`, from the lowest one."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _tiger_terms(selected: int, tigers: int, goats: int) -> tuple:
+    """Return the movements, captures and locked tigers among `selected`."""
+    empty = FULL_BOARD_MASK & ~(tigers | goats)
+    movements = captures = locked = 0
+    for tiger in _bits(selected):
+        tiger_movements = (NEIGHBOR_MASKS[tiger] & empty).bit_count()
+        tiger_captures = 0
+        if JUMP_OVER_MASKS[tiger] & goats:
+            for over, landing in JUMPS[tiger]:
+                if goats >> over & 1 and empty >> landing & 1:
+                    tiger_captures += 1
+
+        movements += tiger_movements
+        captures += tiger_captures
+        if not tiger_movements and not tiger_captures:
+            locked += 1
+
+    return movements, captures, locked
 
 
 class Board:
+    """The board, stored as one bit mask for the tigers and one for the goats.
+
+    The `board` attribute still exposes the position as a 5x5 array. Since
+    callers are allowed to write to that array, reading it marks the masks
+    as stale, and they are rebuilt from the array before the next operation.
+    """
+
     def __init__(self, board: npt.NDArray = None):
-        self.board: npt.NDArray = board
-        if self.board is None:
+        self.tigers: int = 0
+        self.goats: int = 0
+        # Zobrist hash of the pieces, updated on each move
+        self.zobrist: int = 0
+        # Terms used by the heuristic, also updated on each move: the
+        # number of movements and captures the tigers could make (ignoring
+        # forced captures) and the number of tigers that can't move
+        self.tiger_movements: int = 0
+        self.tiger_captures: int = 0
+        self.locked_tigers: int = 0
+        self._array: npt.NDArray | None = None
+        self._stale = False
+
+        if board is None:
             self._setup_initial_board()
+        else:
+            self.board = board
 
     def _setup_initial_board(self):
-        board = np.zeros([BOARD_LINES, BOARD_COLS], dtype=int)
-        board[0, 0] = TIGER_PLAYER
-        board[0, BOARD_COLS - 1] = TIGER_PLAYER
-        board[BOARD_LINES - 1, 0] = TIGER_PLAYER
-        board[BOARD_LINES - 1, BOARD_COLS - 1] = TIGER_PLAYER
+        corners = (
+            square_index(BoardSquare(0, 0)),
+            square_index(BoardSquare(0, BOARD_COLS - 1)),
+            square_index(BoardSquare(BOARD_LINES - 1, 0)),
+            square_index(BoardSquare(BOARD_LINES - 1, BOARD_COLS - 1)),
+        )
+        self.tigers = sum(1 << corner for corner in corners)
+        self.goats = 0
+        self._reset_hash_and_terms()
+        self._array = None
+        self._stale = False
+
+    @property
+    def board(self) -> npt.NDArray:
+        """The position as a 5x5 array of pieces."""
+        if self._array is None:
+            self._array = self._to_array()
+        self._stale = True
+        return self._array
+
+    @board.setter
+    def board(self, board: npt.NDArray):
+        self._array = board
+        self._stale = True
+
+    def _sync(self):
+        """Rebuild the masks if the array may have been changed."""
+        if not self._stale:
+            return
+
+        flat = np.asarray(self._array).ravel()
+        self.tigers = sum(
+            1 << int(i) for i in np.flatnonzero(flat == TIGER_PLAYER)
+        )
+        self.goats = sum(
+            1 << int(i) for i in np.flatnonzero(flat == GOAT_PLAYER)
+        )
+        self._reset_hash_and_terms()
+        self._stale = False
+
+    def _reset_hash_and_terms(self):
+        self.zobrist = pieces_hash(self.tigers, self.goats)
+        (
+            self.tiger_movements,
+            self.tiger_captures,
+            self.locked_tigers,
+        ) = _tiger_terms(self.tigers, self.tigers, self.goats)
+
+    def _to_array(self) -> npt.NDArray:
+        board = np.zeros(NUMBER_OF_SQUARES, dtype=int)
+        for index in _bits(self.tigers):
+            board[index] = TIGER_PLAYER
+        for index in _bits(self.goats):
+            board[index] = GOAT_PLAYER
+
+        return board.reshape(BOARD_LINES, BOARD_COLS)
+
+    def snapshot(self) -> tuple:
+        """Return the state needed to undo the moves made after this call."""
+        self._sync()
+        return (
+            self.tigers,
+            self.goats,
+            self.zobrist,
+            self.tiger_movements,
+            self.tiger_captures,
+            self.locked_tigers,
+        )
 
-        self.board = board
+    def restore(self, snapshot: tuple):
+        """Go back to the state returned by `snapshot`."""
+        (
+            self.tigers,
+            self.goats,
+            self.zobrist,
+            self.tiger_movements,
+            self.tiger_captures,
+            self.locked_tigers,
+        ) = snapshot
+        self._array = None
+        self._stale = False
 
     def move(self, move: Play):
         """Make a move in the board.
 
         The move can be a placement of a goat, a movement of a tiger or goat, or the capture of a goat by a tiger.
         """
-        if isinstance(move, BoardSquare):
-            self.board[move.lin, move.col] = GOAT_PLAYER
+        self.move_code(encode_move(move))
+
+    def move_code(self, code: int):
+        """Make the move with `code` (see `src.game.moves`) in the board."""
+        self._sync()
+        # The array is rebuilt from the masks the next time it's read
+        self._array = None
+        tigers, goats = self.tigers, self.goats
+
+        kind = MOVE_KINDS[code]
+        end = MOVE_ENDS[code]
+        if kind == MOVEMENT:
+            start = MOVE_STARTS[code]
+            if self.tigers >> start & 1:
+                self.tigers ^= (1 << start) | (1 << end)
+                self.zobrist ^= TIGER_KEYS[start] ^ TIGER_KEYS[end]
+            else:
+                self.goats ^= (1 << start) | (1 << end)
+                self.zobrist ^= GOAT_KEYS[start] ^ GOAT_KEYS[end]
+            region = TIGER_INFLUENCE_MASKS[start] | TIGER_INFLUENCE_MASKS[end]
+
+        elif kind == CAPTURE:
+            start = MOVE_STARTS[code]
+            captured = MOVE_OVERS[code]
+            self.tigers ^= (1 << start) | (1 << end)
+            self.goats &= ~(1 << captured)
+            self.zobrist ^= (
+                TIGER_KEYS[start] ^ TIGER_KEYS[end] ^ GOAT_KEYS[captured]
+            )
+            region = (
+                TIGER_INFLUENCE_MASKS[start]
+                | TIGER_INFLUENCE_MASKS[end]
+                | TIGER_INFLUENCE_MASKS[captured]
+            )
 
-        elif isinstance(move, Movement):
-            initial_piece = self.board[move.start.lin, move.start.col]
-            self.board[move.end.lin, move.end.col] = initial_piece
+        else:
+            self.goats |= 1 << end
+            self.zobrist ^= GOAT_KEYS[end]
+            region = TIGER_INFLUENCE_MASKS[end]
 
-            self.board[move.start.lin, move.start.col] = CLEAN_SQUARE
+        # Only the tigers close to the changed squares are recounted
+        movements, captures, locked = _tiger_terms(
+            tigers & region, tigers, goats
+        )
+        new_movements, new_captures, new_locked = _tiger_terms(
+            self.tigers & region, self.tigers, self.goats
+        )
+        self.tiger_movements += new_movements - movements
+        self.tiger_captures += new_captures - captures
+        self.locked_tigers += new_locked - locked
 
-        elif isinstance(move, Capture):
-            self.board[move.starting_square.lin, move.starting_square.col] = (
-                CLEAN_SQUARE
-            )
-            self.board[move.captured.lin, move.captured.col] = CLEAN_SQUARE
-            self.board[move.ending_square.lin, move.ending_square.col] = (
-                TIGER_PLAYER
-            )
+    def zobrist_hash(self) -> int:
+        """Return the Zobrist hash of the pieces in the board."""
+        self._sync()
+        return self.zobrist
 
     def available_moves(self, game_state: GameState) -> List[Play]:
         """Return a list of the available moves for the given game state."""
+        return [MOVES[code] for code in self.available_move_codes(game_state)]
+
+    def available_move_codes(self, game_state: GameState) -> bytes:
+        """Return the codes of the available moves for the given game
+        state, in the same order as `available_moves`."""
+        self._sync()
         if game_state.player == GOAT_PLAYER:
             return self._goat_movements(game_state.positioned_goats)
 
         return self._tiger_movements()
 
-    def _goat_movements(self, positioned_goats: int) -> List[Play]:
+    def _goat_movements(self, positioned_goats: int) -> bytes:
         if positioned_goats < TOTAL_NUMBER_OF_GOATS:
-            return self._goat_placement_moves()
-
-        moves = []
-        for goat in self._get_piece_positions(GOAT_PLAYER):
-            moves.extend(self._get_piece_movements(goat))
-
-        return moves
-
-    def _goat_placement_moves(self) -> List[BoardSquare]:
-        """Return all empty board squares."""
-        return self._get_piece_positions(CLEAN_SQUARE)
-
-    def _tiger_movements(self) -> List[Movement | Capture]:
-        normal_moves = []
-        capture_moves = []
-
-        for tiger in self._get_piece_positions(TIGER_PLAYER):
-            normal_moves.extend(self._get_piece_movements(tiger))
-            capture_moves.extend(self._get_piece_capture_moves(tiger))
+            # The code of a placement is its square
+            return bytes(_bits(self._empty()))
+
+        empty = self._empty()
+        return bytes(
+            code
+            for goat in _bits(self.goats)
+            if NEIGHBOR_MASKS[goat] & empty
+            for end, code in MOVEMENT_CODES[goat]
+            if empty >> end & 1
+        )
 
+    def _tiger_movements(self) -> bytes:
+        empty = self._empty()
+        goats = self.goats
+        capture_moves = bytes(
+            code
+            for tiger in _bits(self.tigers)
+            if JUMP_OVER_MASKS[tiger] & goats
+            for over, landing, code in CAPTURE_CODES[tiger]
+            if goats >> over & 1 and empty >> landing & 1
+        )
         if capture_moves:
             # Force the selection of a capture, if any is available
             return capture_moves
 
-        return normal_moves
+        return bytes(
+            code
+            for tiger in _bits(self.tigers)
+            for end, code in MOVEMENT_CODES[tiger]
+            if empty >> end & 1
+        )
+
+    def _empty(self) -> int:
+        return FULL_BOARD_MASK & ~(self.tigers | self.goats)
 
     def _get_piece_positions(
         self, piece_type: Literal[-1, 0, 1]
     ) -> List[BoardSquare]:
-        lines, cols = np.where(self.board == piece_type)
-        pos = [
-            BoardSquare(lin=int(line), col=int(col))
-            for line, col in zip(lines, cols)
+        self._sync()
+        if piece_type == TIGER_PLAYER:
+            mask = self.tigers
+        elif piece_type == GOAT_PLAYER:
+            mask = self.goats
+        else:
+            mask = self._empty()
+
+        return [SQUARES[index] for index in _bits(mask)]
+
+    def _get_piece_movements(self, piece_index: int) -> List[Movement]:
+        empty = self._empty()
+        return [
+            MOVES[code]
+            for end, code in MOVEMENT_CODES[piece_index]
+            if empty >> end & 1
         ]
-        return pos
-
-    def _get_piece_movements(self, piece_pos: BoardSquare) -> List[Movement]:
-        moves = neighboring_squares(piece_pos)
 
-        allowed_moves = [
-            Movement(piece_pos, move)
-            for move in moves
-            if self.board[move.lin, move.col] == 0
+    def _get_piece_capture_moves(self, piece_index: int) -> List[Capture]:
+        empty = self._empty()
+        return [
+            MOVES[code]
+            for over, landing, code in CAPTURE_CODES[piece_index]
+            if self.goats >> over & 1 and empty >> landing & 1
         ]
-        return allowed_moves
 
-    def _get_piece_capture_moves(self, piece_pos: BoardSquare) -> List[Capture]:
-        neighbors = neighboring_squares(piece_pos)
-
-        capture_movements = []
-        for neighbor_pos in neighbors:
-            square_after_capture = self._get_square_after_capture(
-                piece_pos, neighbor_pos
-            )
-            if square_after_capture:
-                capture_movements.append(
-                    Capture(
-                        starting_square=piece_pos,
-                        ending_square=square_after_capture,
-                        captured=neighbor_pos,
-                    )
-                )
+    def capture_landing_squares(self) -> int:
+        """Return the mask of the squares where a tiger could land capturing.
 
-        return capture_movements
-
-    def _get_square_after_capture(
-        self, tiger_pos: BoardSquare, goat_pos: BoardSquare
-    ) -> BoardSquare | None:
-        """Return the square where the piece will be after capturing, or None if the capture is not allowed."""
-        if self.board[goat_pos.lin, goat_pos.col] != GOAT_PLAYER:
-            return None
-
-        tiger_lin, tiger_col = tiger_pos.lin, tiger_pos.col
-        goat_lin, goat_col = goat_pos.lin, goat_pos.col
-
-        new_lin = goat_lin + (goat_lin - tiger_lin)
-        new_col = goat_col + (goat_col - tiger_col)
-
-        if new_lin >= BOARD_LINES or new_col >= BOARD_COLS:
-            return None
-
-        if new_lin < 0 or new_col < 0:
-            return None
-
-        piece_in_new_square = self.board[new_lin, new_col]
-        if (
-            piece_in_new_square == TIGER_PLAYER
-            or piece_in_new_square == GOAT_PLAYER
-        ):
-            return None
-
-        return BoardSquare(new_lin, new_col)
+        A goat placed or moved in one of these squares blocks that capture.
+        """
+        self._sync()
+        empty = self._empty()
+        landings = 0
+        for tiger in _bits(self.tigers):
+            if not JUMP_OVER_MASKS[tiger] & self.goats:
+                continue
+            for over, landing in JUMPS[tiger]:
+                if self.goats >> over & 1 and empty >> landing & 1:
+                    landings |= 1 << landing
+
+        return landings
 
     def count_number_of_locked_tigers(self):
         """Return the number of locked tigers."""
-        locked_tigers = 0
-        for tiger in self._get_piece_positions(TIGER_PLAYER):
-            moves = []
-            moves.extend(self._get_piece_movements(tiger))
-            moves.extend(self._get_piece_capture_moves(tiger))
+        self._sync()
+        return self.locked_tigers
 
-            if len(moves) == 0:
-                locked_tigers += 1
-
-        return locked_tigers
+    def evaluation_terms(self) -> tuple:
+        """Return the number of tiger movements, tiger captures and locked
+        tigers, without forcing the captures."""
+        self._sync()
+        return self.tiger_movements, self.tiger_captures, self.locked_tigers
 
     def __str__(self):
         board = ""
 
-        for lin in self.board:
+        for lin in self._board_array():
             for col in lin:
                 board += str(col)
 
         return board
 
+    def _board_array(self) -> npt.NDArray:
+        """The position as an array, without marking the masks as stale."""
+        self._sync()
+        return self._to_array()
+
     def print_board(self):
         board_str = (
             "P---P---P---P---P\n"
@@ -199,11 +379,13 @@ class Board:
             "P---P---P---P---P\n"
         )
 
+        board = self._board_array()
         intersect_count = 0
         for i, char in enumerate(board_str):
             if char == "P":
-                piece = self.board[
-                    intersect_count // BOARD_LINES, intersect_count % BOARD_COLS
+                piece = board[
+                    intersect_count // BOARD_LINES,
+                    intersect_count % BOARD_COLS,
                 ]
                 if piece == GOAT_PLAYER:
                     piece_str = "G"
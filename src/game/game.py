@@ -1,9 +1,31 @@
+from dataclasses import dataclass
 from typing import List, Literal
 
-from src.constants import CAPTURED_GOATS_TO_WIN, GOAT_PLAYER, TIGER_PLAYER
-from src.game.game_types import BoardSquare, Capture, Play
+from src.constants import (
+    CAPTURED_GOATS_TO_WIN,
+    GOAT_PLAYER,
+    TIGER_PLAYER,
+    TOTAL_NUMBER_OF_GOATS,
+)
+from src.game.game_types import Play
 from src.game.game_state import GameState
 from src.game.board import Board
+from src.game.moves import CAPTURE, MOVE_KINDS, PLACEMENT, encode_move
+from src.game.zobrist import (
+    CAPTURED_GOATS_KEYS,
+    PLAYER_KEYS,
+    POSITIONED_GOATS_KEYS,
+)
+
+
+@dataclass(slots=True)
+class UndoRecord:
+    """What is needed to take back a ply."""
+
+    board: tuple
+    player: int
+    positioned_goats: int
+    captured_goats: int
 
 
 class Game:
@@ -11,13 +33,27 @@ class Game:
         self.board: Board = board or Board()
         self.game_state: GameState = game_state or GameState()
 
-    def ply(self, move: Play):
-        """Make the move of a single player."""
-        self.board.move(move)
+    def ply(self, move: Play) -> UndoRecord:
+        """Make the move of a single player.
 
-        if isinstance(move, BoardSquare):
+        Return a record that can be given to `undo` to take the move back.
+        """
+        return self.ply_code(encode_move(move))
+
+    def ply_code(self, code: int) -> UndoRecord:
+        """Make the move with `code` (see `src.game.moves`), as `ply`."""
+        record = UndoRecord(
+            self.board.snapshot(),
+            self.game_state.player,
+            self.game_state.positioned_goats,
+            self.game_state.captured_goats,
+        )
+        self.board.move_code(code)
+
+        kind = MOVE_KINDS[code]
+        if kind == PLACEMENT:
             self.game_state.positioned_goats += 1
-        elif isinstance(move, Capture):
+        elif kind == CAPTURE:
             self.game_state.captured_goats += 1
 
         if self.game_state.player == TIGER_PLAYER:
@@ -25,25 +61,58 @@ class Game:
         else:
             self.game_state.player = TIGER_PLAYER
 
+        return record
+
+    def undo(self, record: UndoRecord):
+        """Take back the ply that returned `record`.
+
+        Plies must be undone in the reverse order they were made.
+        """
+        self.board.restore(record.board)
+        self.game_state.player = record.player
+        self.game_state.positioned_goats = record.positioned_goats
+        self.game_state.captured_goats = record.captured_goats
+
+    def zobrist_hash(self) -> int:
+        """Return the Zobrist hash of the board and the game state.
+
+        The board part is updated in each move. The game state part is
+        added here, as the state can also be changed directly.
+        """
+        return (
+            self.board.zobrist_hash()
+            ^ PLAYER_KEYS[self.game_state.player]
+            ^ POSITIONED_GOATS_KEYS[self.game_state.positioned_goats]
+            ^ CAPTURED_GOATS_KEYS[self.game_state.captured_goats]
+        )
+
     def available_moves(self) -> List[Play]:
         """Return a list of the available moves."""
         return self.board.available_moves(self.game_state)
 
+    def available_move_codes(self) -> bytes:
+        """Return the codes of the available moves."""
+        return self.board.available_move_codes(self.game_state)
+
     def is_game_over(self) -> bool:
         """Return True if the game ended, False otherwise."""
-        if self._captured_required_goats() or self._trapped_tigers():
-            return True
-
-        return False
+        return self.get_winner() is not None
 
     def get_winner(self) -> Literal[-1, 1] | None:
-        """Return the winner of the game, or None if it's not over"""
+        """Return the winner of the game, or None if it's not over.
+
+        The tigers win by capturing enough goats, and the player to move
+        loses when it has no moves.
+        """
         if self._captured_required_goats():
             return TIGER_PLAYER
 
         if self._trapped_tigers():
             return GOAT_PLAYER
 
+        if self._blocked_goats():
+            return TIGER_PLAYER
+
         return None
 
     def _captured_required_goats(self) -> bool:
@@ -53,8 +122,22 @@ class Game:
         return False
 
     def _trapped_tigers(self) -> bool:
-        if self.game_state.player == TIGER_PLAYER and len(self.board.available_moves(self.game_state)) == 0:
-            return True
+        if self.game_state.player != TIGER_PLAYER:
+            return False
+
+        # The tigers have no moves when they can't move nor capture
+        movements, captures, _ = self.board.evaluation_terms()
+        return movements == 0 and captures == 0
+
+    def _blocked_goats(self) -> bool:
+        # There are more squares than pieces, so goats can always be placed
+        if (
+            self.game_state.player != GOAT_PLAYER
+            or self.game_state.positioned_goats < TOTAL_NUMBER_OF_GOATS
+        ):
+            return False
+
+        return not self.available_move_codes()
 
     def count_number_of_locked_tigers(self):
         """Return the number of tigers that don't have allowed moves.
@@ -68,7 +151,9 @@ class Game:
     def print_game_info(self):
         """Print the state of the game, including the state and the board."""
         print("-" * 80)
-        print(f"Current player: {'Tiger' if self.game_state.player == TIGER_PLAYER else 'GOAT'}")
+        print(
+            f"Current player: {'Tiger' if self.game_state.player == TIGER_PLAYER else 'GOAT'}"
+        )
         print(
             f"Total Positioned Goats: {self.game_state.positioned_goats}"
             f"       ---       "
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BoardSquare:
     """A position in the board"""
 
@@ -12,7 +12,7 @@ class BoardSquare:
         return f"({self.lin}, {self.col})"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Movement:
     """Defines a movement in the board"""
 
@@ -23,7 +23,7 @@ class Movement:
         return f"({self.start.lin}, {self.start.col} -> ({self.end.lin}, {self.end.col})"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Capture:
     """Defines a capture of a piece"""
 
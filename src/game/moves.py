@@ -0,0 +1,102 @@
+"""Table of every move of the board, each identified by a small integer.
+
+The board has 25 squares and a fixed set of movements and captures, so all
+the moves are built once here. The search works with the codes (their
+indexes in `MOVES`), kept in `bytes` move lists, and only turns them into
+`BoardSquare`, `Movement` and `Capture` objects when they leave it. Those
+objects are the ones in `MOVES`, so they are never created again.
+
+Codes are ordered by kind: the placements first (the code of a placement
+is its square), then the movements, then the captures.
+"""
+
+from typing import Dict, Final, Tuple
+
+from src.game.game_types import Capture, Movement, Play
+from src.game.topology import (
+    JUMP_TRIPLES,
+    NEIGHBORS,
+    NUMBER_OF_SQUARES,
+    SQUARES,
+)
+
+# Kinds of move
+PLACEMENT: Final = 0
+MOVEMENT: Final = 1
+CAPTURE: Final = 2
+
+# Square of the moves without one (the start of a placement, and the
+# captured square of the moves that aren't captures)
+NO_SQUARE: Final = -1
+
+_TABLE: Final = (
+    [
+        (PLACEMENT, NO_SQUARE, NO_SQUARE, square)
+        for square in range(NUMBER_OF_SQUARES)
+    ]
+    + [
+        (MOVEMENT, start, NO_SQUARE, end)
+        for start, neighbors in enumerate(NEIGHBORS)
+        for end in neighbors
+    ]
+    + [
+        (CAPTURE, start, over, landing)
+        for start, over, landing in JUMP_TRIPLES
+    ]
+)
+# Fewer than 256, so a code fits in a byte
+NUMBER_OF_MOVES: Final = len(_TABLE)
+
+# Columns of the table, indexed by the code
+MOVE_KINDS: Final = tuple(kind for kind, _, _, _ in _TABLE)
+MOVE_STARTS: Final = tuple(start for _, start, _, _ in _TABLE)
+MOVE_OVERS: Final = tuple(over for _, _, over, _ in _TABLE)
+MOVE_ENDS: Final = tuple(end for _, _, _, end in _TABLE)
+
+
+def _move(kind: int, start: int, over: int, end: int) -> Play:
+    if kind == PLACEMENT:
+        return SQUARES[end]
+    if kind == MOVEMENT:
+        return Movement(SQUARES[start], SQUARES[end])
+
+    return Capture(SQUARES[start], SQUARES[over], SQUARES[end])
+
+
+MOVES: Final[Tuple[Play, ...]] = tuple(_move(*row) for row in _TABLE)
+MOVE_CODES: Final[Dict[Play, int]] = {
+    move: code for code, move in enumerate(MOVES)
+}
+
+# Codes of the moves from each square: the movements to each neighbor as
+# (end, code), and the captures as (captured, landing, code), in the
+# order of `NEIGHBORS` and `JUMPS`
+MOVEMENT_CODES: Final = tuple(
+    tuple(
+        (MOVE_ENDS[code], code)
+        for code in range(NUMBER_OF_MOVES)
+        if MOVE_KINDS[code] == MOVEMENT and MOVE_STARTS[code] == start
+    )
+    for start in range(NUMBER_OF_SQUARES)
+)
+CAPTURE_CODES: Final = tuple(
+    tuple(
+        (MOVE_OVERS[code], MOVE_ENDS[code], code)
+        for code in range(NUMBER_OF_MOVES)
+        if MOVE_KINDS[code] == CAPTURE and MOVE_STARTS[code] == start
+    )
+    for start in range(NUMBER_OF_SQUARES)
+)
+
+
+def encode_move(move: Play) -> int:
+    """Return the code of `move`, which must be a move of the board."""
+    try:
+        return MOVE_CODES[move]
+    except KeyError:
+        raise ValueError(f"Invalid move: {move!r}") from None
+
+
+def decode_move(code: int) -> Play:
+    """Return the move with `code`."""
+    return MOVES[code]
@@ -0,0 +1,230 @@
+"""Compact binary records of played games.
+
+A record file starts with `MAGIC`, followed by the records of its games,
+one after the other. Each record is a `HEADER`, the settings of the goat
+and tiger engines as UTF-8 text, and the code of each move (see
+`src.game.moves`). There are fewer than 256 codes, so each move takes a
+single byte, and a game of 100 plies takes a little over 100 bytes.
+
+Games start from the initial position. Records are appended to the file
+as the games end, and read back either in order with `read_records`,
+which streams the file, or by index with `GameRecords`, which maps it
+into memory with `np.memmap`. Neither loads the whole file.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List
+
+import numpy as np
+import numpy.typing as npt
+
+from src.game.board import Board
+from src.game.game import Game
+from src.game.game_state import GameState
+from src.game.game_types import Play
+from src.game.moves import (
+    MOVE_ENDS,
+    MOVE_OVERS,
+    MOVE_STARTS,
+    MOVES,
+    NO_SQUARE,
+    encode_move,
+)
+from src.game.topology import NUMBER_OF_SQUARES
+
+# Start of every record file, with the version of the format
+MAGIC = b"BCR\x01"
+
+HEADER = np.dtype(
+    [
+        ("plies", "<u2"),
+        # GOAT_PLAYER, TIGER_PLAYER, or 0 for a draw or an unfinished game
+        ("winner", "i1"),
+        # Plies at the start that weren't chosen by the engines, such as
+        # random openings
+        ("opening_plies", "u1"),
+        # Bytes of the settings of each engine
+        ("goat_length", "u1"),
+        ("tiger_length", "u1"),
+    ]
+)
+
+
+@dataclass
+class GameRecord:
+    """A game, as the codes of its moves from the initial position."""
+
+    goat: str
+    tiger: str
+    winner: int | None
+    moves: bytes
+    opening_plies: int = 0
+
+    @classmethod
+    def from_plays(
+        cls,
+        goat: str,
+        tiger: str,
+        winner: int | None,
+        plays: Iterable[Play],
+        opening_plies: int = 0,
+    ) -> "GameRecord":
+        """Return the record of a game with the moves in `plays`."""
+        moves = bytes(encode_move(play) for play in plays)
+        return cls(goat, tiger, winner, moves, opening_plies)
+
+    @property
+    def plays(self) -> List[Play]:
+        return [MOVES[code] for code in self.moves]
+
+    def game(self, plies: int | None = None) -> Game:
+        """Return the game after its first `plies` moves, or all of them."""
+        game = Game()
+        for code in self.moves[:plies]:
+            game.ply_code(code)
+        return game
+
+    def positions(self) -> Iterator[Game]:
+        """Yield the game before each move, and at the end.
+
+        The same `Game` is yielded each time, with one more move made.
+        """
+        game = Game()
+        yield game
+        for code in self.moves:
+            game.ply_code(code)
+            yield game
+
+    def boards(self) -> npt.NDArray[np.int8]:
+        """Return the (plies + 1, 25) boards of the game before each move,
+        and at the end, with the values of `Board.board`."""
+        boards = np.empty((len(self.moves) + 1, NUMBER_OF_SQUARES), np.int8)
+        board = Board().board.reshape(NUMBER_OF_SQUARES).astype(np.int8)
+        player = GameState().player
+        boards[0] = board
+        for ply, code in enumerate(self.moves, 1):
+            if MOVE_STARTS[code] != NO_SQUARE:
+                board[MOVE_STARTS[code]] = 0
+            if MOVE_OVERS[code] != NO_SQUARE:
+                board[MOVE_OVERS[code]] = 0
+            board[MOVE_ENDS[code]] = player
+            player = -player
+            boards[ply] = board
+
+        return boards
+
+    def to_bytes(self) -> bytes:
+        goat = self.goat.encode()
+        tiger = self.tiger.encode()
+        if max(len(goat), len(tiger)) > np.iinfo(np.uint8).max:
+            raise ValueError("Engine settings too long for a record")
+        if not 0 <= self.opening_plies <= np.iinfo(np.uint8).max:
+            raise ValueError(
+                f"Invalid opening plies for a record: {self.opening_plies}"
+            )
+        if len(self.moves) > np.iinfo(np.uint16).max:
+            raise ValueError("Game too long for a record")
+
+        header = np.array(
+            (
+                len(self.moves),
+                self.winner or 0,
+                self.opening_plies,
+                len(goat),
+                len(tiger),
+            ),
+            dtype=HEADER,
+        )
+        return header.tobytes() + goat + tiger + bytes(self.moves)
+
+
+def append_records(path: str, records: Iterable[GameRecord]):
+    """Append `records` to the file at `path`, creating it if needed."""
+    with open(path, "ab") as file:
+        if file.tell() == 0:
+            file.write(MAGIC)
+        for record in records:
+            file.write(record.to_bytes())
+
+
+def read_records(path: str) -> Iterator[GameRecord]:
+    """Yield the records of the file at `path`, in order, reading one at
+    a time."""
+    with open(path, "rb") as file:
+        _check_magic(file.read(len(MAGIC)))
+        while header := file.read(HEADER.itemsize):
+            if len(header) < HEADER.itemsize:
+                raise ValueError("Truncated game record")
+            header = np.frombuffer(header, dtype=HEADER)[0]
+            size = _body_size(header)
+            body = file.read(size)
+            if len(body) < size:
+                raise ValueError("Truncated game record")
+            yield _record(header, body)
+
+
+class GameRecords:
+    """The records of a file, by index.
+
+    The file is mapped into memory, and only the offsets of the records
+    are read when it's opened.
+    """
+
+    def __init__(self, path: str):
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        _check_magic(self.data[: len(MAGIC)].tobytes())
+
+        offsets = []
+        offset = len(MAGIC)
+        while offset < len(self.data):
+            offsets.append(offset)
+            offset += HEADER.itemsize + _body_size(self._header(offset))
+        if offset > len(self.data):
+            raise ValueError("Truncated game record")
+        self.offsets = np.array(offsets, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        offset = int(self.offsets[index])
+        header = self._header(offset)
+        start = offset + HEADER.itemsize
+        body = self.data[start : start + _body_size(header)].tobytes()
+        return _record(header, body)
+
+    def moves(self, index: int) -> npt.NDArray[np.uint8]:
+        """Return the move codes of the record at `index`, as a view of the
+        file."""
+        offset = int(self.offsets[index])
+        header = self._header(offset)
+        end = offset + HEADER.itemsize + _body_size(header)
+        return self.data[end - int(header["plies"]) : end]
+
+    def _header(self, offset: int) -> np.void:
+        return self.data[offset : offset + HEADER.itemsize].view(HEADER)[0]
+
+
+def _check_magic(magic: bytes):
+    if magic != MAGIC:
+        raise ValueError("Not a game record file")
+
+
+def _body_size(header: np.void) -> int:
+    return (
+        int(header["goat_length"])
+        + int(header["tiger_length"])
+        + int(header["plies"])
+    )
+
+
+def _record(header: np.void, body: bytes) -> GameRecord:
+    goat_end = int(header["goat_length"])
+    tiger_end = goat_end + int(header["tiger_length"])
+    return GameRecord(
+        goat=body[:goat_end].decode(),
+        tiger=body[goat_end:tiger_end].decode(),
+        winner=int(header["winner"]) or None,
+        moves=body[tiger_end:],
+        opening_plies=int(header["opening_plies"]),
+    )
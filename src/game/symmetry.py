@@ -0,0 +1,141 @@
+"""Symmetries of the board.
+
+The lines of the board, diagonals included, are the same after any of the
+8 rotations and reflections of the square, so positions that are mapped to
+each other by them have the same value. A symmetry is given by its index
+in `SYMMETRIES`, and maps square `i` to square `SYMMETRIES[s][i]`.
+"""
+
+from typing import Final, Tuple
+
+from src.constants import BOARD_COLS, BOARD_LINES
+from src.game.game import Game
+from src.game.game_types import BoardSquare, Capture, Movement, Play
+from src.game.moves import MOVE_CODES, MOVES
+from src.game.topology import NUMBER_OF_SQUARES, SQUARES, square_index
+from src.game.zobrist import pieces_hash
+
+_LAST = BOARD_LINES - 1
+
+
+def _permutation(transform) -> Tuple[int, ...]:
+    return tuple(
+        square_index(BoardSquare(*transform(square.lin, square.col)))
+        for square in SQUARES
+    )
+
+
+# Identity, the 3 rotations, and the 4 reflections
+SYMMETRIES: Final = tuple(
+    _permutation(transform)
+    for transform in (
+        lambda lin, col: (lin, col),
+        lambda lin, col: (col, _LAST - lin),
+        lambda lin, col: (_LAST - lin, _LAST - col),
+        lambda lin, col: (_LAST - col, lin),
+        lambda lin, col: (lin, _LAST - col),
+        lambda lin, col: (_LAST - lin, col),
+        lambda lin, col: (col, lin),
+        lambda lin, col: (_LAST - col, _LAST - lin),
+    )
+)
+IDENTITY: Final = 0
+
+# Index of the symmetry that undoes each symmetry
+INVERSES: Final = tuple(
+    next(
+        other
+        for other, inverse in enumerate(SYMMETRIES)
+        if all(inverse[symmetry[i]] == i for i in range(NUMBER_OF_SQUARES))
+    )
+    for symmetry in SYMMETRIES
+)
+
+# Masks are mapped one line of the board at a time: `_LINE_MASKS[s][l][b]`
+# is the image by symmetry `s` of the squares `b` of line `l`
+_LINE_MASKS: Final = tuple(
+    tuple(
+        tuple(
+            sum(
+                1 << symmetry[line * BOARD_COLS + col]
+                for col in range(BOARD_COLS)
+                if bits >> col & 1
+            )
+            for bits in range(1 << BOARD_COLS)
+        )
+        for line in range(BOARD_LINES)
+    )
+    for symmetry in SYMMETRIES
+)
+_LINE = (1 << BOARD_COLS) - 1
+
+
+def transform_mask(mask: int, symmetry: int) -> int:
+    """Return the image of the squares of `mask` by `symmetry`."""
+    result = 0
+    for line, images in enumerate(_LINE_MASKS[symmetry]):
+        result |= images[mask >> (line * BOARD_COLS) & _LINE]
+
+    return result
+
+
+def transform_square(square: BoardSquare, symmetry: int) -> BoardSquare:
+    return SQUARES[SYMMETRIES[symmetry][square_index(square)]]
+
+
+def transform_move(move: Play, symmetry: int) -> Play:
+    """Return the image of `move` by `symmetry`."""
+    if isinstance(move, BoardSquare):
+        return transform_square(move, symmetry)
+    if isinstance(move, Movement):
+        return Movement(
+            transform_square(move.start, symmetry),
+            transform_square(move.end, symmetry),
+        )
+
+    return Capture(
+        transform_square(move.starting_square, symmetry),
+        transform_square(move.captured, symmetry),
+        transform_square(move.ending_square, symmetry),
+    )
+
+
+# `SYMMETRIC_CODES[s][c]` is the code of the image of the move with code
+# `c` by symmetry `s`
+SYMMETRIC_CODES: Final = tuple(
+    bytes(MOVE_CODES[transform_move(move, symmetry)] for move in MOVES)
+    for symmetry in range(len(SYMMETRIES))
+)
+
+
+def canonical_masks(tigers: int, goats: int) -> Tuple[int, int, int]:
+    """Return the canonical image of a position, the smallest of its
+    images by the symmetries, and the symmetry that maps it there."""
+    best = (tigers, goats, IDENTITY)
+    for symmetry in range(1, len(SYMMETRIES)):
+        image = (
+            transform_mask(tigers, symmetry),
+            transform_mask(goats, symmetry),
+            symmetry,
+        )
+        if image < best:
+            best = image
+
+    return best
+
+
+def canonical_hash(game: Game) -> Tuple[int, int]:
+    """Return the hash of the canonical image of the position of `game`,
+    equal for all the symmetric positions, and the symmetry that maps the
+    position to it."""
+    tigers, goats = game.board.snapshot()[:2]
+    canonical_tigers, canonical_goats, symmetry = canonical_masks(
+        tigers, goats
+    )
+    key = game.zobrist_hash()
+    if symmetry != IDENTITY:
+        key ^= game.board.zobrist ^ pieces_hash(
+            canonical_tigers, canonical_goats
+        )
+
+    return key, symmetry
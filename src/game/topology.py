@@ -0,0 +1,139 @@
+"""Adjacency and jump tables of the board, built once at import.
+
+Squares are indexed line by line: square `i` is
+(i // BOARD_COLS, i % BOARD_COLS), and bit `i` of a board mask is set
+when there's a piece in it.
+"""
+
+from typing import Final, Tuple
+
+import numpy as np
+
+from src.constants import AVAILABLE_DIAGONAL_MOVEMENTS, BOARD_COLS, BOARD_LINES
+from src.game.game_types import BoardSquare
+
+NUMBER_OF_SQUARES: Final = BOARD_LINES * BOARD_COLS
+FULL_BOARD_MASK: Final = (1 << NUMBER_OF_SQUARES) - 1
+
+SQUARES: Final = tuple(
+    BoardSquare(index // BOARD_COLS, index % BOARD_COLS)
+    for index in range(NUMBER_OF_SQUARES)
+)
+
+
+def square_index(square: BoardSquare) -> int:
+    """Return the index of `square`."""
+    return square.lin * BOARD_COLS + square.col
+
+
+def _neighbors(index: int) -> Tuple[int, ...]:
+    """Return the squares connected to `index` by a line of the board."""
+    lin, col = divmod(index, BOARD_COLS)
+
+    neighbors = []
+    if lin > 0:
+        neighbors.append(index - BOARD_COLS)
+    if lin < BOARD_LINES - 1:
+        neighbors.append(index + BOARD_COLS)
+    if col > 0:
+        neighbors.append(index - 1)
+    if col < BOARD_COLS - 1:
+        neighbors.append(index + 1)
+
+    for diagonal in AVAILABLE_DIAGONAL_MOVEMENTS.get(SQUARES[index], ()):
+        neighbors.append(square_index(diagonal))
+
+    return tuple(neighbors)
+
+
+# Neighbors of each square: up, down, left, right, then the diagonals
+NEIGHBORS: Final = tuple(
+    _neighbors(index) for index in range(NUMBER_OF_SQUARES)
+)
+NEIGHBOR_MASKS: Final = tuple(
+    sum(1 << neighbor for neighbor in neighbors) for neighbors in NEIGHBORS
+)
+NEIGHBOR_SQUARES: Final = tuple(
+    tuple(SQUARES[neighbor] for neighbor in neighbors)
+    for neighbors in NEIGHBORS
+)
+
+
+def _jumps(index: int) -> Tuple[Tuple[int, int], ...]:
+    """Return the (captured, landing) squares of a tiger in `index`.
+
+    A jump follows a single line: the landing square must be a neighbor of
+    the captured one, in the same direction as the captured one is from
+    `index`.
+    """
+    lin, col = divmod(index, BOARD_COLS)
+
+    jumps = []
+    for over in NEIGHBORS[index]:
+        over_lin, over_col = divmod(over, BOARD_COLS)
+        landing_lin = over_lin + (over_lin - lin)
+        landing_col = over_col + (over_col - col)
+        if not (
+            0 <= landing_lin < BOARD_LINES and 0 <= landing_col < BOARD_COLS
+        ):
+            continue
+
+        landing = landing_lin * BOARD_COLS + landing_col
+        if landing in NEIGHBORS[over]:
+            jumps.append((over, landing))
+
+    return tuple(jumps)
+
+
+# (captured square, landing square) pairs for a tiger in each square, in
+# the order of `NEIGHBORS`
+JUMPS: Final = tuple(_jumps(index) for index in range(NUMBER_OF_SQUARES))
+JUMP_OVER_MASKS: Final = tuple(
+    sum(1 << over for over, _ in jumps) for jumps in JUMPS
+)
+
+# Every (start, captured, landing) capture of the board
+JUMP_TRIPLES: Final = tuple(
+    (start, over, landing)
+    for start, jumps in enumerate(JUMPS)
+    for over, landing in jumps
+)
+
+
+def _tiger_influence(index: int) -> int:
+    """Return the mask of the squares of the tigers that can move to,
+    capture or jump over `index`, including itself."""
+    mask = 1 << index
+    for start, over, landing in JUMP_TRIPLES:
+        if index in (over, landing):
+            mask |= 1 << start
+    for neighbor in NEIGHBORS[index]:
+        mask |= 1 << neighbor
+
+    return mask
+
+
+# Tigers whose moves may change when the piece in a square changes
+TIGER_INFLUENCE_MASKS: Final = tuple(
+    _tiger_influence(index) for index in range(NUMBER_OF_SQUARES)
+)
+
+
+# The same tables as arrays, for vectorized code: `ADJACENCY[i, j]` is
+# True when `i` and `j` are neighbors, and the jump arrays hold the
+# columns of `JUMP_TRIPLES`
+ADJACENCY: Final = np.array(
+    [
+        [other in neighbors for other in range(NUMBER_OF_SQUARES)]
+        for neighbors in NEIGHBORS
+    ]
+)
+JUMP_START: Final = np.array(
+    [start for start, _, _ in JUMP_TRIPLES], dtype=np.intp
+)
+JUMP_OVER: Final = np.array(
+    [over for _, over, _ in JUMP_TRIPLES], dtype=np.intp
+)
+JUMP_LANDING: Final = np.array(
+    [landing for _, _, landing in JUMP_TRIPLES], dtype=np.intp
+)
@@ -0,0 +1,33 @@
+"""Random keys used to hash positions with Zobrist hashing."""
+
+from random import Random
+from typing import Final
+
+from src.constants import BOARD_COLS, BOARD_LINES, TOTAL_NUMBER_OF_GOATS
+
+_random = Random(0x42A6A)
+
+
+def _keys(count: int) -> tuple:
+    return tuple(_random.getrandbits(64) for _ in range(count))
+
+
+TIGER_KEYS: Final = _keys(BOARD_LINES * BOARD_COLS)
+GOAT_KEYS: Final = _keys(BOARD_LINES * BOARD_COLS)
+
+# Keys of the game state, indexed by the player (-1 or 1) and by the counters
+PLAYER_KEYS: Final = {player: key for player, key in zip((-1, 1), _keys(2))}
+POSITIONED_GOATS_KEYS: Final = _keys(TOTAL_NUMBER_OF_GOATS + 1)
+CAPTURED_GOATS_KEYS: Final = _keys(TOTAL_NUMBER_OF_GOATS + 1)
+
+
+def pieces_hash(tigers: int, goats: int) -> int:
+    """Return the hash of the pieces in the `tigers` and `goats` masks."""
+    key = 0
+    for keys, mask in ((TIGER_KEYS, tigers), (GOAT_KEYS, goats)):
+        while mask:
+            low = mask & -mask
+            key ^= keys[low.bit_length() - 1]
+            mask ^= low
+
+    return key
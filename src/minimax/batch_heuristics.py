@@ -0,0 +1,85 @@
+"""Vectorized version of `heuristics.heuristic`, for many positions at once.
+
+Positions are given as an (N, 25) array with a row per board, using the
+same values as `Board.board` (tigers, goats and empty squares), in the
+order of the square indexes of `src.game.topology`.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from src.constants import CLEAN_SQUARE, GOAT_PLAYER, TIGER_PLAYER
+from src.game.topology import (
+    ADJACENCY,
+    JUMP_LANDING,
+    JUMP_OVER,
+    JUMP_START,
+    NUMBER_OF_SQUARES,
+)
+
+_SQUARE_BITS = np.arange(NUMBER_OF_SQUARES, dtype=np.int64)
+
+# Counting is done with matrix products, which are exact for these small
+# integers in float32 and much faster than integer products in NumPy
+_ADJACENCY = ADJACENCY.astype(np.float32)
+
+# Maps each jump to its starting square, to count the captures per tiger
+_JUMP_STARTS = np.zeros((len(JUMP_START), NUMBER_OF_SQUARES), dtype=np.float32)
+_JUMP_STARTS[np.arange(len(JUMP_START)), JUMP_START] = 1
+
+
+def boards_from_masks(
+    tigers: npt.ArrayLike, goats: npt.ArrayLike
+) -> npt.NDArray[np.int8]:
+    """Return the (N, 25) boards of the given tiger and goat bit masks."""
+    tigers = np.asarray(tigers, dtype=np.int64)[:, None]
+    goats = np.asarray(goats, dtype=np.int64)[:, None]
+
+    tiger_squares = (tigers >> _SQUARE_BITS) & 1
+    goat_squares = (goats >> _SQUARE_BITS) & 1
+    boards = goat_squares * GOAT_PLAYER + tiger_squares * TIGER_PLAYER
+
+    return boards.astype(np.int8)
+
+
+def heuristic_batch(
+    boards: npt.NDArray,
+    positioned_goats: npt.ArrayLike,
+    captured_goats: npt.ArrayLike,
+) -> npt.NDArray[np.int64]:
+    """Return `heuristic` for each of the (N, 25) `boards`.
+
+    `positioned_goats` and `captured_goats` are the counters of the game
+    state of each board.
+    """
+    boards = np.asarray(boards)
+    positioned_goats = np.asarray(positioned_goats, dtype=np.int64)
+    captured_goats = np.asarray(captured_goats, dtype=np.int64)
+
+    tigers = boards == TIGER_PLAYER
+    goats = boards == GOAT_PLAYER
+    empty = boards == CLEAN_SQUARE
+
+    free_neighbors = empty.astype(np.float32) @ _ADJACENCY
+    tiger_movements = (free_neighbors * tigers).sum(axis=1)
+
+    captures = (
+        tigers[:, JUMP_START] & goats[:, JUMP_OVER] & empty[:, JUMP_LANDING]
+    )
+    tiger_captures = captures.astype(np.float32) @ _JUMP_STARTS
+    total_captures = tiger_captures.sum(axis=1)
+
+    locked_tigers = (
+        tigers & (free_neighbors == 0) & (tiger_captures == 0)
+    ).sum(axis=1)
+    tiger_moves = np.where(
+        total_captures > 0, 50 * total_captures, 5 * tiger_movements
+    ).astype(np.int64)
+
+    return (
+        positioned_goats
+        - captured_goats
+        + 2 * locked_tigers
+        - 10 * captured_goats
+        - tiger_moves
+    )
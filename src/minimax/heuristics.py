@@ -1,8 +1,6 @@
 from math import inf
 
-from constants import TIGER_PLAYER
-from game.game import Game
-from game.game_types import Capture
+from src.game.game import Game
 
 
 def dummy_heuristic_goat(game: Game) -> int | float:
@@ -14,7 +12,9 @@ def dummy_heuristic_tiger(game: Game) -> int | float:
 
 
 def heuristic(game: Game) -> int | float:
-    num_goat = game.game_state.positioned_goats - game.game_state.captured_goats
+    num_goat = (
+        game.game_state.positioned_goats - game.game_state.captured_goats
+    )
     locked_tigers = game.count_number_of_locked_tigers() * 2
 
     value_captured_goat = 10 * game.game_state.captured_goats
@@ -28,16 +28,13 @@ def heuristic(game: Game) -> int | float:
 
 
 def _calculate_tiger_moves_score(game: Game) -> int:
-    current_player = game.game_state.player
-    game.game_state.player = TIGER_PLAYER
-
-    score = 0
-    allowed_moves = game.available_moves()
-    for move in allowed_moves:
-        if isinstance(move, Capture):
-            score += 50
-        else:
-            score += 5
-
-    game.game_state.player = current_player
-    return score
+    """Score the moves the tigers would have if it was their turn.
+
+    Captures are forced, so when there's a capture the tigers' moves are
+    only the captures.
+    """
+    movements, captures, _ = game.board.evaluation_terms()
+    if captures:
+        return 50 * captures
+
+    return 5 * movements
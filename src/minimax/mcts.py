@@ -0,0 +1,476 @@
+"""Monte Carlo tree search (MCTS).
+
+An alternative to the alpha-beta searches that needs no heuristic: the
+value of a position is estimated from the results of random games played
+from it (playouts), and the tree grows towards the moves that score best,
+balanced with the ones tried the least (UCT). A heuristic can still be
+given as a prior, so the moves it prefers are tried first.
+
+The nodes are kept in arrays indexed by the node, instead of objects, and
+the playouts of a batch of leaves are played together with `BatchGame`.
+"""
+
+import copy
+import time
+from math import log, sqrt
+from typing import Callable, List
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER
+from src.game.batch_game import NO_MOVE, BatchGame, random_moves
+from src.game.game import Game
+from src.game.moves import MOVES
+from src.minimax.batch_heuristics import boards_from_masks
+from src.minimax.search import SearchResult
+from src.minimax.statistics import SearchStatistics
+
+# Index of a missing node
+NO_NODE = -1
+# Children count of the nodes that weren't expanded yet
+NOT_EXPANDED = -1
+
+# Score of a playout for the goats
+GOAT_WIN = 1.0
+DRAW = 0.5
+TIGER_WIN = 0.0
+
+# Arrays with a value per node
+_COLUMNS = (
+    "_parent",
+    "_first_child",
+    "_children",
+    "_move",
+    "_mover",
+    "_visits",
+    "_score",
+    "_prior",
+    "_winner",
+)
+
+# Heuristic values are clipped to this, so wins don't dominate the prior
+_MAX_PRIOR_VALUE = 1000
+
+
+class MonteCarloTreeSearch:
+    """A search tree kept between the moves of a game.
+
+    Each iteration walks down the tree from the root, choosing at each node
+    the child with the best UCT score, until a leaf. A leaf is expanded the
+    second time it's reached, and a playout is played from the position
+    reached. Its score is then added to the nodes on the way, each from
+    the side of the player who moved into it.
+
+    - `exploration`: weight of the less tried moves against the better
+      ones.
+    - `heuristic`: gives a prior to the children of each expanded node,
+      from their values, and turns UCT into PUCT (as in AlphaZero).
+    - `prior_temperature`: the larger, the more even the prior.
+    - `batch_size`: leaves chosen before their playouts are played
+      together. While a batch is chosen, the nodes already on its paths
+      count as lost (a "virtual loss"), so the paths spread out.
+    - `playout_plies`: playouts longer than this end in a draw.
+    - `max_nodes`: nodes after which the tree stops growing. The root is
+      expanded even past it.
+
+    The tree is kept between searches: if the position of the next search
+    is a child or grandchild of the root, the search starts from its
+    subtree.
+    """
+
+    def __init__(
+        self,
+        exploration: float = 1.4,
+        heuristic: Callable[[Game], int | float] | None = None,
+        prior_temperature: float = 10.0,
+        batch_size: int = 32,
+        playout_plies: int = 200,
+        max_nodes: int = 2**20,
+        seed: int | None = None,
+    ):
+        if max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1")
+
+        self.exploration = exploration
+        self.heuristic = heuristic
+        self.prior_temperature = prior_temperature
+        self.batch_size = batch_size
+        self.playout_plies = playout_plies
+        self.max_nodes = max_nodes
+        self._rng = np.random.default_rng(seed)
+
+        self._size = 0
+        self._capacity = 0
+        # Columns of the nodes
+        self._parent = np.empty(0, dtype=np.int32)
+        self._first_child = np.empty(0, dtype=np.int32)
+        self._children = np.empty(0, dtype=np.int16)
+        # Code of the move into the node, and the player who played it
+        self._move = np.empty(0, dtype=np.uint8)
+        self._mover = np.empty(0, dtype=np.int8)
+        self._visits = np.empty(0, dtype=np.int32)
+        # Sum of the playout scores, for the player who moved into the node
+        self._score = np.empty(0, dtype=np.float64)
+        self._prior = np.empty(0, dtype=np.float32)
+        # Winner of the position of the node, once known to be over
+        self._winner = np.empty(0, dtype=np.int8)
+
+        self._root = NO_NODE
+        self._game: Game | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def search(
+        self,
+        game: Game,
+        iterations: int | None = None,
+        time_budget: float | None = None,
+    ) -> SearchResult:
+        """Return the most visited move of `game`, after the given number of
+        `iterations` or once the `time_budget` (in seconds) runs out.
+
+        As with `search_best_move`, there's no move when the game is over
+        or the player to move can't move. The value is the expected score
+        of the goats, from -1 for a tiger win to 1 for a goat win.
+        """
+        if iterations is None and time_budget is None:
+            raise ValueError(
+                "Either a number of iterations or a time budget must be given"
+            )
+        if iterations is not None and iterations < 1:
+            raise ValueError("iterations must be at least 1")
+
+        start = time.perf_counter()
+        statistics = SearchStatistics()
+        self._set_root(game)
+        if self._children[self._root] == 0:
+            # Over, or the player to move can't move and has lost
+            winner = float(self._winner[self._root])
+            return SearchResult(None, winner, [], statistics)
+
+        done = 0
+        while iterations is None or done < iterations:
+            size = self.batch_size
+            if iterations is not None:
+                size = min(size, iterations - done)
+            self._run_batch(size, statistics)
+            done += size
+            if (
+                time_budget is not None
+                and time.perf_counter() - start > time_budget
+            ):
+                break
+
+        statistics.nodes = done
+        statistics.time = time.perf_counter() - start
+        return self._result(statistics)
+
+    def _set_root(self, game: Game):
+        """Make the position of `game` the root, keeping its subtree if it's
+        already in the tree."""
+        node = NO_NODE
+        if self._game is not None:
+            node = self._find(game.zobrist_hash())
+
+        self._game = copy.deepcopy(game)
+        if node == NO_NODE:
+            # The root has no move into it, so its code is unused
+            self._size = 0
+            node = self._add_nodes(NO_NODE, bytes(1), -game.game_state.player)
+        else:
+            node = self._keep_subtree(node)
+        self._root = node
+        self._parent[node] = NO_NODE
+        if self._children[node] == NOT_EXPANDED:
+            self._expand(node, force=True)
+
+    def _keep_subtree(self, node: int) -> int:
+        """Drop the nodes outside the subtree of `node`, moving the rest to
+        the start of the arrays, and return the new index of `node`."""
+        # The nodes level by level, which keeps the children of each node
+        # together
+        levels = [np.array([node])]
+        while True:
+            level = levels[-1]
+            level = level[self._children[level] > 0]
+            if not len(level):
+                break
+            levels.append(
+                np.concatenate(
+                    [
+                        np.arange(first, first + count)
+                        for first, count in zip(
+                            self._first_child[level], self._children[level]
+                        )
+                    ]
+                )
+            )
+        kept = np.concatenate(levels)
+
+        new_indexes = np.full(self._size, NO_NODE, dtype=np.int32)
+        new_indexes[kept] = np.arange(len(kept))
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            column[: len(kept)] = column[kept]
+        size = len(kept)
+        expanded = self._children[:size] > 0
+        self._first_child[:size][expanded] = new_indexes[
+            self._first_child[:size][expanded]
+        ]
+        self._parent[1:size] = new_indexes[self._parent[1:size]]
+        self._size = size
+        return 0
+
+    def _find(self, key: int) -> int:
+        """Return the child or grandchild of the root with the position of
+        hash `key`, or `NO_NODE`."""
+        game = self._game
+        for child in self._child_nodes(self._root):
+            record = game.ply_code(int(self._move[child]))
+            try:
+                if game.zobrist_hash() == key:
+                    return child
+                for grandchild in self._child_nodes(child):
+                    grandchild_record = game.ply_code(
+                        int(self._move[grandchild])
+                    )
+                    found = game.zobrist_hash() == key
+                    game.undo(grandchild_record)
+                    if found:
+                        return grandchild
+            finally:
+                game.undo(record)
+
+        return NO_NODE
+
+    def _child_nodes(self, node: int) -> range:
+        count = max(int(self._children[node]), 0)
+        first = int(self._first_child[node])
+        return range(first, first + count)
+
+    def _run_batch(self, size: int, statistics: SearchStatistics):
+        """Choose `size` leaves, play out the ones that aren't over, and add
+        the scores to the nodes on their paths."""
+        game = self._game
+        state = game.game_state
+        paths: List[List[int]] = []
+        scores: List[float] = []
+        playouts = []
+        for _ in range(size):
+            path = self._select(game)
+            statistics.max_depth = max(statistics.max_depth, len(path) - 1)
+            leaf = path[-1]
+            if self._winner[leaf]:
+                scores.append(_score(self._winner[leaf]))
+            else:
+                tigers, goats = game.board.snapshot()[:2]
+                playouts.append(
+                    (
+                        len(paths),
+                        tigers,
+                        goats,
+                        state.player,
+                        state.positioned_goats,
+                        state.captured_goats,
+                    )
+                )
+                scores.append(DRAW)
+            paths.append(path)
+            for _ in range(len(path) - 1):
+                game.undo(self._records.pop())
+
+        if playouts:
+            indexes, tigers, goats, *fields = zip(*playouts)
+            games = BatchGame.from_arrays(
+                boards_from_masks(tigers, goats), *fields
+            )
+            for index, score in zip(indexes, self._playouts(games)):
+                scores[index] = score
+            statistics.leaves += len(playouts)
+
+        for path, score in zip(paths, scores):
+            for node in path:
+                if self._mover[node] == GOAT_PLAYER:
+                    self._score[node] += score
+                else:
+                    self._score[node] += 1 - score
+
+    def _select(self, game: Game) -> List[int]:
+        """Walk down from the root to a leaf, making the moves in `game`,
+        and return the nodes on the way.
+
+        The moves are left made, with their records in `_records`. Each
+        node is counted as visited, with no score yet.
+        """
+        node = self._root
+        path = [node]
+        self._records = []
+        self._visits[node] += 1
+        while True:
+            if self._children[node] == NOT_EXPANDED:
+                if self._visits[node] == 1 or not self._expand(node):
+                    return path
+            if self._winner[node]:
+                return path
+
+            node = self._best_child(node)
+            self._records.append(game.ply_code(int(self._move[node])))
+            self._visits[node] += 1
+            path.append(node)
+
+    def _best_child(self, node: int) -> int:
+        first = int(self._first_child[node])
+        children = slice(first, first + int(self._children[node]))
+        visits = self._visits[children]
+        parent_visits = int(self._visits[node])
+
+        if self.heuristic is None:
+            unvisited = np.flatnonzero(visits == 0)
+            if len(unvisited):
+                return first + int(self._rng.choice(unvisited))
+            scores = self._score[children] / visits + self.exploration * (
+                np.sqrt(log(parent_visits) / visits)
+            )
+        else:
+            # Unvisited moves are valued as a draw
+            values = np.divide(
+                self._score[children],
+                visits,
+                out=np.full(len(visits), DRAW),
+                where=visits > 0,
+            )
+            scores = values + self.exploration * self._prior[children] * (
+                sqrt(parent_visits) / (1 + visits)
+            )
+
+        return first + int(scores.argmax())
+
+    def _expand(self, node: int, force: bool = False) -> bool:
+        """Add the children of `node`, whose position is in `_game`, or
+        find that it's over. Return False if the tree is full, unless
+        `force`."""
+        game = self._game
+        winner = game.get_winner()
+        moves = game.available_move_codes()
+        player = game.game_state.player
+        if winner is None and not moves:
+            # The player to move can't move, and loses, as in the search
+            winner = -player
+        if winner is not None:
+            self._winner[node] = winner
+            self._children[node] = 0
+            return True
+
+        if not force and self._size + len(moves) > self.max_nodes:
+            return False
+
+        first = self._add_nodes(node, moves, player)
+        self._first_child[node] = first
+        self._children[node] = len(moves)
+        if self.heuristic is not None:
+            self._prior[first : first + len(moves)] = self._priors(moves)
+        return True
+
+    def _priors(self, moves: bytes) -> np.ndarray:
+        """Return the prior of each of `moves`, a softmax of the heuristic
+        values of their positions for the player to move."""
+        game = self._game
+        sign = 1 if game.game_state.player == GOAT_PLAYER else -1
+        values = []
+        for move in moves:
+            record = game.ply_code(move)
+            value = self.heuristic(game)
+            game.undo(record)
+            values.append(
+                sign * max(-_MAX_PRIOR_VALUE, min(value, _MAX_PRIOR_VALUE))
+            )
+
+        values = np.array(values, dtype=np.float64) / self.prior_temperature
+        weights = np.exp(values - values.max())
+        return weights / weights.sum()
+
+    def _add_nodes(self, parent: int, moves: bytes, mover: int) -> int:
+        """Add a node for each of `moves` played by `mover`, and return the
+        index of the first one."""
+        first = self._size
+        end = first + len(moves)
+        if end > self._capacity:
+            self._grow(end)
+
+        nodes = slice(first, end)
+        self._parent[nodes] = parent
+        self._first_child[nodes] = NO_NODE
+        self._children[nodes] = NOT_EXPANDED
+        self._move[nodes] = np.frombuffer(moves, dtype=np.uint8)
+        self._mover[nodes] = mover
+        self._visits[nodes] = 0
+        self._score[nodes] = 0
+        self._prior[nodes] = 0
+        self._winner[nodes] = 0
+        self._size = end
+        return first
+
+    def _grow(self, size: int):
+        capacity = max(size, 2 * self._capacity, 1024)
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    def _playouts(self, games: BatchGame) -> np.ndarray:
+        """Play random moves in `games` until they are over, and return the
+        score of each for the goats."""
+        scores = np.full(len(games), DRAW)
+        # Index in `scores` of each game still in `games`
+        playing = np.arange(len(games))
+        for _ in range(self.playout_plies):
+            legal = games.legal_moves()
+            winners = games.winners(legal)
+            moves = random_moves(legal, self._rng)
+            # Without moves the player to move loses, as in the search
+            stuck = (winners == 0) & (moves == NO_MOVE)
+            winners[stuck] = -games.player[stuck]
+
+            over = winners != 0
+            if over.any():
+                scores[playing[over]] = np.where(
+                    winners[over] == GOAT_PLAYER, GOAT_WIN, TIGER_WIN
+                )
+                games = games.take(np.flatnonzero(~over))
+                playing = playing[~over]
+                moves = moves[~over]
+                if not len(games):
+                    break
+            games.ply(moves)
+
+        return scores
+
+    def _result(self, statistics: SearchStatistics) -> SearchResult:
+        """Return the most visited child of the root, with its expected
+        score for the goats scaled to [-1, 1] as the value."""
+        line = []
+        node = self._root
+        while self._children[node] > 0:
+            children = self._child_nodes(node)
+            visits = self._visits[children.start : children.stop]
+            if not visits.any():
+                break
+            node = children.start + int(visits.argmax())
+            line.append(MOVES[self._move[node]])
+
+        best = self._child_nodes(self._root).start + int(
+            self._visits[self._child_nodes(self._root)].argmax()
+        )
+        score = self._score[best] / max(int(self._visits[best]), 1)
+        if self._mover[best] != GOAT_PLAYER:
+            score = 1 - score
+        statistics.cutoff = len(line)
+
+        return SearchResult(line[0], 2 * score - 1, line, statistics)
+
+
+def _score(winner: int) -> float:
+    return GOAT_WIN if winner == GOAT_PLAYER else TIGER_WIN
@@ -1,10 +1,26 @@
-from collections import deque
+import time
 from math import inf
 from typing import Callable, Tuple
 
-from constants import GOAT_PLAYER
-from minimax.search_tree import SearchTree
-from game.game import Game
+from src.constants import GOAT_PLAYER
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search_tree import SearchTree
+from src.minimax.statistics import SearchStatistics
+from src.minimax.tablebase import Tablebase
+from src.minimax.transposition_table import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TableEntry,
+    TranspositionTable,
+)
+from src.game.game import Game
+from src.game.game_types import Play
+from src.game.moves import MOVE_CODES, MOVES
+
+
+class SearchTimeout(Exception):
+    """Raised when the time budget of a search runs out."""
 
 
 def alpha_beta_search(
@@ -13,73 +29,283 @@ def alpha_beta_search(
     node: SearchTree = None,
     cutoff: int = None,
     heuristic: Callable[[Game], int] = None,
+    table: TranspositionTable | None = None,
+    deadline: float | None = None,
+    first_move: Play | None = None,
+    ordering: MoveOrdering | None = None,
+    tablebase: Tablebase | None = None,
+    statistics: SearchStatistics | None = None,
 ) -> SearchTree:
+    """Search `game` and return the tree of the explored nodes.
+
+    The moves are made and undone in `game` itself, which is back in its
+    original position when the search returns.
+
+    If a transposition `table` is given, the results of the searched
+    positions are saved in it, and positions already in it are not
+    searched again when the stored result is deep enough.
+
+    If a `deadline` (in `time.perf_counter` seconds) is given, the search
+    raises `SearchTimeout` once it's reached, after undoing its moves.
+    `first_move` is searched before the other moves of the root.
+
+    With a `ordering`, the moves of each node are sorted by it, and the
+    moves that cause cutoffs are recorded in it.
+
+    Positions found in the `tablebase` get their exact value (0 for a
+    draw), and aren't searched further.
+
+    If `statistics` are given, the counters of the search are added to
+    them.
+    """
     if not game:
         game = Game()
     if not node:
         node = SearchTree(game, move)
-        node.value = -inf if node.game.game_state.player == GOAT_PLAYER else inf
+        node.value = -inf if node.player == GOAT_PLAYER else inf
+
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout()
+
+    # The window the node was searched with, for the transposition table
+    original_alpha, original_beta = node.alpha, node.beta
+
+    if statistics is not None:
+        statistics.nodes += 1
+        statistics.max_depth = max(statistics.max_depth, node.depth)
+
+    # Number of plies still to be searched under this node
+    remaining = cutoff - node.depth + 1 if cutoff is not None else inf
+
+    key = None
+    table_move = None
+    if table is not None and node.parent and not node.end:
+        key = game.zobrist_hash()
+        entry = table.probe(key)
+        if statistics is not None:
+            statistics.table_probes += 1
+            statistics.table_hits += entry is not None
+        if entry is not None:
+            if entry.depth >= remaining and _entry_cuts(entry, node):
+                node.value = entry.value
+                return node
+            table_move = entry.move
+
+    if tablebase is not None and node.parent and not node.end:
+        value = tablebase.value(game)
+        if value is not None:
+            node.value = value
+            return node
 
     if cutoff is not None and node.depth > cutoff:
+        if statistics is not None:
+            statistics.leaves += 1
         winner = game.get_winner()
         if winner is not None:
             node.value = winner * inf
         elif heuristic is not None:
             node.value = heuristic(game)
 
+        if key is not None:
+            table.store(key, 0, EXACT, node.value, None)
+        return node
+
+    if node.end:
         return node
 
-    node.expand_children()
+    # Moves are handled by their codes, and the nodes get the move objects
+    moves = game.available_move_codes()
+    if first_move is None:
+        # Search the best move of a previous search first
+        first_code = table_move
+    else:
+        first_code = MOVE_CODES[first_move]
+    if ordering is not None:
+        moves = ordering.order(game, moves, node.depth, first_code)
+    else:
+        moves = list(moves)
+        if first_code is not None and first_code in moves:
+            moves.remove(first_code)
+            moves.insert(0, first_code)
 
-    if game.game_state.player == GOAT_PLAYER:
-        for curr_node in node.children:
+    best_move = None
+    if node.player == GOAT_PLAYER:
+        for code in moves:
+            child_move = MOVES[code]
+            record = game.ply_code(code)
+            curr_node = SearchTree(game, child_move, node, node.depth + 1)
+            # The child is searched with the window found so far
+            curr_node.alpha, curr_node.beta = node.alpha, node.beta
+            node.children.append(curr_node)
             if curr_node.value is None:
                 curr_node.value = inf
 
-            n = alpha_beta_search(
-                curr_node.game, curr_node.move, curr_node, cutoff, heuristic
-            )
+            try:
+                n = alpha_beta_search(
+                    game,
+                    child_move,
+                    curr_node,
+                    cutoff,
+                    heuristic,
+                    table,
+                    deadline,
+                    ordering=ordering,
+                    tablebase=tablebase,
+                    statistics=statistics,
+                )
+            finally:
+                game.undo(record)
 
             if n.value > node.value:
                 node.value = n.value
                 node.alpha = max(node.alpha, n.value)
-            if node.parent and node.value >= node.parent.beta:
+                best_move = code
+            if node.parent and node.value >= node.beta:
+                if key is not None:
+                    table.store(
+                        key, remaining, LOWER_BOUND, node.value, best_move
+                    )
+                if ordering is not None:
+                    ordering.record_cutoff(code, node.depth, remaining)
+                if statistics is not None:
+                    statistics.record_cutoff(len(node.children) - 1)
                 return node
 
     else:
-        for curr_node in node.children:
+        for code in moves:
+            child_move = MOVES[code]
+            record = game.ply_code(code)
+            curr_node = SearchTree(game, child_move, node, node.depth + 1)
+            # The child is searched with the window found so far
+            curr_node.alpha, curr_node.beta = node.alpha, node.beta
+            node.children.append(curr_node)
             if curr_node.value is None:
                 curr_node.value = -inf
 
-            n = alpha_beta_search(
-                curr_node.game, curr_node.move, curr_node, cutoff, heuristic
-            )
+            try:
+                n = alpha_beta_search(
+                    game,
+                    child_move,
+                    curr_node,
+                    cutoff,
+                    heuristic,
+                    table,
+                    deadline,
+                    ordering=ordering,
+                    tablebase=tablebase,
+                    statistics=statistics,
+                )
+            finally:
+                game.undo(record)
 
             if n.value < node.value:
                 node.value = n.value
                 node.beta = min(node.beta, n.value)
-            if node.parent and node.value <= node.parent.alpha:
+                best_move = code
+            if node.parent and node.value <= node.alpha:
+                if key is not None:
+                    table.store(
+                        key, remaining, UPPER_BOUND, node.value, best_move
+                    )
+                if ordering is not None:
+                    ordering.record_cutoff(code, node.depth, remaining)
+                if statistics is not None:
+                    statistics.record_cutoff(len(node.children) - 1)
                 return node
 
+    if key is not None:
+        # All the moves may have failed low against the window
+        if node.value <= original_alpha:
+            bound = UPPER_BOUND
+        elif node.value >= original_beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        table.store(key, remaining, bound, node.value, best_move)
     return node
 
 
-def minimax(game: Game = None, move: Tuple[int, int] | None = None, **kwargs):
-    """Return a search tree with the result for perfect play in each node."""
-    if not game:
-        game = Game()
+def iterative_deepening_search(
+    game: Game,
+    heuristic: Callable[[Game], int],
+    time_budget: float,
+    max_cutoff: int = 64,
+    table: TranspositionTable | None = None,
+    ordering: MoveOrdering | None = None,
+    tablebase: Tablebase | None = None,
+    statistics: SearchStatistics | None = None,
+) -> SearchTree:
+    """Search `game` one ply deeper at a time, until `time_budget` runs out.
 
-    node = SearchTree(game, move)
+    Return the tree of the last search that finished. The best move of
+    each search is searched first in the next one, so when the time runs
+    out in the middle of a search its root children that were already
+    searched are at least as good as the previous result, and they are
+    used instead.
 
-    frontier = deque([node])
+    The first search (with cutoff 1) always runs to the end, so there's a
+    result even if the budget is too small. The `statistics`, if given,
+    also get the nodes and time of each finished search.
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget
+    if ordering is None:
+        ordering = MoveOrdering()
 
-    while frontier:
-        curr_node = frontier.pop()
-        curr_node.expand_children()
+    result = None
+    best_move = None
+    for cutoff in range(1, max_cutoff + 1):
+        root = SearchTree(game, None)
+        if not root.end:
+            root.value = -inf if root.player == GOAT_PLAYER else inf
+        try:
+            alpha_beta_search(
+                game,
+                node=root,
+                cutoff=cutoff,
+                heuristic=heuristic,
+                table=table,
+                deadline=deadline if result is not None else None,
+                first_move=best_move,
+                ordering=ordering,
+                tablebase=tablebase,
+                statistics=statistics,
+            )
+        except SearchTimeout:
+            # The last child was being searched when the time ran out
+            searched = root.children[:-1]
+            if searched and searched[0].move == best_move:
+                root.children = searched
+                result = root
+            break
+
+        result = root
+        if statistics is not None:
+            statistics.cutoff = cutoff
+            statistics.finish_depth(
+                statistics.nodes, time.perf_counter() - start
+            )
+        if not root.children or time.perf_counter() > deadline:
+            break
+        best_move = _best_child(root).move
 
-        for child in curr_node.children:
-            frontier.append(child)
+    return result
 
-    node.update_value()
 
-    return node
+def _best_child(node: SearchTree) -> SearchTree:
+    values = [child.value for child in node.children]
+    if node.player == GOAT_PLAYER:
+        return node.children[values.index(max(values))]
+
+    return node.children[values.index(min(values))]
+
+
+def _entry_cuts(entry: TableEntry, node: SearchTree) -> bool:
+    """Return True if the stored value can be used instead of searching
+    `node`, given its window."""
+    if entry.bound == EXACT:
+        return True
+    if entry.bound == LOWER_BOUND:
+        return entry.value >= node.beta
+
+    return entry.value <= node.alpha
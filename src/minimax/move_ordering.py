@@ -0,0 +1,108 @@
+from math import inf
+from typing import List
+
+from src.constants import GOAT_PLAYER
+from src.game.game import Game
+from src.game.moves import CAPTURE, MOVE_ENDS, MOVE_KINDS, NUMBER_OF_MOVES
+
+# Number of killer moves kept for each ply
+KILLERS_PER_PLY = 2
+
+# Order of the groups of moves; lower values are searched first
+_FIRST_MOVE = 0
+_CAPTURE = 1
+_KILLER = 2
+_QUIET = 3
+
+
+class MoveOrdering:
+    """Sort the moves of a node so that good moves are searched first.
+
+    The order is:
+
+    1. The best move of a previous search (transposition table or the
+       previous iteration).
+    2. Captures, and goat moves that block a capture by landing in the
+       square the tiger would jump to.
+    3. The killer moves of the ply: quiet moves that caused a cutoff in a
+       sibling node.
+    4. The remaining moves, by their history score: how often (weighted
+       by the depth) they caused a cutoff anywhere in the search.
+
+    Moves with the same priority keep the order they were generated in.
+    Moves are given by their codes (see `src.game.moves`).
+    """
+
+    def __init__(self):
+        self.killers: List[List[int]] = []
+        # History score of each move code
+        self.history: List[int] = [0] * NUMBER_OF_MOVES
+
+    def order(
+        self,
+        game: Game,
+        moves: bytes,
+        ply: int,
+        first_move: int | None = None,
+    ) -> List[int]:
+        """Return `moves`, the moves of `game`, in the order to search them."""
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+
+        blocking = 0
+        if game.game_state.player == GOAT_PLAYER:
+            blocking = game.board.capture_landing_squares()
+
+        history = self.history
+        scored = []
+        for move in moves:
+            if move == first_move:
+                group = _FIRST_MOVE
+            elif MOVE_KINDS[move] == CAPTURE or (
+                blocking and blocking >> MOVE_ENDS[move] & 1
+            ):
+                group = _CAPTURE
+            elif move in killers:
+                group = _KILLER
+            else:
+                group = _QUIET
+            scored.append((group, -history[move], move))
+
+        scored.sort(key=_sort_key)
+        return [move for _, _, move in scored]
+
+    def record_cutoff(self, move: int, ply: int, depth: int | float):
+        """Save `move`, which caused a cutoff `depth` plies from the leaves."""
+        if MOVE_KINDS[move] == CAPTURE:
+            # Captures are always searched early
+            return
+
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLERS_PER_PLY:]
+
+        # Searches without a cutoff have an infinite depth
+        depth = depth if depth != inf else 1
+        self.history[move] += depth * depth
+
+    def age(self):
+        """Prepare for a search from a new root, keeping what was learned
+        from the earlier ones.
+
+        The killers are forgotten, as their plies were counted from the old
+        root, and the history scores are halved, so recent cutoffs weigh
+        more.
+        """
+        self.killers = []
+        self.history = [score // 2 for score in self.history]
+
+    def clear(self):
+        """Forget the killers and the history."""
+        self.killers = []
+        self.history = [0] * NUMBER_OF_MOVES
+
+
+def _sort_key(scored_move: tuple) -> tuple:
+    return scored_move[0], scored_move[1]
@@ -0,0 +1,168 @@
+"""Opening book of the placement phase.
+
+The book is built offline by searching every position of the first plies
+of the game, and stored as a file of fixed size records sorted by the
+canonical hash of the position, shared by the positions symmetric to it.
+Moves are stored as they are played in the canonical position. Lookups
+are a binary search over the memory-mapped file.
+
+Build it from the repository root with
+
+    python -m src.minimax.opening_book opening_book.bin
+"""
+
+import argparse
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from src.game.game import Game
+from src.game.game_types import BoardSquare, Capture, Movement, Play
+from src.game.symmetry import canonical_hash, transform_move
+from src.game.topology import square_index
+from src.minimax.heuristics import heuristic
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import SearchResult, SearchStatistics, search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+RECORD = np.dtype(
+    [
+        ("key", "<u8"),
+        ("move", "<u2"),
+        ("depth", "u1"),
+        ("value", "<f4"),
+    ]
+)
+
+# Start square of a placement, which has none
+_NO_SQUARE = 31
+
+
+class OpeningBook:
+    """Best moves of the positions of a book file."""
+
+    def __init__(self, path: str):
+        self.records = np.memmap(path, dtype=RECORD, mode="r")
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def lookup(self, game: Game) -> SearchResult | None:
+        """Return the book move of the position of `game`, or None if the
+        position isn't in the book."""
+        key, symmetry = canonical_hash(game)
+        key = np.uint64(key)
+        keys = self.records["key"]
+        position = np.searchsorted(keys, key)
+        if position == len(keys) or keys[position] != key:
+            return None
+
+        record = self.records[position]
+        move = book_move(game, int(record["move"]), symmetry)
+        if move is None:
+            return None
+
+        return SearchResult(
+            move,
+            float(record["value"]),
+            [move],
+            SearchStatistics(cutoff=int(record["depth"])),
+        )
+
+
+def book_move_key(move: Play) -> int:
+    """Return the start and end squares of `move`, packed in an int, as
+    stored in the book.
+
+    These aren't the codes of `src.game.moves`.
+    """
+    if isinstance(move, BoardSquare):
+        return _NO_SQUARE << 5 | square_index(move)
+    if isinstance(move, Movement):
+        return square_index(move.start) << 5 | square_index(move.end)
+    if isinstance(move, Capture):
+        return square_index(move.starting_square) << 5 | square_index(
+            move.ending_square
+        )
+
+    raise ValueError(f"Invalid move: {move}")
+
+
+def book_move(game: Game, key: int, symmetry: int = 0) -> Play | None:
+    """Return the move of `game` whose image by `symmetry` has the book
+    `key`, or None if it isn't available."""
+    for move in game.available_moves():
+        if book_move_key(transform_move(move, symmetry)) == key:
+            return move
+
+    return None
+
+
+def build_book(
+    path: str,
+    plies: int = 3,
+    cutoff: int = 6,
+    heuristic: Callable[[Game], int] = heuristic,
+    verbose: bool = False,
+) -> int:
+    """Search every position of the first `plies` plies up to `cutoff`,
+    write the book to `path`, and return its number of positions."""
+    entries: Dict[int, tuple] = {}
+    table = TranspositionTable()
+    ordering = MoveOrdering()
+
+    def visit(game: Game, ply: int):
+        key, symmetry = canonical_hash(game)
+        if key in entries or game.is_game_over():
+            return
+
+        result = search_best_move(
+            game, heuristic, cutoff=cutoff, table=table, ordering=ordering
+        )
+        move = transform_move(result.move, symmetry)
+        entries[key] = (book_move_key(move), cutoff, result.value)
+        if verbose:
+            print(f"{len(entries):>6}: {result.move} ({result.value})")
+
+        if ply + 1 < plies:
+            for move in game.available_moves():
+                record = game.ply(move)
+                visit(game, ply + 1)
+                game.undo(record)
+
+    start = time.perf_counter()
+    visit(Game(), 0)
+    write_book(path, entries)
+    if verbose:
+        elapsed = time.perf_counter() - start
+        print(f"{len(entries)} positions in {elapsed:.1f}s")
+
+    return len(entries)
+
+
+def write_book(path: str, entries: Dict[int, tuple]):
+    """Write (move, depth, value) entries, by key, to a book file."""
+    records = np.zeros(len(entries), dtype=RECORD)
+    for i, key in enumerate(sorted(entries)):
+        move, depth, value = entries[key]
+        records[i] = (key, move, depth, value)
+
+    records.tofile(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("path")
+    parser.add_argument("--plies", type=int, default=3)
+    parser.add_argument("--cutoff", type=int, default=6)
+    args = parser.parse_args()
+
+    build_book(args.path, args.plies, args.cutoff, verbose=True)
+
+
+if __name__ == "__main__":
+    main()
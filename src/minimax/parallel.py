@@ -0,0 +1,227 @@
+"""Root-split parallel search.
+
+The moves of the root are searched in a pool of processes, one move per
+task. When a task finds a better root move its value is written to shared
+memory, and the other tasks read it to narrow their windows, both when
+they start and while they run.
+
+The root moves are ordered as `search_best_move` orders them, given the
+same table and move ordering, so moves of equal value are chosen the same
+way.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from math import inf
+from typing import Callable, List, Tuple
+
+from src.constants import GOAT_PLAYER
+from src.game.game import Game
+from src.game.moves import MOVES
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import (
+    DepthFirstSearch,
+    SearchResult,
+    SearchStatistics,
+)
+from src.minimax.transposition_table import TranspositionTable
+
+# State of each worker process, set by `_init_worker`
+_worker_bounds = None
+_worker_heuristic = None
+_worker_table: TranspositionTable | None = None
+_worker_ordering: MoveOrdering | None = None
+
+
+class ParallelSearch:
+    """A pool of processes that search the moves of the root in parallel.
+
+    The pool is kept between searches, so it should be reused for all the
+    moves of a game, and closed (or used as a context manager) at the end.
+    Each process keeps its own transposition table and move ordering.
+    """
+
+    def __init__(
+        self,
+        heuristic: Callable[[Game], int],
+        workers: int | None = None,
+        table_memory: int = 16 * 2**20,
+    ):
+        self.heuristic = heuristic
+        self.workers = workers or multiprocessing.cpu_count()
+        # (alpha, beta) of the root, shared by all the processes
+        self._bounds = multiprocessing.Array("d", [-inf, inf])
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._bounds, heuristic, table_memory),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(cancel_futures=True)
+
+    def search(
+        self,
+        game: Game,
+        cutoff: int,
+        table: TranspositionTable | None = None,
+        ordering: MoveOrdering | None = None,
+    ) -> SearchResult:
+        """Return the best move of `game`, as `search_best_move` would with
+        the same `table` and `ordering`.
+
+        They are only used to order the root moves: the processes search
+        with their own.
+        """
+        start = time.perf_counter()
+        statistics = SearchStatistics(cutoff=cutoff)
+
+        winner = game.get_winner()
+        moves = game.available_move_codes()
+        maximizing = game.game_state.player == GOAT_PLAYER
+        if winner is not None or not moves:
+            value = winner * inf if winner is not None else None
+            if value is None:
+                value = -inf if maximizing else inf
+            return SearchResult(None, value, [], statistics)
+
+        root = DepthFirstSearch(game, self.heuristic, table, ordering)
+        moves = root.root_moves()
+        statistics.add(root.statistics)
+        with self._bounds.get_lock():
+            self._bounds[0], self._bounds[1] = -inf, inf
+
+        futures = {
+            self._executor.submit(_search_move, game, move, cutoff): index
+            for index, move in enumerate(moves)
+        }
+        results: List[Tuple[int | float, bool, List[int]] | None] = [
+            None
+        ] * len(moves)
+        for future in as_completed(futures):
+            value, window, pv, move_statistics = future.result()
+            index = futures[future]
+            exact = _is_exact(value, window)
+            results[index] = (value, exact, pv)
+            statistics.add(move_statistics)
+
+            if exact:
+                self._raise_bound(value, maximizing)
+
+        best = self._merge(
+            game, moves, results, cutoff, maximizing, statistics
+        )
+        statistics.nodes += 1
+        statistics.time = time.perf_counter() - start
+        statistics.finish_depth(statistics.nodes, statistics.time)
+
+        value, _, pv = results[best]
+        return SearchResult(
+            MOVES[moves[best]], value, [MOVES[move] for move in pv], statistics
+        )
+
+    def _raise_bound(self, value: int | float, maximizing: bool):
+        """Share the value of a root move with the running tasks."""
+        with self._bounds.get_lock():
+            if maximizing:
+                self._bounds[0] = max(self._bounds[0], value)
+            else:
+                self._bounds[1] = min(self._bounds[1], value)
+
+    def _merge(
+        self,
+        game: Game,
+        moves: List[int],
+        results: list,
+        cutoff: int,
+        maximizing: bool,
+        statistics: SearchStatistics,
+    ) -> int:
+        """Return the index of the best move, as a sequential search would
+        choose it: the first one, in the root order, with the best value.
+
+        A move whose search failed low against a bound equal to the best
+        value may be tied with the best move, so it's searched again with
+        a full window to break the tie the same way.
+        """
+        exact = [value for value, is_exact, _ in results if is_exact]
+        best_value = max(exact) if maximizing else min(exact)
+        best = next(
+            index
+            for index, (value, is_exact, _) in enumerate(results)
+            if is_exact and value == best_value
+        )
+
+        for index in range(best):
+            value, is_exact, _ = results[index]
+            if is_exact or value != best_value:
+                continue
+
+            search = DepthFirstSearch(game, self.heuristic, None, None)
+            value = search.search_move(moves[index], cutoff, -inf, inf)
+            statistics.add(search.statistics)
+            results[index] = (value, True, search.pv[0])
+            if value == best_value:
+                return index
+
+        return best
+
+
+def parallel_search_best_move(
+    game: Game,
+    heuristic: Callable[[Game], int],
+    cutoff: int,
+    workers: int | None = None,
+) -> SearchResult:
+    """Search `game` with a new pool of `workers` processes.
+
+    Creating the pool takes time, so to search many positions, create a
+    `ParallelSearch` once and reuse it.
+    """
+    with ParallelSearch(heuristic, workers) as search:
+        return search.search(game, cutoff)
+
+
+def _is_exact(value: int | float, window: Tuple[float, float]) -> bool:
+    """Return True if `value` wasn't cut by the window it was searched with."""
+    alpha, beta = window
+    return (value > alpha or alpha == -inf) and (value < beta or beta == inf)
+
+
+def _init_worker(bounds, heuristic, table_memory: int):
+    global _worker_bounds, _worker_heuristic, _worker_table, _worker_ordering
+    _worker_bounds = bounds
+    _worker_heuristic = heuristic
+    _worker_table = TranspositionTable(table_memory)
+    _worker_ordering = MoveOrdering()
+
+
+def _shared_window() -> Tuple[float, float]:
+    # Reading two doubles without the lock can only see an older bound,
+    # which is still a valid (wider) window
+    return _worker_bounds[0], _worker_bounds[1]
+
+
+def _search_move(game: Game, move: int, cutoff: int) -> tuple:
+    """Search the root move with code `move` of `game` in a worker
+    process."""
+    search = DepthFirstSearch(
+        game, _worker_heuristic, _worker_table, _worker_ordering
+    )
+    search.shared_window = _shared_window
+    alpha, beta = _shared_window()
+    value = search.search_move(move, cutoff, alpha, beta)
+
+    return (
+        value,
+        search.child_window,
+        search.pv[0],
+        search.statistics,
+    )
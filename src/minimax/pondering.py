@@ -0,0 +1,167 @@
+"""Searching during the opponent's turn (pondering).
+
+While the opponent thinks, a background thread searches the replies to
+its moves, starting with the one the engine expects. The replies and the
+transposition table entries found on the way are kept, so when the
+opponent moves the engine either plays a reply already searched or
+searches with a warm table and move ordering.
+
+The background search runs in a thread, not a process, so that it shares
+the table and the ordering with the engine's own searches. It's meant to
+run while the main thread waits for input, which doesn't hold the GIL.
+"""
+
+import copy
+import threading
+from typing import Callable, Dict
+
+from src.game.game import Game
+from src.game.game_types import Play
+from src.game.moves import MOVE_CODES
+from src.minimax.minimax import SearchTimeout
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import (
+    DepthFirstSearch,
+    SearchResult,
+    search_best_move,
+)
+from src.minimax.transposition_table import TranspositionTable
+
+
+class Ponderer:
+    """The searches of an engine, continued in the opponent's turn.
+
+    Call `start` when the opponent is to move, and `search` to get the
+    engine's move once it has moved. With a `cutoff`, each reply is
+    searched up to it and a reply already searched is played as is. With
+    a `time_budget` instead, the replies are searched one ply deeper at a
+    time until the opponent moves, and the engine's search then reuses
+    the table and the ordering they filled.
+
+    With `symmetry`, all the searches share the table entries of symmetric
+    positions, as in `search_best_move`. It must be the same for every
+    search that uses the table.
+    """
+
+    def __init__(
+        self,
+        heuristic: Callable[[Game], int],
+        cutoff: int | None = None,
+        time_budget: float | None = None,
+        table: TranspositionTable | None = None,
+        ordering: MoveOrdering | None = None,
+        max_cutoff: int = 64,
+        symmetry: bool = False,
+    ):
+        if cutoff is None and time_budget is None:
+            raise ValueError("Either a cutoff or a time budget must be given")
+
+        self.heuristic = heuristic
+        self.cutoff = cutoff
+        self.time_budget = time_budget
+        self.table = table if table is not None else TranspositionTable()
+        self.ordering = ordering if ordering is not None else MoveOrdering()
+        self.max_cutoff = max_cutoff
+        self.symmetry = symmetry
+
+        # Replies found while pondering, by the hash of the position they
+        # were searched from
+        self._replies: Dict[int, SearchResult] = {}
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        # Search being run by the thread, to be interrupted by `stop`
+        self._search: DepthFirstSearch | None = None
+
+        # Moves played from a reply found while pondering, and searched
+        self.hits = 0
+        self.misses = 0
+
+    def start(self, game: Game, expected_move: Play | None = None):
+        """Start pondering in `game`, where the opponent is to move.
+
+        The reply to `expected_move` is searched first. The game isn't
+        changed, and can be played while pondering.
+        """
+        self.stop()
+        self._replies = {}
+        self._search = None
+        # The pondering and the next search of the engine count as one
+        # search for the table and the ordering
+        self.table.new_search()
+        self.ordering.age()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._ponder,
+            args=(copy.deepcopy(game), MOVE_CODES.get(expected_move)),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop pondering, keeping the replies already searched."""
+        self._stop.set()
+        search = self._search
+        if search is not None:
+            # Makes the search time out in its next node
+            search.deadline = 0.0
+        self.wait()
+
+    def wait(self):
+        """Wait for the pondering to end. With a time budget it only ends
+        when stopped."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def search(self, game: Game) -> SearchResult:
+        """Return the engine's move in `game`, after the opponent's move."""
+        self.stop()
+
+        reply = self._replies.get(game.zobrist_hash())
+        if reply is not None and self.time_budget is None:
+            self.hits += 1
+            return reply
+
+        self.misses += 1
+        return search_best_move(
+            game,
+            self.heuristic,
+            cutoff=self.cutoff,
+            time_budget=self.time_budget,
+            table=self.table,
+            ordering=self.ordering,
+            max_cutoff=self.max_cutoff,
+            symmetry=self.symmetry,
+        )
+
+    def _ponder(self, game: Game, expected_move: int | None):
+        moves = game.available_move_codes()
+        if game.is_game_over() or not moves:
+            return
+        moves = self.ordering.order(game, moves, 0, expected_move)
+
+        if self.cutoff is not None:
+            cutoffs = [self.cutoff]
+        else:
+            cutoffs = range(1, self.max_cutoff + 1)
+        for cutoff in cutoffs:
+            for move in moves:
+                record = game.ply_code(move)
+                try:
+                    self._search_reply(game, cutoff)
+                except SearchTimeout:
+                    return
+                finally:
+                    game.undo(record)
+
+    def _search_reply(self, game: Game, cutoff: int):
+        search = DepthFirstSearch(
+            game, self.heuristic, self.table, self.ordering
+        )
+        search.symmetry = self.symmetry
+        self._search = search
+        # Checked after `_search` is set, so `stop` can't miss this search
+        if self._stop.is_set():
+            raise SearchTimeout()
+
+        self._replies[game.zobrist_hash()] = search.run(cutoff)
@@ -0,0 +1,291 @@
+"""Depth-first proof-number search (df-pn), to solve positions exactly.
+
+A search tries to prove that a player, the attacker, can force a win. Each
+position has a proof number (how many positions still have to be proven to
+prove it) and a disproof number (the same, to disprove it). The search
+always expands the most proving position, depth-first, within thresholds on
+both numbers, and keeps the numbers of the searched positions in a fixed
+size table instead of a tree.
+
+The game can cycle in the movement phase, so a position repeated in the
+current line counts as not won by the attacker. This keeps the proofs
+sound, but, as the table is shared by all the lines, a disproof may in rare
+cases depend on the line that reached the position first. Cycles through
+the table can also make the numbers grow slowly without ever reaching a
+result, so searches should be given a node budget.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Final, List, Tuple
+
+from src.game.game import Game
+from src.game.game_types import Play
+from src.game.moves import MOVES
+
+INFINITE: Final = 2**60
+
+# Rough size of an entry in memory, used to turn a memory cap into a
+# number of slots
+ENTRY_SIZE: Final = 120
+
+
+class _OutOfNodes(Exception):
+    pass
+
+
+@dataclass
+class ProofResult:
+    """The result of solving a position."""
+
+    # Whether the position was solved within the budget
+    solved: bool
+    # The player who can force a win, or None if neither can (the game
+    # goes on forever with the best play) or it wasn't solved
+    winner: int | None = None
+    # A winning move, when the winner is the player to move
+    move: Play | None = None
+    nodes: int = 0
+    time: float = 0.0
+
+
+class ProofTable:
+    """Fixed size table with the proof and disproof numbers of positions.
+
+    When two positions fall in the same slot, the one whose numbers took
+    more work (searched positions) to find is kept.
+    """
+
+    def __init__(self, max_memory: int = 64 * 2**20):
+        size = 1
+        while size * 2 * ENTRY_SIZE <= max_memory:
+            size *= 2
+
+        self._mask = size - 1
+        self._slots: List[Tuple[int, int, int, int] | None] = [None] * size
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def probe(self, key: int) -> Tuple[int, int]:
+        """Return the proof and disproof numbers of the position with hash
+        `key`, or (1, 1) if it isn't stored."""
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry[0] == key:
+            return entry[1], entry[2]
+
+        return 1, 1
+
+    def store(self, key: int, proof: int, disproof: int, work: int):
+        index = key & self._mask
+        entry = self._slots[index]
+        if entry is not None and entry[0] != key and entry[3] > work:
+            return
+
+        self._slots[index] = (key, proof, disproof, work)
+
+
+class ProofNumberSearch:
+    """Df-pn over a single `Game`, making and undoing the moves.
+
+    The search gives up after `max_nodes` positions, if given. `report`, if
+    given, is called every `report_every` positions with the number of
+    searched positions and the last proof and disproof numbers of the root.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        max_memory: int = 64 * 2**20,
+        max_nodes: int | None = None,
+        report: Callable[[int, int, int], None] | None = None,
+        report_every: int = 100_000,
+    ):
+        self.game = game
+        self.max_memory = max_memory
+        self.table: ProofTable | None = None
+        self.max_nodes = max_nodes
+        self.report = report
+        self.report_every = report_every
+        self.nodes = 0
+        self.attacker = 0
+        # Last proof and disproof numbers of the root
+        self.numbers = (1, 1)
+        self._root_key = 0
+        # Positions in the line being searched
+        self._path = set()
+
+    def prove(self, attacker: int) -> bool | None:
+        """Return True if `attacker` can force a win, False if it can't,
+        and None if the search ran out of nodes."""
+        if attacker != self.attacker:
+            # The numbers are only valid for the attacker they were found for
+            self.table = ProofTable(self.max_memory)
+        self.attacker = attacker
+        self._path.clear()
+        self.numbers = (1, 1)
+        self._root_key = self.game.zobrist_hash()
+
+        terminal = self._terminal()
+        if terminal is not None:
+            return terminal[0] == 0
+
+        try:
+            proof, disproof = self._search(self._root_key, INFINITE, INFINITE)
+        except _OutOfNodes:
+            return None
+
+        return proof == 0
+
+    def winning_move(self) -> Play | None:
+        """Return a move of the player to move that was proven to win."""
+        if self.game.game_state.player != self.attacker:
+            return None
+
+        for move in self.game.available_move_codes():
+            record = self.game.ply_code(move)
+            key = self.game.zobrist_hash()
+            terminal = self._terminal()
+            self.game.undo(record)
+            proof = terminal[0] if terminal else self.table.probe(key)[0]
+            if proof == 0:
+                return MOVES[move]
+
+        return None
+
+    def _terminal(self) -> Tuple[int, int] | None:
+        """Return the numbers of the position if the game ended in it."""
+        winner = self.game.get_winner()
+        if winner is None:
+            return None
+
+        return (0, INFINITE) if winner == self.attacker else (INFINITE, 0)
+
+    def _search(self, key: int, proof_threshold: int, disproof_threshold: int):
+        """Search the position of `self.game`, whose hash is `key`, until
+        its proof or disproof number reaches its threshold, and return both
+        numbers."""
+        game = self.game
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _OutOfNodes()
+        if self.report is not None and self.nodes % self.report_every == 0:
+            self.report(self.nodes, *self.numbers)
+
+        start_nodes = self.nodes
+        attacking = game.game_state.player == self.attacker
+        moves = game.available_move_codes()
+        if not moves:
+            # The player to move can't move and loses, as in the search
+            numbers = (INFINITE, 0) if attacking else (0, INFINITE)
+            self.table.store(key, *numbers, 1)
+            return numbers
+
+        # The numbers of the children are kept here as they are searched, so
+        # they aren't lost if the table drops them
+        children = []
+        for move in moves:
+            record = game.ply_code(move)
+            child_key = game.zobrist_hash()
+            if child_key in self._path or child_key == key:
+                numbers = (INFINITE, 0)
+            else:
+                numbers = self._terminal() or self.table.probe(child_key)
+            game.undo(record)
+            children.append([move, child_key, numbers])
+
+        self._path.add(key)
+        while True:
+            proof, disproof, best, second, best_numbers = self._combine(
+                children, attacking
+            )
+            if key == self._root_key:
+                self.numbers = (proof, disproof)
+            if proof >= proof_threshold or disproof >= disproof_threshold:
+                break
+
+            best_proof, best_disproof = best_numbers
+            if attacking:
+                child_thresholds = (
+                    min(proof_threshold, second + 1),
+                    _add(disproof_threshold, best_disproof - disproof),
+                )
+            else:
+                child_thresholds = (
+                    _add(proof_threshold, best_proof - proof),
+                    min(disproof_threshold, second + 1),
+                )
+
+            child = children[best]
+            record = game.ply_code(child[0])
+            try:
+                child[2] = self._search(child[1], *child_thresholds)
+            finally:
+                game.undo(record)
+        self._path.discard(key)
+
+        self.table.store(key, proof, disproof, self.nodes - start_nodes + 1)
+        return proof, disproof
+
+    def _combine(self, children: list, attacking: bool) -> tuple:
+        """Return the numbers of a position from the ones of its children,
+        the index of the child to search next, the number of the second
+        best child, and the numbers of the best one."""
+        total = 0
+        least = second = INFINITE
+        best = 0
+        best_numbers = (INFINITE, INFINITE)
+        for index, (_, _, numbers) in enumerate(children):
+            # The attacker needs a single proven child, and the defender a
+            # single disproven one
+            target, other = numbers if attacking else numbers[::-1]
+            total = _add(total, other)
+            if target < least:
+                second = least
+                least = target
+                best = index
+                best_numbers = numbers
+            elif target < second:
+                second = target
+
+        if attacking:
+            return least, total, best, second, best_numbers
+
+        return total, least, best, second, best_numbers
+
+
+def _add(a: int, b: int) -> int:
+    return min(a + b, INFINITE)
+
+
+def solve(
+    game: Game,
+    max_memory: int = 64 * 2**20,
+    max_nodes: int | None = None,
+    report: Callable[[int, int, int], None] | None = None,
+) -> ProofResult:
+    """Find out which player, if any, can force a win from `game`.
+
+    The player to move is tried first, then the other one. `max_nodes`
+    limits each of the two searches.
+    """
+    start = time.perf_counter()
+    search = ProofNumberSearch(game, max_memory, max_nodes, report)
+    player = game.game_state.player
+
+    result = ProofResult(solved=False)
+    for attacker in (player, -player):
+        proven = search.prove(attacker)
+        if proven is None:
+            break
+        if proven:
+            result = ProofResult(
+                solved=True, winner=attacker, move=search.winning_move()
+            )
+            break
+    else:
+        result = ProofResult(solved=True)
+
+    result.nodes = search.nodes
+    result.time = time.perf_counter() - start
+    return result
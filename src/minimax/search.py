@@ -0,0 +1,699 @@
+import time
+from dataclasses import dataclass, field
+from math import inf
+from typing import Callable, List, Tuple
+
+from src.constants import CAPTURED_GOATS_TO_WIN, GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.game.game_types import Play
+from src.game.moves import CAPTURE, MOVE_KINDS, MOVES
+from src.game.symmetry import (
+    IDENTITY,
+    INVERSES,
+    SYMMETRIC_CODES,
+    canonical_hash,
+)
+from src.minimax.batch_heuristics import boards_from_masks
+from src.minimax.minimax import SearchTimeout
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.statistics import SearchStatistics
+from src.minimax.tablebase import Tablebase
+from src.minimax.transposition_table import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+
+# Late move reductions: moves from this index of a node's ordered moves
+# are searched one ply shallower, in nodes with at least this many plies
+# still to be searched
+LATE_MOVE_INDEX = 3
+REDUCTION_MIN_DEPTH = 3
+
+
+@dataclass
+class SearchResult:
+    """The move chosen by a search, and how it was chosen.
+
+    The `move` is None when the game is over or the player to move has no
+    moves. The `value` is for the goats, on the scale of the search: the
+    heuristic's, with infinities for won positions, for the alpha-beta
+    searches, and the expected score in [-1, 1] for
+    `MonteCarloTreeSearch`.
+    """
+
+    move: Play | None
+    # On the scale of the search that chose the move (see above)
+    value: int | float
+    principal_variation: List[Play] = field(default_factory=list)
+    statistics: SearchStatistics = field(default_factory=SearchStatistics)
+
+
+def search_best_move(
+    game: Game,
+    heuristic: Callable[[Game], int],
+    cutoff: int | None = None,
+    time_budget: float | None = None,
+    table: TranspositionTable | None = None,
+    ordering: MoveOrdering | None = None,
+    max_cutoff: int = 64,
+    batch_heuristic: Callable | None = None,
+    tablebase: Tablebase | None = None,
+    symmetry: bool = False,
+    pvs: bool = True,
+    aspiration_window: int | float | None = None,
+    quiescence: bool = False,
+    reductions: bool = False,
+) -> SearchResult:
+    """Return the best move of `game`, searching depth-first.
+
+    Unlike `alpha_beta_search`, no tree is kept: the memory used grows
+    with the depth of the search, not with the number of nodes. The
+    `cutoff` has the same meaning as in `alpha_beta_search`, and with
+    equal move orders both choose the same move.
+
+    If a `time_budget` (in seconds) is given instead of a cutoff, the
+    search deepens one ply at a time until the time runs out, as in
+    `iterative_deepening_search`.
+
+    With a `batch_heuristic` (such as `batch_heuristics.heuristic_batch`,
+    which must give the same values as `heuristic`), the children of the
+    nodes just above the leaves are evaluated together in a single call.
+
+    Positions found in the `tablebase` get their exact value (0 for a
+    draw) instead of being searched.
+
+    With `symmetry`, symmetric positions share their transposition table
+    entries, and root moves leading to positions symmetric to the ones of
+    earlier moves are skipped, as they have the same value.
+
+    With `pvs` (principal variation search), the moves after the first one
+    of each node are first searched with a null window. With an
+    `aspiration_window`, each iteration of iterative deepening searches the
+    root with a window of that half width around the previous value, and
+    searches it again with a full window if the value falls outside. Both
+    only change the nodes searched, not the move chosen.
+
+    The next two options change the move chosen. With `quiescence`,
+    positions past the cutoff where the tigers have a capture, which they
+    must play, aren't evaluated until the captures are played. With
+    `reductions`, quiet moves ordered late in a node are searched one ply
+    shallower, and searched again at the full depth only if they turn out
+    better than the best move so far.
+    """
+    if cutoff is None and time_budget is None:
+        raise ValueError("Either a cutoff or a time budget must be given")
+
+    search = DepthFirstSearch(
+        game, heuristic, table, ordering, batch_heuristic, tablebase
+    )
+    search.symmetry = symmetry
+    search.pvs = pvs
+    search.aspiration_window = aspiration_window
+    search.quiescence = quiescence
+    search.reductions = reductions
+    if time_budget is None:
+        return search.run(cutoff)
+
+    return search.run_iterative(time_budget, max_cutoff)
+
+
+class DepthFirstSearch:
+    """Alpha-beta search over a single `Game`, making and undoing moves.
+
+    Moves are handled by their codes (see `src.game.moves`), and only
+    turned into `Play` objects in the result. `search_best_move` is the
+    usual entry point; the parallel and pondering searches run their own
+    instances, to share windows or interrupt them.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        heuristic: Callable[[Game], int],
+        table: TranspositionTable | None,
+        ordering: MoveOrdering | None,
+        batch_heuristic: Callable | None = None,
+        tablebase: Tablebase | None = None,
+    ):
+        self.game = game
+        self.heuristic = heuristic
+        self.table = table
+        self.ordering = ordering
+        self.batch_heuristic = batch_heuristic
+        self.tablebase = tablebase
+        self.symmetry = False
+        # Principal variation search, and the half width of the aspiration
+        # windows of iterative deepening (None to search with full windows)
+        self.pvs = True
+        self.aspiration_window: int | float | None = None
+        # Selective search (see `search_best_move`)
+        self.quiescence = False
+        self.reductions = False
+        self.deadline: float | None = None
+        self.statistics = SearchStatistics()
+        # Best line found from each ply
+        self.pv: List[List[int]] = []
+
+        # Progress of the root, kept in case the time runs out
+        self.root_move: int | None = None
+        self.root_value: int | float = 0
+        self.root_searched = 0
+
+        # Called before each move of the root's children to narrow their
+        # window with bounds found elsewhere (by other processes)
+        self.shared_window: Callable[[], Tuple[float, float]] | None = None
+        self.child_window: Tuple[float, float] = (-inf, inf)
+
+    def run(self, cutoff: int) -> SearchResult:
+        start = time.perf_counter()
+        self._search_root(cutoff, None)
+        self.statistics.cutoff = cutoff
+        self.statistics.time = time.perf_counter() - start
+        self.statistics.finish_depth(
+            self.statistics.nodes, self.statistics.time
+        )
+
+        return self._result()
+
+    def run_iterative(
+        self, time_budget: float, max_cutoff: int
+    ) -> SearchResult:
+        start = time.perf_counter()
+        deadline = start + time_budget
+
+        result = None
+        for cutoff in range(1, max_cutoff + 1):
+            # The first search always finishes, so there's always a move
+            self.deadline = deadline if result is not None else None
+            previous_move = self.root_move if result is not None else None
+            try:
+                self._search_iteration(cutoff, previous_move, result)
+            except SearchTimeout:
+                # The previous best move is searched first, so once it's
+                # searched the partial result is at least as good
+                if self.root_searched:
+                    result = self._result()
+                break
+
+            self.statistics.cutoff = cutoff
+            self.statistics.finish_depth(
+                self.statistics.nodes, time.perf_counter() - start
+            )
+            result = self._result()
+            if result.move is None or time.perf_counter() > deadline:
+                break
+
+        self.statistics.time = time.perf_counter() - start
+        result.statistics = self.statistics
+        return result
+
+    def _search_iteration(
+        self,
+        cutoff: int,
+        previous_move: int | None,
+        previous: SearchResult | None,
+    ):
+        """Search the root, with an aspiration window around the value of
+        the `previous` iteration if there's one."""
+        if (
+            self.aspiration_window is None
+            or previous is None
+            or abs(previous.value) == inf
+        ):
+            self._search_root(cutoff, previous_move)
+            return
+
+        alpha = previous.value - self.aspiration_window
+        beta = previous.value + self.aspiration_window
+        self._search_root(cutoff, previous_move, alpha, beta)
+        if not alpha < self.root_value < beta:
+            self.statistics.aspiration_failures += 1
+            self._search_root(cutoff, previous_move)
+
+    def _result(self) -> SearchResult:
+        return SearchResult(
+            MOVES[self.root_move] if self.root_move is not None else None,
+            self.root_value,
+            [MOVES[move] for move in self.pv[0]] if self.pv else [],
+            self.statistics,
+        )
+
+    def search_move(
+        self, move: int, cutoff: int, alpha: float, beta: float
+    ) -> int | float:
+        """Return the value of the root child reached by the move with code
+        `move`.
+
+        The child is searched with the window (`alpha`, `beta`), narrowed
+        by `shared_window` while it runs. The window it ended with is kept
+        in `child_window`, and its principal variation in `pv[0]`.
+        """
+        self.pv = [[] for _ in range(cutoff + 2)]
+        self.child_window = (alpha, beta)
+
+        record = self.game.ply_code(move)
+        try:
+            value = self._search(1, cutoff, alpha, beta)
+        finally:
+            self.game.undo(record)
+
+        self.pv[0] = [move] + self.pv[1]
+        return value
+
+    def _search_root(
+        self,
+        cutoff: int,
+        first_move: int | None,
+        alpha: int | float = -inf,
+        beta: int | float = inf,
+    ):
+        """Search the root with the window (`alpha`, `beta`).
+
+        When the value is outside the window, it's only a bound, and the
+        root has to be searched again with a wider window.
+        """
+        game = self.game
+        self.pv = [[] for _ in range(cutoff + 2)]
+        self.root_move = None
+        self.root_searched = 0
+        self.statistics.nodes += 1
+
+        winner = game.get_winner()
+        if winner is not None:
+            self.root_value = winner * inf
+            return
+
+        moves = game.available_move_codes()
+        maximizing = game.game_state.player == GOAT_PLAYER
+        self.root_value = -inf if maximizing else inf
+        if not moves:
+            return
+
+        key, symmetry, moves = self._root_moves(moves, first_move)
+
+        original_alpha, original_beta = alpha, beta
+        for move in moves:
+            record = game.ply_code(move)
+            try:
+                value = self._search_child(
+                    1, cutoff, alpha, beta, maximizing, self.root_searched
+                )
+            finally:
+                game.undo(record)
+
+            if self.root_move is None or (
+                value > self.root_value
+                if maximizing
+                else value < self.root_value
+            ):
+                self.root_move = move
+                self.root_value = value
+                self.pv[0] = [move] + self.pv[1]
+                if maximizing:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+            self.root_searched += 1
+            if alpha >= beta:
+                break
+
+        self._store(
+            key,
+            cutoff + 1,
+            original_alpha,
+            original_beta,
+            self.root_value,
+            _to_table(self.root_move, symmetry),
+        )
+
+    def root_moves(self) -> List[int]:
+        """Return the codes of the moves of the root, in the order the
+        search would search them."""
+        return self._root_moves(self.game.available_move_codes(), None)[2]
+
+    def _root_moves(
+        self, moves: bytes, first_move: int | None
+    ) -> Tuple[int | None, int, List[int]]:
+        """Return the table key of the root, its symmetry, and the root
+        `moves` in the order to search them, after `first_move` or the
+        table move."""
+        key = None
+        symmetry = IDENTITY
+        if self.table is not None:
+            key, symmetry = self._table_key()
+            entry = self.table.probe(key)
+            self.statistics.table_probes += 1
+            self.statistics.table_hits += entry is not None
+            if entry is not None and first_move is None:
+                first_move = _from_table(entry.move, symmetry)
+        moves = self._order(moves, 0, first_move)
+        if self.symmetry:
+            moves = self._unique_moves(moves)
+
+        return key, symmetry, moves
+
+    def _search(
+        self, ply: int, cutoff: int, alpha: int | float, beta: int | float
+    ) -> int | float:
+        """Return the value of the position in `self.game`, at `ply`."""
+        game = self.game
+        statistics = self.statistics
+        statistics.nodes += 1
+        if ply > statistics.max_depth:
+            statistics.max_depth = ply
+        self.pv[ply] = []
+
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        if game.game_state.captured_goats >= CAPTURED_GOATS_TO_WIN:
+            return game.get_winner() * inf
+
+        if self.tablebase is not None:
+            value = self.tablebase.value(game)
+            if value is not None:
+                statistics.leaves += 1
+                return value
+
+        if ply > cutoff:
+            if self.quiescence:
+                return self._quiescence(ply, alpha, beta)
+
+            statistics.leaves += 1
+            winner = game.get_winner()
+            if winner is not None:
+                return winner * inf
+
+            return self.heuristic(game)
+
+        # Number of plies still to be searched under this node
+        remaining = cutoff - ply + 1
+
+        key = None
+        symmetry = IDENTITY
+        table_move = None
+        if self.table is not None:
+            key, symmetry = self._table_key()
+            entry = self.table.probe(key)
+            statistics.table_probes += 1
+            if entry is not None:
+                statistics.table_hits += 1
+                if entry.depth >= remaining and (
+                    entry.bound == EXACT
+                    or (entry.bound == LOWER_BOUND and entry.value >= beta)
+                    or (entry.bound == UPPER_BOUND and entry.value <= alpha)
+                ):
+                    return entry.value
+                table_move = _from_table(entry.move, symmetry)
+
+        maximizing = game.game_state.player == GOAT_PLAYER
+        moves = game.available_move_codes()
+        if not moves:
+            # The player to move can't move: trapped tigers or goats lose
+            return -inf if maximizing else inf
+        moves = self._order(moves, ply, table_move)
+
+        if ply == cutoff and self.batch_heuristic is not None:
+            statistics.max_depth = max(statistics.max_depth, ply + 1)
+            best_value, best_move = self._evaluate_children(
+                moves, maximizing, ply
+            )
+            self.pv[ply] = [best_move]
+            self._store(
+                key,
+                remaining,
+                alpha,
+                beta,
+                best_value,
+                _to_table(best_move, symmetry),
+            )
+            return best_value
+
+        original_alpha, original_beta = alpha, beta
+        best_value = -inf if maximizing else inf
+        best_move = None
+        for index, move in enumerate(moves):
+            if ply == 1 and self.shared_window is not None:
+                shared_alpha, shared_beta = self.shared_window()
+                alpha, beta = max(alpha, shared_alpha), min(beta, shared_beta)
+                # The result is now relative to the narrower window
+                original_alpha = max(original_alpha, shared_alpha)
+                original_beta = min(original_beta, shared_beta)
+                self.child_window = (original_alpha, original_beta)
+                if alpha >= beta:
+                    break
+
+            reduce = (
+                self.reductions
+                and index >= LATE_MOVE_INDEX
+                and remaining >= REDUCTION_MIN_DEPTH
+                and MOVE_KINDS[move] != CAPTURE
+                and move != table_move
+                and not game.board.tiger_captures
+            )
+            record = game.ply_code(move)
+            try:
+                value = self._search_child(
+                    ply + 1, cutoff, alpha, beta, maximizing, index, reduce
+                )
+            finally:
+                game.undo(record)
+
+            if maximizing:
+                if value > best_value or best_move is None:
+                    best_value = value
+                    best_move = move
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+                    alpha = max(alpha, value)
+            else:
+                if value < best_value or best_move is None:
+                    best_value = value
+                    best_move = move
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+                    beta = min(beta, value)
+
+            if alpha >= beta:
+                statistics.record_cutoff(index)
+                if self.ordering is not None:
+                    self.ordering.record_cutoff(move, ply, remaining)
+                break
+
+        self._store(
+            key,
+            remaining,
+            original_alpha,
+            original_beta,
+            best_value,
+            _to_table(best_move, symmetry),
+        )
+        return best_value
+
+    def _search_child(
+        self,
+        ply: int,
+        cutoff: int,
+        alpha: int | float,
+        beta: int | float,
+        maximizing: bool,
+        index: int,
+        reduce: bool = False,
+    ) -> int | float:
+        """Return the value of the child in `self.game`, at `ply`, reached
+        by the move at `index` of its parent's moves.
+
+        With `pvs`, the moves after the first one are searched with a null
+        window first, which only tells if the move is better than the best
+        one so far. If it is, the move is searched again with the full
+        window. Leaves are always searched with the full window, as their
+        value doesn't depend on it.
+
+        If `reduce`, the child is first searched one ply shallower with a
+        null window, and only searched at the full depth if it's better
+        than the best move so far.
+        """
+        bound = alpha if maximizing else beta
+        if reduce and abs(bound) != inf:
+            self.statistics.reductions += 1
+            if maximizing:
+                value = self._search(ply, cutoff - 1, alpha, alpha + 1)
+                if value <= alpha:
+                    return value
+            else:
+                value = self._search(ply, cutoff - 1, beta - 1, beta)
+                if value >= beta:
+                    return value
+            self.statistics.reduction_failures += 1
+
+        if not self.pvs or index == 0 or ply > cutoff or abs(bound) == inf:
+            # A null window next to an infinite bound would be empty
+            return self._search(ply, cutoff, alpha, beta)
+
+        if maximizing:
+            value = self._search(ply, cutoff, alpha, alpha + 1)
+        else:
+            value = self._search(ply, cutoff, beta - 1, beta)
+        if maximizing and alpha < value < beta:
+            # The scout's value is a lower bound
+            value = max(value, self._search(ply, cutoff, value, beta))
+        elif not maximizing and alpha < value < beta:
+            value = min(value, self._search(ply, cutoff, alpha, value))
+
+        return value
+
+    def _quiescence(
+        self, ply: int, alpha: int | float, beta: int | float
+    ) -> int | float:
+        """Return the value of the position in `self.game`, past the
+        cutoff, after the captures the tigers must play.
+
+        The captures are forced, so all the tigers' moves are searched. The
+        goats, which have nothing to resolve, are evaluated as they are.
+        """
+        game = self.game
+        statistics = self.statistics
+        if ply > statistics.max_depth:
+            statistics.max_depth = ply
+
+        winner = game.get_winner()
+        if winner is not None:
+            statistics.leaves += 1
+            return winner * inf
+
+        if (
+            game.game_state.player != TIGER_PLAYER
+            or not game.board.evaluation_terms()[1]
+        ):
+            statistics.leaves += 1
+            return self.heuristic(game)
+
+        best_value = inf
+        for move in game.available_move_codes():
+            statistics.nodes += 1
+            statistics.quiescence_nodes += 1
+            record = game.ply_code(move)
+            try:
+                value = self._quiescence(ply + 1, alpha, beta)
+            finally:
+                game.undo(record)
+
+            best_value = min(best_value, value)
+            beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        return best_value
+
+    def _evaluate_children(
+        self, moves: List[int], maximizing: bool, ply: int
+    ) -> Tuple[int | float, int]:
+        """Return the best value and move of a node at `ply` whose children
+        are all leaves, evaluating them in a single batch."""
+        game = self.game
+        state = game.game_state
+        board = game.board
+
+        tigers, goats, positioned_goats, captured_goats = [], [], [], []
+        # Values of the children that aren't given by the heuristic
+        known_values = {}
+        for index, move in enumerate(moves):
+            record = game.ply_code(move)
+            # As in `_search`, the tablebase is probed before the winner
+            value = None
+            if self.tablebase is not None:
+                value = self.tablebase.value(game)
+            if value is None:
+                winner = game.get_winner()
+                if winner is not None:
+                    value = winner * inf
+            if value is not None:
+                known_values[index] = value
+            elif (
+                self.quiescence
+                and state.player == TIGER_PLAYER
+                and board.tiger_captures
+            ):
+                known_values[index] = self._quiescence(ply + 1, -inf, inf)
+            tigers.append(board.tigers)
+            goats.append(board.goats)
+            positioned_goats.append(state.positioned_goats)
+            captured_goats.append(state.captured_goats)
+            game.undo(record)
+
+        self.statistics.nodes += len(moves)
+        self.statistics.leaves += len(moves)
+
+        values = self.batch_heuristic(
+            boards_from_masks(tigers, goats), positioned_goats, captured_goats
+        ).tolist()
+        for index, value in known_values.items():
+            values[index] = value
+
+        best = values.index(max(values) if maximizing else min(values))
+        return values[best], moves[best]
+
+    def _store(
+        self,
+        key: int | None,
+        remaining: int,
+        alpha: int | float,
+        beta: int | float,
+        value: int | float,
+        move: int | None,
+    ):
+        """Save the result of a node, given the window it was searched with."""
+        if key is None:
+            return
+
+        if value <= alpha:
+            bound = UPPER_BOUND
+        elif value >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.table.store(key, remaining, bound, value, move)
+
+    def _table_key(self) -> Tuple[int, int]:
+        """Return the key of the position in the transposition table, and
+        the symmetry that maps the moves of the position to the ones stored
+        with it."""
+        if self.symmetry:
+            return canonical_hash(self.game)
+
+        return self.game.zobrist_hash(), IDENTITY
+
+    def _unique_moves(self, moves: List[int]) -> List[int]:
+        """Return `moves` without the ones leading to a position symmetric
+        to the one of an earlier move."""
+        unique = {}
+        for move in moves:
+            record = self.game.ply_code(move)
+            unique.setdefault(canonical_hash(self.game)[0], move)
+            self.game.undo(record)
+
+        return list(unique.values())
+
+    def _order(
+        self, moves: bytes, ply: int, first_move: int | None
+    ) -> List[int]:
+        if self.ordering is not None:
+            return self.ordering.order(self.game, moves, ply, first_move)
+
+        moves = list(moves)
+        if first_move is not None and first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+
+        return moves
+
+
+def _to_table(move: int | None, symmetry: int) -> int | None:
+    if move is None or symmetry == IDENTITY:
+        return move
+
+    return SYMMETRIC_CODES[symmetry][move]
+
+
+def _from_table(move: int | None, symmetry: int) -> int | None:
+    return _to_table(move, INVERSES[symmetry])
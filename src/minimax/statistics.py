@@ -0,0 +1,136 @@
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from typing import List
+
+# Counters that add up across the searches of the subtrees of a search
+_COUNTERS = (
+    "nodes",
+    "leaves",
+    "beta_cutoffs",
+    "table_probes",
+    "table_hits",
+    "aspiration_failures",
+    "quiescence_nodes",
+    "reductions",
+    "reduction_failures",
+)
+
+
+@dataclass
+class SearchStatistics:
+    """Counters of a search.
+
+    They are updated with plain additions as the search runs, so keeping
+    them costs little, and the derived values are only computed on demand.
+    """
+
+    nodes: int = 0
+    leaves: int = 0
+    # Cutoff of the last search that finished
+    cutoff: int = 0
+    time: float = 0.0
+    # Deepest ply searched
+    max_depth: int = 0
+    beta_cutoffs: int = 0
+    # Number of beta cutoffs caused by the move at each index of the
+    # (ordered) moves of a node
+    cutoff_indexes: List[int] = field(default_factory=list)
+    table_probes: int = 0
+    table_hits: int = 0
+    # Iterations whose value fell outside their aspiration window
+    aspiration_failures: int = 0
+    # Nodes searched past the cutoff to resolve forced captures
+    quiescence_nodes: int = 0
+    # Moves searched with a reduced depth, and the ones that had to be
+    # searched again at the full depth
+    reductions: int = 0
+    reduction_failures: int = 0
+    # Nodes and seconds of each finished iteration of iterative deepening
+    depth_nodes: List[int] = field(default_factory=list)
+    depth_times: List[float] = field(default_factory=list)
+
+    def record_cutoff(self, index: int):
+        """Count a beta cutoff caused by the move at `index`."""
+        self.beta_cutoffs += 1
+        indexes = self.cutoff_indexes
+        while len(indexes) <= index:
+            indexes.append(0)
+        indexes[index] += 1
+
+    def add(self, other: "SearchStatistics"):
+        """Add the counters of `other`, a search of a subtree of this
+        one, such as a root move searched by another process.
+
+        The cutoff, the time and the iterations are left to this search.
+        """
+        for name in _COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.max_depth = max(self.max_depth, other.max_depth)
+        indexes = self.cutoff_indexes
+        indexes.extend([0] * (len(other.cutoff_indexes) - len(indexes)))
+        for index, count in enumerate(other.cutoff_indexes):
+            indexes[index] += count
+
+    def finish_depth(self, nodes: int, seconds: float):
+        """Record an iteration of iterative deepening, given the nodes and
+        seconds of the whole search up to its end."""
+        self.depth_nodes.append(nodes - sum(self.depth_nodes))
+        self.depth_times.append(seconds - sum(self.depth_times))
+
+    @property
+    def effective_branching_factor(self) -> float:
+        """Growth of the nodes from an iteration to the next, or, without
+        iterations, the branching factor of a uniform tree with as many
+        nodes."""
+        if len(self.depth_nodes) >= 2 and self.depth_nodes[-2]:
+            return self.depth_nodes[-1] / self.depth_nodes[-2]
+        if self.max_depth == 0:
+            return 0.0
+
+        return self.nodes ** (1 / self.max_depth)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Fraction of the beta cutoffs caused by the first move."""
+        if not self.beta_cutoffs:
+            return 0.0
+
+        return self.cutoff_indexes[0] / self.beta_cutoffs
+
+    @property
+    def table_hit_rate(self) -> float:
+        if not self.table_probes:
+            return 0.0
+
+        return self.table_hits / self.table_probes
+
+    def to_dict(self) -> dict:
+        """Return the counters and the derived values, for logging."""
+        return {
+            **asdict(self),
+            "effective_branching_factor": self.effective_branching_factor,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "table_hit_rate": self.table_hit_rate,
+        }
+
+
+def log_statistics(path: str, statistics: SearchStatistics, **fields):
+    """Append `statistics`, with any other `fields`, to a JSON lines file.
+
+    JSON has no infinities, such as the values of won positions, so they
+    are written as the strings "inf" and "-inf", and NaN as null.
+    """
+    line = {
+        name: _json_value(value)
+        for name, value in {**fields, **statistics.to_dict()}.items()
+    }
+    with open(path, "a") as file:
+        file.write(json.dumps(line, allow_nan=False) + "\n")
+
+
+def _json_value(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None if math.isnan(value) else str(value)
+
+    return value
@@ -0,0 +1,470 @@
+"""Endgame tablebase of the movement phase.
+
+Once all the goats are placed, a position is the squares of the 4 tigers,
+the squares of the goats, the player to move, and the number of captured
+goats. The positions with the same number of goats on the board and of
+captured goats form a level. Captures lead from a level to the next, and
+every other move stays in the same level, so the levels are solved by
+retrograde analysis from the last one (4 captured goats) back to the
+first one (none captured).
+
+Each position of a level has an index given by its combinatorial rank,
+and the level is stored as a flat array of int16 codes, one per position:
+0 is a draw, `d + 1` a goat win in `d` plies, and `-(d + 1)` a tiger win
+in `d` plies. Tables are read through `np.memmap`, so probing a position
+only loads the pages it touches.
+
+The tables are built with
+
+    python -m src.minimax.tablebase DIRECTORY
+
+where the complete game (about 700 million positions) takes a long time
+and about 1.4 GB of disk.
+"""
+
+import argparse
+import os
+from math import comb, inf
+from typing import Dict, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from src.constants import (
+    CAPTURED_GOATS_TO_WIN,
+    GOAT_PLAYER,
+    TIGER_PLAYER,
+    TOTAL_NUMBER_OF_GOATS,
+)
+from src.game.game import Game
+from src.game.topology import (
+    JUMP_TRIPLES,
+    NEIGHBOR_MASKS,
+    NEIGHBORS,
+    NUMBER_OF_SQUARES,
+)
+
+NUMBER_OF_TIGERS = 4
+
+# Empty squares after all goats are placed, for the levels
+FREE_SQUARES = NUMBER_OF_SQUARES - NUMBER_OF_TIGERS
+
+DRAW = 0
+
+# Positions generated at a time
+CHUNK_SIZE = 2**20
+
+_BINOMIAL = np.array(
+    [
+        [comb(n, k) for k in range(NUMBER_OF_SQUARES + 2)]
+        for n in range(NUMBER_OF_SQUARES + 1)
+    ],
+    dtype=np.int64,
+)
+
+# Ranks are computed a few squares at a time, with tables indexed by the
+# bits of those squares
+_CHUNK_BITS = 5
+_CHUNK_MASK = (1 << _CHUNK_BITS) - 1
+_CHUNKS = -(-NUMBER_OF_SQUARES // _CHUNK_BITS)
+_POPCOUNT = np.array([bits.bit_count() for bits in range(1 << _CHUNK_BITS)])
+
+
+def _chunk_rank(chunk: int, count: int, bits: int) -> int:
+    """Return the part of a colex rank given by the `bits` of a chunk, when
+    `count` bits are set before it."""
+    squares = [
+        chunk * _CHUNK_BITS + bit
+        for bit in range(_CHUNK_BITS)
+        if bits >> bit & 1
+    ]
+    return sum(comb(square, count + i + 1) for i, square in enumerate(squares))
+
+
+def _compress(free: int, goats: int) -> int:
+    """Return the bits of `goats` in the set bits of `free`, packed."""
+    packed = 0
+    for position, bit in enumerate(
+        bit for bit in range(_CHUNK_BITS) if free >> bit & 1
+    ):
+        packed |= (goats >> bit & 1) << position
+
+    return packed
+
+
+_RANK = np.array(
+    [
+        [
+            [
+                _chunk_rank(chunk, count, bits)
+                for bits in range(1 << _CHUNK_BITS)
+            ]
+            for count in range(NUMBER_OF_SQUARES + 1)
+        ]
+        for chunk in range(_CHUNKS)
+    ],
+    dtype=np.int64,
+)
+_COMPRESS = np.array(
+    [
+        [_compress(free, goats) for goats in range(1 << _CHUNK_BITS)]
+        for free in range(1 << _CHUNK_BITS)
+    ],
+    dtype=np.int64,
+)
+
+# Every (start, end) move along a line of the board
+_STEPS = tuple(
+    (start, end)
+    for start, neighbors in enumerate(NEIGHBORS)
+    for end in neighbors
+)
+
+
+def level_size(goats: int) -> int:
+    """Return the number of positions of a level with `goats` goats."""
+    return (
+        comb(NUMBER_OF_SQUARES, NUMBER_OF_TIGERS)
+        * comb(FREE_SQUARES, goats)
+        * 2
+    )
+
+
+def position_index(
+    tigers: npt.NDArray, goats: npt.NDArray, player: npt.NDArray
+) -> npt.NDArray:
+    """Return the index of each position in its level.
+
+    `tigers` and `goats` are arrays of board masks, all with the same number
+    of goats, and `player` the player to move in each position. The tigers
+    are ranked among all the squares, and the goats among the squares
+    without tigers.
+    """
+    free = ~tigers
+    free_goats = np.zeros(len(tigers), dtype=np.int64)
+    shift = np.zeros(len(tigers), dtype=np.int64)
+    for chunk in range(_CHUNKS):
+        free_bits = (free >> (chunk * _CHUNK_BITS)) & _CHUNK_MASK
+        goat_bits = (goats >> (chunk * _CHUNK_BITS)) & _CHUNK_MASK
+        free_goats |= _COMPRESS[free_bits, goat_bits] << shift
+        shift += _POPCOUNT[free_bits]
+
+    goat_combinations = _BINOMIAL[FREE_SQUARES, np.bitwise_count(goats)]
+    return (
+        _colex_rank(tigers) * goat_combinations + _colex_rank(free_goats)
+    ) * 2 + (player == TIGER_PLAYER)
+
+
+def _colex_rank(masks: npt.NDArray) -> npt.NDArray:
+    """Return the rank of each mask among the masks with as many bits."""
+    rank = np.zeros(len(masks), dtype=np.int64)
+    count = np.zeros(len(masks), dtype=np.int64)
+    for chunk in range(_CHUNKS):
+        bits = (masks >> (chunk * _CHUNK_BITS)) & _CHUNK_MASK
+        rank += _RANK[chunk, count, bits]
+        count += _POPCOUNT[bits]
+
+    return rank
+
+
+def position_masks(
+    index: npt.NDArray, goats: int
+) -> Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    """Return the tiger masks, goat masks and players to move of the
+    positions with the given indexes, in a level with `goats` goats."""
+    player = np.where(index & 1, TIGER_PLAYER, GOAT_PLAYER)
+    tiger_rank, goat_rank = np.divmod(index >> 1, comb(FREE_SQUARES, goats))
+
+    tigers = _unrank(tiger_rank, NUMBER_OF_TIGERS)
+    free_goats = _unrank(goat_rank, goats)
+
+    # Spread the goats over the squares without tigers
+    goat_masks = np.zeros(len(index), dtype=np.int64)
+    free_square = np.zeros(len(index), dtype=np.int64)
+    for square in range(NUMBER_OF_SQUARES):
+        free = 1 - ((tigers >> square) & 1)
+        goat_masks |= ((free_goats >> free_square) & free) << square
+        free_square += free
+
+    return tigers, goat_masks, player
+
+
+def _unrank(rank: npt.NDArray, count: int) -> npt.NDArray:
+    """Return the masks of `count` bits with the given colex ranks."""
+    rank = rank.copy()
+    masks = np.zeros(len(rank), dtype=np.int64)
+    for bit in range(count, 0, -1):
+        # The highest square is the largest one with comb(square, bit) <= rank
+        square = np.searchsorted(_BINOMIAL[:, bit], rank, side="right") - 1
+        masks |= np.int64(1) << square
+        rank -= _BINOMIAL[square, bit]
+
+    return masks
+
+
+def solve_level(
+    goats: int, captured: int, next_level: npt.NDArray | None, out: npt.NDArray
+) -> int:
+    """Solve a level by retrograde analysis, writing its codes to `out`.
+
+    `next_level` holds the codes of the level reached by capturing a goat,
+    and is unused when a capture wins the game. Return the length, in
+    plies, of the longest win of the level.
+
+    A first pass counts the moves of each position, and decides the ones
+    without moves (lost) and the ones whose moves are all captures (from
+    the next level). Then, for each distance, the moves leading to the
+    positions decided at that distance are undone: a move to a lost
+    position wins, and a position whose moves all lead to won positions
+    is lost once the last of them is decided.
+    """
+    out[:] = DRAW
+    moves = np.zeros(len(out), dtype=np.uint8)
+    for start in range(0, len(out), CHUNK_SIZE):
+        index = np.arange(start, min(start + CHUNK_SIZE, len(out)))
+        _count_moves(index, goats, captured, next_level, out, moves)
+
+    distance = 0
+    longest = int(np.abs(out).max())
+    while distance < longest:
+        for sign in (1, -1):
+            decided = np.flatnonzero(out == sign * (distance + 1))
+            for start in range(0, len(decided), CHUNK_SIZE):
+                _undo_moves(
+                    decided[start : start + CHUNK_SIZE],
+                    goats,
+                    distance,
+                    out,
+                    moves,
+                )
+
+        distance += 1
+        longest = max(longest, int(np.abs(out).max()))
+
+    return longest - 1
+
+
+def _count_moves(
+    index: npt.NDArray,
+    goats: int,
+    captured: int,
+    next_level: npt.NDArray | None,
+    table: npt.NDArray,
+    moves: npt.NDArray,
+):
+    """Count the moves of the positions in `index`, and decide the ones
+    whose result doesn't depend on other positions of the level."""
+    tigers, goat_masks, player = position_masks(index, goats)
+    empty = ~(tigers | goat_masks)
+    tiger_to_move = player == TIGER_PLAYER
+
+    count = np.zeros(len(index), dtype=np.int64)
+    pieces = np.where(tiger_to_move, tigers, goat_masks)
+    for square, neighbors in enumerate(NEIGHBOR_MASKS):
+        count += ((pieces >> square) & 1) * np.bitwise_count(empty & neighbors)
+
+    # Tigers must capture when they can, so the results of those positions
+    # are given by the next level
+    captures = np.zeros(len(index), dtype=np.int64)
+    wins = np.full(len(index), np.iinfo(np.int64).max)
+    losses = np.zeros(len(index), dtype=np.int64)
+    draws = np.zeros(len(index), dtype=bool)
+    for start, over, landing in JUMP_TRIPLES:
+        legal = tiger_to_move & (
+            (tigers >> start) & (goat_masks >> over) & (empty >> landing) & 1
+        ).astype(bool)
+        if not legal.any():
+            continue
+
+        if captured + 1 >= CAPTURED_GOATS_TO_WIN:
+            codes = np.full(legal.sum(), TIGER_PLAYER)
+        else:
+            codes = next_level[
+                position_index(
+                    tigers[legal] ^ ((1 << start) | (1 << landing)),
+                    goat_masks[legal] ^ (1 << over),
+                    np.full(legal.sum(), GOAT_PLAYER),
+                )
+            ].astype(np.int64)
+
+        captures[legal] += 1
+        # Plies to the end of the game after the capture, for each result
+        length = np.abs(codes)
+        wins[legal] = np.where(
+            codes < 0, np.minimum(wins[legal], length), wins[legal]
+        )
+        losses[legal] = np.where(
+            codes > 0, np.maximum(losses[legal], length), losses[legal]
+        )
+        draws[legal] |= codes == DRAW
+
+    result = np.zeros(len(index), dtype=np.int64)
+    can_capture = captures > 0
+    capture_win = can_capture & (wins != np.iinfo(np.int64).max)
+    capture_loss = can_capture & ~capture_win & ~draws
+    result[capture_win] = TIGER_PLAYER * (wins[capture_win] + 1)
+    result[capture_loss] = GOAT_PLAYER * (losses[capture_loss] + 1)
+    # Players without moves lose, as in the search
+    stuck = ~can_capture & (count == 0)
+    result[stuck] = -player[stuck]
+
+    count[can_capture] = 0
+    table[index] = result
+    moves[index] = count
+
+
+def _undo_moves(
+    index: npt.NDArray,
+    goats: int,
+    distance: int,
+    table: npt.NDArray,
+    moves: npt.NDArray,
+):
+    """Undo the moves to the positions in `index`, all decided at
+    `distance` plies from the end, and decide the positions before them."""
+    tigers, goat_masks, player = position_masks(index, goats)
+    empty = ~(tigers | goat_masks)
+    # The player before the move, and whether it's the winner
+    previous = -player
+    wins = table[index] * previous > 0
+
+    pieces = np.where(previous == TIGER_PLAYER, tigers, goat_masks)
+    for start, end in _STEPS:
+        # A piece that is in `end` and came from `start`
+        legal = ((pieces >> end) & (empty >> start) & 1).astype(bool)
+        if not legal.any():
+            continue
+
+        moved = pieces[legal] ^ ((1 << start) | (1 << end))
+        tiger_moved = previous[legal] == TIGER_PLAYER
+        before = position_index(
+            np.where(tiger_moved, moved, tigers[legal]),
+            np.where(tiger_moved, goat_masks[legal], moved),
+            previous[legal],
+        )
+        # Positions whose moves are captures, or that are already
+        # decided, can't be reached by undoing a move
+        open_ = (moves[before] > 0) & (table[before] == DRAW)
+        before, win = before[open_], wins[legal][open_]
+
+        winner = previous[legal][open_]
+        table[before[win]] = winner[win] * (distance + 2)
+
+        before, winner = before[~win], winner[~win]
+        if len(before):
+            np.subtract.at(moves, before, 1)
+            lost = moves[before] == 0
+            table[before[lost]] = -winner[lost] * (distance + 2)
+
+
+class Tablebase:
+    """Exact results of the movement phase, read from the files of a
+    directory.
+
+    Only the levels whose files exist are probed, so a partial tablebase
+    (such as the last levels only) can be used as well.
+    """
+
+    def __init__(self, directory: str):
+        self.levels: Dict[Tuple[int, int], npt.NDArray] = {}
+        for captured in range(CAPTURED_GOATS_TO_WIN):
+            for goats in range(FREE_SQUARES + 1):
+                path = level_path(directory, goats, captured)
+                if os.path.exists(path):
+                    self.levels[goats, captured] = np.memmap(
+                        path, dtype=np.int16, mode="r"
+                    )
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def probe(self, game: Game) -> int | None:
+        """Return the code of the position of `game`, or None if it isn't
+        in the tablebase."""
+        state = game.game_state
+        if state.positioned_goats < TOTAL_NUMBER_OF_GOATS:
+            return None
+
+        tigers, goats = game.board.snapshot()[:2]
+        level = self.levels.get((goats.bit_count(), state.captured_goats))
+        if level is None or tigers.bit_count() != NUMBER_OF_TIGERS:
+            return None
+
+        index = position_index(
+            np.array([tigers]), np.array([goats]), np.array([state.player])
+        )
+        return int(level[index[0]])
+
+    def value(self, game: Game) -> int | float | None:
+        """Return the exact value of the position of `game` for the search,
+        or None if it isn't in the tablebase."""
+        code = self.probe(game)
+        if code is None:
+            return None
+        if code == DRAW:
+            return 0
+
+        return inf if code > 0 else -inf
+
+
+def level_path(directory: str, goats: int, captured: int) -> str:
+    return os.path.join(directory, f"goats_{goats}_captured_{captured}.tb")
+
+
+def generate(directory: str, captured_levels=None, verbose: bool = False):
+    """Write the levels of the tablebase to `directory`.
+
+    A level is reached from the placement by capturing goats, so it has
+    `TOTAL_NUMBER_OF_GOATS - captured` goats. By default every level is
+    built, starting from the last one.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if captured_levels is None:
+        captured_levels = range(CAPTURED_GOATS_TO_WIN)
+
+    next_level = None
+    for captured in sorted(captured_levels, reverse=True):
+        goats = TOTAL_NUMBER_OF_GOATS - captured
+        if captured + 1 < CAPTURED_GOATS_TO_WIN and next_level is None:
+            next_level = np.memmap(
+                level_path(directory, goats - 1, captured + 1),
+                dtype=np.int16,
+                mode="r",
+            )
+
+        path = level_path(directory, goats, captured)
+        out = np.memmap(
+            path, dtype=np.int16, mode="w+", shape=level_size(goats)
+        )
+        passes = solve_level(goats, captured, next_level, out)
+        out.flush()
+        if verbose:
+            print(
+                f"{os.path.basename(path)}: {len(out)} positions,"
+                f" {passes} passes"
+            )
+
+        next_level = np.memmap(path, dtype=np.int16, mode="r")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("directory")
+    parser.add_argument(
+        "--captured",
+        type=int,
+        nargs="+",
+        default=None,
+        help="levels to build, by captured goats (the following levels"
+        " must already be built)",
+    )
+    args = parser.parse_args()
+
+    generate(args.directory, args.captured, verbose=True)
+
+
+if __name__ == "__main__":
+    main()
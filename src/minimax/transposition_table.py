@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Final, Literal
+
+# Kind of value stored in an entry
+EXACT: Final = 0
+LOWER_BOUND: Final = 1
+UPPER_BOUND: Final = 2
+
+# Rough size of an entry in memory, used to turn a memory cap into a
+# number of slots
+ENTRY_SIZE: Final = 200
+
+
+@dataclass(slots=True)
+class TableEntry:
+    """The result of searching a position."""
+
+    key: int
+    depth: int | float
+    bound: int
+    value: int | float
+    # Code of the best move (see `src.game.moves`)
+    move: int | None
+    # Search that stored the entry (see `TranspositionTable.new_search`)
+    generation: int = 0
+
+
+class TranspositionTable:
+    """Fixed size table with the results of already searched positions.
+
+    Positions are indexed by their Zobrist hash. Each slot holds a single
+    entry, and when two positions fall in the same slot the replacement
+    policy decides which one is kept:
+
+    - "depth": keep the entry searched deeper (depth-preferred).
+    - "always": always keep the newest entry.
+
+    A table can be kept between the searches of a game, calling
+    `new_search` before each one. The entries of earlier searches can still
+    be used, but any entry of the current search replaces them, so the
+    deep entries of old positions don't fill the table.
+    """
+
+    def __init__(
+        self,
+        max_memory: int = 64 * 2**20,
+        replacement: Literal["depth", "always"] = "depth",
+    ):
+        if replacement not in ("depth", "always"):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+
+        # Use a power of two, so the slot is given by the lower bits of the key
+        size = 1
+        while size * 2 * ENTRY_SIZE <= max_memory:
+            size *= 2
+
+        self.replacement = replacement
+        self._mask = size - 1
+        self._slots: list[TableEntry | None] = [None] * size
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def probe(self, key: int) -> TableEntry | None:
+        """Return the entry of the position with hash `key`, if stored."""
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int | float,
+        bound: int,
+        value: int | float,
+        move: int | None,
+    ):
+        """Save the result of searching the position with hash `key`."""
+        index = key & self._mask
+        entry = self._slots[index]
+        if entry is not None and entry.key != key:
+            if (
+                self.replacement == "depth"
+                and entry.depth > depth
+                and entry.generation == self.generation
+            ):
+                return
+            self.replacements += 1
+
+        self._slots[index] = TableEntry(
+            key, depth, bound, value, move, self.generation
+        )
+        self.stores += 1
+
+    def new_search(self):
+        """Mark the entries stored so far as older than the ones of the
+        next search."""
+        self.generation += 1
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        self._slots = [None] * len(self._slots)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
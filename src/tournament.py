@@ -0,0 +1,360 @@
+"""Headless engine-vs-engine tournaments.
+
+Every pair of engines plays a number of games with each side, starting
+from random openings, across a pool of processes. Each finished game is
+appended to a results file as a line of JSON.
+
+Run from the repository root, for example, with
+
+    python -m src.tournament results.jsonl cutoff:2 cutoff:3 time:0.1
+
+where each engine is given as `[heuristic:]cutoff:N` or
+`[heuristic:]time:SECONDS`, optionally followed by the search options
+`:quiescence`, `:reductions` and `:symmetry` (see `search_best_move`).
+
+With `--records PATH`, the games are also appended to a file of binary
+game records (see `src.game.records`).
+
+Monte Carlo tree search engines are given as `mcts:iterations:N` or
+`mcts:time:SECONDS`, optionally followed by `:prior` to use the heuristic
+as a prior (see `MonteCarloTreeSearch`).
+"""
+
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from itertools import permutations
+from typing import Iterator, List
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.game.moves import MOVE_CODES
+from src.game.records import GameRecord, append_records
+from src.minimax.heuristics import heuristic
+from src.minimax.mcts import MonteCarloTreeSearch
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+HEURISTICS = {"heuristic": heuristic}
+
+# Options of the search that can follow an engine's limit
+_OPTIONS = ("quiescence", "reductions", "symmetry")
+# Options of the Monte Carlo tree search
+_MCTS_OPTIONS = ("prior",)
+
+ALPHA_BETA = "alpha-beta"
+MCTS = "mcts"
+
+# Winner of a game, as written to the results file
+_WINNER_NAMES = {GOAT_PLAYER: "goat", TIGER_PLAYER: "tiger", None: None}
+
+# Games can go on forever in the movement phase, so after this many plies
+# they end in a draw
+MAX_PLIES = 200
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """How an engine searches: up to a cutoff, or for a time per move.
+
+    The Monte Carlo tree search engines run a number of `iterations`
+    instead of searching up to a cutoff.
+    """
+
+    heuristic: str = "heuristic"
+    cutoff: int | None = None
+    time_budget: float | None = None
+    quiescence: bool = False
+    reductions: bool = False
+    symmetry: bool = False
+    engine: str = ALPHA_BETA
+    iterations: int | None = None
+    prior: bool = False
+
+    @property
+    def name(self) -> str:
+        if self.engine == MCTS:
+            prefix, options = MCTS, _MCTS_OPTIONS
+        else:
+            prefix, options = self.heuristic, _OPTIONS
+        if self.time_budget is not None:
+            name = f"{prefix}:time:{self.time_budget}"
+        elif self.engine == MCTS:
+            name = f"{prefix}:iterations:{self.iterations}"
+        else:
+            name = f"{prefix}:cutoff:{self.cutoff}"
+        for option in options:
+            if getattr(self, option):
+                name += f":{option}"
+        return name
+
+    @classmethod
+    def parse(cls, text: str) -> "EngineSettings":
+        """Read settings written as `[heuristic:]cutoff:N` or
+        `[heuristic:]time:SECONDS`, followed by any options, or as
+        `mcts:iterations:N` or `mcts:time:SECONDS`, followed by `:prior`."""
+        parts = text.split(":")
+        if parts[0] == MCTS:
+            return cls._parse_mcts(text, parts[1:])
+        if parts[0] in ("cutoff", "time"):
+            parts.insert(0, "heuristic")
+        if len(parts) < 3 or parts[0] not in HEURISTICS:
+            raise ValueError(f"Invalid engine settings: {text!r}")
+
+        name, limit, value, *options = parts
+        if any(option not in _OPTIONS for option in options):
+            raise ValueError(f"Invalid engine settings: {text!r}")
+        flags = {option: True for option in options}
+        if limit == "cutoff":
+            return cls(name, cutoff=int(value), **flags)
+        if limit == "time":
+            return cls(name, time_budget=float(value), **flags)
+        raise ValueError(f"Invalid engine settings: {text!r}")
+
+    @classmethod
+    def _parse_mcts(cls, text: str, parts: List[str]) -> "EngineSettings":
+        if len(parts) < 2 or any(
+            option not in _MCTS_OPTIONS for option in parts[2:]
+        ):
+            raise ValueError(f"Invalid engine settings: {text!r}")
+
+        limit, value, *options = parts
+        flags = {option: True for option in options}
+        if limit == "iterations":
+            return cls(engine=MCTS, iterations=int(value), **flags)
+        if limit == "time":
+            return cls(engine=MCTS, time_budget=float(value), **flags)
+        raise ValueError(f"Invalid engine settings: {text!r}")
+
+
+@dataclass
+class GameResult:
+    """The outcome of a game, as written to the results file."""
+
+    goat: str
+    tiger: str
+    seed: int
+    # "goat", "tiger", or None for a draw
+    winner: str | None
+    plies: int
+    opening: List[str] = field(default_factory=list)
+    goat_time_per_move: float = 0
+    tiger_time_per_move: float = 0
+    # Codes of all the moves, opening included (see `src.game.moves`)
+    moves: List[int] = field(default_factory=list)
+
+    @property
+    def record(self) -> GameRecord:
+        winners = {name: winner for winner, name in _WINNER_NAMES.items()}
+        return GameRecord(
+            self.goat,
+            self.tiger,
+            winners[self.winner],
+            bytes(self.moves),
+            len(self.opening),
+        )
+
+
+def play_game(
+    goat: EngineSettings,
+    tiger: EngineSettings,
+    seed: int,
+    opening_plies: int = 4,
+    max_plies: int = MAX_PLIES,
+) -> GameResult:
+    """Play a game without printing anything, and return its result.
+
+    The first `opening_plies` moves are chosen at random from `seed`.
+    """
+    rng = random.Random(seed)
+    game = Game()
+    opening = []
+    moves = []
+    for _ in range(opening_plies):
+        if game.is_game_over():
+            break
+        move = rng.choice(game.available_moves())
+        game.ply(move)
+        opening.append(str(move))
+        moves.append(MOVE_CODES[move])
+
+    engines = {GOAT_PLAYER: goat, TIGER_PLAYER: tiger}
+    # Each engine keeps its table and ordering between its moves
+    tables = {
+        GOAT_PLAYER: TranspositionTable(),
+        TIGER_PLAYER: TranspositionTable(),
+    }
+    orderings = {GOAT_PLAYER: MoveOrdering(), TIGER_PLAYER: MoveOrdering()}
+    # And the Monte Carlo tree search engines their trees
+    trees = {
+        player: MonteCarloTreeSearch(
+            heuristic=(
+                HEURISTICS[settings.heuristic] if settings.prior else None
+            ),
+            seed=seed,
+        )
+        for player, settings in engines.items()
+        if settings.engine == MCTS
+    }
+    times = {GOAT_PLAYER: [], TIGER_PLAYER: []}
+
+    plies = len(opening)
+    winner = game.get_winner()
+    while winner is None and plies < max_plies:
+        player = game.game_state.player
+        settings = engines[player]
+
+        start = time.perf_counter()
+        if settings.engine == MCTS:
+            result = trees[player].search(
+                game,
+                iterations=settings.iterations,
+                time_budget=settings.time_budget,
+            )
+        else:
+            tables[player].new_search()
+            orderings[player].age()
+            result = search_best_move(
+                game,
+                HEURISTICS[settings.heuristic],
+                cutoff=settings.cutoff,
+                time_budget=settings.time_budget,
+                table=tables[player],
+                ordering=orderings[player],
+                quiescence=settings.quiescence,
+                reductions=settings.reductions,
+                symmetry=settings.symmetry,
+            )
+        times[player].append(time.perf_counter() - start)
+
+        game.ply(result.move)
+        moves.append(MOVE_CODES[result.move])
+        plies += 1
+        winner = game.get_winner()
+
+    return GameResult(
+        goat=goat.name,
+        tiger=tiger.name,
+        seed=seed,
+        winner=_WINNER_NAMES[winner],
+        plies=plies,
+        opening=opening,
+        goat_time_per_move=_mean(times[GOAT_PLAYER]),
+        tiger_time_per_move=_mean(times[TIGER_PLAYER]),
+        moves=moves,
+    )
+
+
+def schedule(
+    engines: List[EngineSettings], games: int, seed: int = 0
+) -> Iterator[tuple]:
+    """Yield the (goat, tiger, seed) of each game of a tournament.
+
+    Each ordered pair of different engines plays `games` games, and the
+    same openings are used when the sides are swapped.
+    """
+    pairs = list(permutations(engines, 2)) or [(engines[0], engines[0])]
+    for game in range(games):
+        for goat, tiger in pairs:
+            yield goat, tiger, seed + game
+
+
+def run_tournament(
+    engines: List[EngineSettings],
+    games: int,
+    path: str,
+    workers: int | None = None,
+    seed: int = 0,
+    opening_plies: int = 4,
+    max_plies: int = MAX_PLIES,
+    records: str | None = None,
+) -> List[GameResult]:
+    """Play a tournament across `workers` processes.
+
+    Results are appended to the file at `path` as soon as each game ends,
+    so an interrupted tournament keeps the games already played, and so
+    are their game records to the file at `records`, if given.
+    """
+    results = []
+    with ProcessPoolExecutor(workers) as executor, open(path, "a") as file:
+        futures = [
+            executor.submit(
+                play_game, goat, tiger, game_seed, opening_plies, max_plies
+            )
+            for goat, tiger, game_seed in schedule(engines, games, seed)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            file.write(json.dumps(asdict(result)) + "\n")
+            file.flush()
+            if records is not None:
+                append_records(records, [result.record])
+            results.append(result)
+
+    return results
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0
+
+
+def _print_summary(results: List[GameResult]):
+    scores = {}
+    for result in results:
+        for side, name in (("goat", result.goat), ("tiger", result.tiger)):
+            wins, draws, losses = scores.get(name, (0, 0, 0))
+            if result.winner is None:
+                draws += 1
+            elif result.winner == side:
+                wins += 1
+            else:
+                losses += 1
+            scores[name] = (wins, draws, losses)
+
+    print(f"{'engine':<28} {'wins':>5} {'draws':>5} {'losses':>6}")
+    for name, (wins, draws, losses) in sorted(scores.items()):
+        print(f"{name:<28} {wins:>5} {draws:>5} {losses:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("results", help="JSON lines file to append to")
+    parser.add_argument("engines", nargs="+", type=EngineSettings.parse)
+    parser.add_argument(
+        "--games", type=int, default=10, help="games per pair and side"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--opening-plies", type=int, default=4)
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument(
+        "--records", default=None, help="game records file to append to"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_tournament(
+        args.engines,
+        args.games,
+        args.results,
+        args.workers,
+        args.seed,
+        args.opening_plies,
+        args.max_plies,
+        args.records,
+    )
+    elapsed = time.perf_counter() - start
+
+    _print_summary(results)
+    print(f"{len(results)} games in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -79,9 +79,21 @@ class TestAllowedTigerMovements(TestCase):
 
         # Although there are allowed squares to go, the captures are forced, so it needs to select one of them.
         expected_moves = [
-            Capture(starting_square=BoardSquare(0, 2), ending_square=BoardSquare(0, 4), captured=BoardSquare(0, 3)),
-            Capture(starting_square=BoardSquare(0, 2), ending_square=BoardSquare(2, 4), captured=BoardSquare(1, 3)),
-            Capture(starting_square=BoardSquare(4, 4), ending_square=BoardSquare(2, 4), captured=BoardSquare(3, 4)),
+            Capture(
+                starting_square=BoardSquare(0, 2),
+                ending_square=BoardSquare(0, 4),
+                captured=BoardSquare(0, 3),
+            ),
+            Capture(
+                starting_square=BoardSquare(0, 2),
+                ending_square=BoardSquare(2, 4),
+                captured=BoardSquare(1, 3),
+            ),
+            Capture(
+                starting_square=BoardSquare(4, 4),
+                ending_square=BoardSquare(2, 4),
+                captured=BoardSquare(3, 4),
+            ),
         ]
 
         game = Game()
@@ -177,7 +189,9 @@ class TestAllowedCaptures(TestCase):
 
     def _allowed_captures(self):
         allowed_moves = self.game.available_moves()
-        allowed_captures = [move for move in allowed_moves if isinstance(move, Capture)]
+        allowed_captures = [
+            move for move in allowed_moves if isinstance(move, Capture)
+        ]
 
         return allowed_captures
 
@@ -251,11 +265,31 @@ class TestAllowedCaptures(TestCase):
         )
 
         expected_captures = [
-            Capture(starting_square=BoardSquare(0, 2), ending_square=BoardSquare(0, 4), captured=BoardSquare(0, 3)),
-            Capture(starting_square=BoardSquare(0, 2), ending_square=BoardSquare(2, 4), captured=BoardSquare(1, 3)),
-            Capture(starting_square=BoardSquare(1, 1), ending_square=BoardSquare(3, 3), captured=BoardSquare(2, 2)),
-            Capture(starting_square=BoardSquare(4, 0), ending_square=BoardSquare(4, 2), captured=BoardSquare(4, 1)),
-            Capture(starting_square=BoardSquare(4, 4), ending_square=BoardSquare(2, 4), captured=BoardSquare(3, 4)),
+            Capture(
+                starting_square=BoardSquare(0, 2),
+                ending_square=BoardSquare(0, 4),
+                captured=BoardSquare(0, 3),
+            ),
+            Capture(
+                starting_square=BoardSquare(0, 2),
+                ending_square=BoardSquare(2, 4),
+                captured=BoardSquare(1, 3),
+            ),
+            Capture(
+                starting_square=BoardSquare(1, 1),
+                ending_square=BoardSquare(3, 3),
+                captured=BoardSquare(2, 2),
+            ),
+            Capture(
+                starting_square=BoardSquare(4, 0),
+                ending_square=BoardSquare(4, 2),
+                captured=BoardSquare(4, 1),
+            ),
+            Capture(
+                starting_square=BoardSquare(4, 4),
+                ending_square=BoardSquare(2, 4),
+                captured=BoardSquare(3, 4),
+            ),
         ]
 
         self.game.board.board = board
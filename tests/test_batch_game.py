@@ -0,0 +1,141 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.batch_game import NO_MOVE, BatchGame, random_moves
+from src.game.game import Game
+from src.game.moves import MOVES
+
+T = TIGER_PLAYER
+G = GOAT_PLAYER
+
+
+class TestBatchGame(TestCase):
+    def _play_and_compare(self, games, rng, plies=150):
+        """Play random moves in `games` and in a `BatchGame` with copies of
+        them, checking that they stay the same."""
+        batch = BatchGame(games=games)
+        for _ in range(plies):
+            legal = batch.legal_moves()
+            over = batch.game_over(legal)
+            winners = batch.winners(legal)
+            for index, game in enumerate(games):
+                self.assertEqual(over[index], game.is_game_over())
+                self.assertEqual(winners[index], game.get_winner() or 0)
+                self.assertEqual(
+                    batch.game(index).zobrist_hash(), game.zobrist_hash()
+                )
+                self.assertTrue(
+                    np.array_equal(
+                        batch.boards[index], game.board.board.reshape(-1)
+                    )
+                )
+                if not over[index]:
+                    self.assertEqual(
+                        list(np.flatnonzero(legal[index])),
+                        sorted(game.available_move_codes()),
+                    )
+
+            moves = random_moves(legal, rng)
+            for index, (game, code) in enumerate(zip(games, moves)):
+                if code != NO_MOVE:
+                    self.assertTrue(legal[index, code])
+                    game.ply(MOVES[code])
+            batch.ply(moves)
+
+        self.assertGreater(np.count_nonzero(batch.game_over()), 0)
+
+    def test_random_games_match_game(self):
+        rng = np.random.default_rng(0)
+
+        self._play_and_compare([Game() for _ in range(64)], rng)
+
+    def test_random_movement_games_match_game(self):
+        rng = np.random.default_rng(1)
+        games = []
+        for _ in range(64):
+            # All the goats are placed, and up to 4 were captured
+            board = np.zeros(25, dtype=int)
+            squares = rng.permutation(25)
+            captured = int(rng.integers(0, 5))
+            board[squares[:4]] = T
+            board[squares[4 : 24 - captured]] = G
+
+            game = Game()
+            game.board.board = board.reshape(5, 5)
+            game.game_state.player = int(rng.choice([T, G]))
+            game.game_state.positioned_goats = 20
+            game.game_state.captured_goats = captured
+            games.append(game)
+
+        self._play_and_compare(games, rng)
+
+    def test_from_games(self):
+        game = Game()
+        game.ply(MOVES[12])
+        game.ply(game.available_moves()[0])
+
+        batch = BatchGame(games=[Game(), game])
+        copy = batch.game(1)
+
+        self.assertEqual(copy.zobrist_hash(), game.zobrist_hash())
+        self.assertEqual(batch.game(0).zobrist_hash(), Game().zobrist_hash())
+
+    def test_trapped_tigers(self):
+        game = Game()
+        game.board.board = np.array(
+            [
+                [T, G, G, G, T],
+                [G, G, 0, G, G],
+                [G, 0, G, 0, G],
+                [G, G, 0, G, G],
+                [T, G, G, G, T],
+            ]
+        )
+        game.game_state.player = TIGER_PLAYER
+        game.game_state.positioned_goats = 20
+        game.game_state.captured_goats = 3
+
+        batch = BatchGame(games=[game])
+
+        self.assertTrue(game.is_game_over())
+        self.assertEqual(list(batch.winners()), [GOAT_PLAYER])
+        self.assertFalse(batch.legal_moves().any())
+
+    def test_blocked_goats(self):
+        game = Game()
+        game.board.board = np.array(
+            [
+                [0, T, G, G, G],
+                [T, T, G, G, G],
+                [G, G, G, G, G],
+                [G, G, G, G, G],
+                [G, G, G, G, T],
+            ]
+        )
+        game.game_state.positioned_goats = 20
+
+        batch = BatchGame(games=[game])
+
+        self.assertEqual(game.get_winner(), TIGER_PLAYER)
+        self.assertEqual(list(batch.winners()), [TIGER_PLAYER])
+        self.assertTrue(batch.game_over().all())
+
+    def test_random_moves_in_large_batches(self):
+        rng = np.random.default_rng(2)
+        batch = BatchGame(1000)
+        for _ in range(30):
+            batch.ply(random_moves(batch.legal_moves(), rng))
+
+        legal = batch.legal_moves()
+        moves = random_moves(legal, rng)
+
+        for index, code in enumerate(moves):
+            if code == NO_MOVE:
+                self.assertFalse(legal[index].any())
+            else:
+                self.assertTrue(legal[index, code])
+        # The first moves are spread over all the placements
+        first = random_moves(BatchGame(1000).legal_moves(), rng)
+        self.assertEqual(len(set(first)), 21)
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.board import Board
+from src.game.game_types import BoardSquare, Capture, Movement
+
+T = TIGER_PLAYER
+G = GOAT_PLAYER
+
+
+class TestBoardMoves(TestCase):
+    def test_moves_update_board(self):
+        board = Board()
+        board.move(BoardSquare(1, 1))
+        board.move(Movement(BoardSquare(0, 0), BoardSquare(0, 1)))
+        board.move(
+            Capture(
+                starting_square=BoardSquare(0, 1),
+                captured=BoardSquare(1, 1),
+                ending_square=BoardSquare(2, 1),
+            )
+        )
+
+        expected = np.array(
+            [
+                [0, 0, 0, 0, T],
+                [0, 0, 0, 0, 0],
+                [0, T, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+                [T, 0, 0, 0, T],
+            ]
+        )
+        np.testing.assert_array_equal(board.board, expected)
+
+    def test_array_changes_are_used(self):
+        board = Board()
+        board.board[2, 2] = GOAT_PLAYER
+        board.move(Movement(BoardSquare(2, 2), BoardSquare(2, 3)))
+
+        self.assertEqual(board.board[2, 2], 0)
+        self.assertEqual(board.board[2, 3], GOAT_PLAYER)
+
+
+class TestLockedTigers(TestCase):
+    def test_locked_tigers(self):
+        board = Board(
+            np.array(
+                [
+                    [T, G, G, 0, T],
+                    [G, G, 0, 0, 0],
+                    [G, 0, G, 0, 0],
+                    [0, 0, 0, 0, 0],
+                    [T, 0, 0, 0, T],
+                ]
+            )
+        )
+
+        self.assertEqual(board.count_number_of_locked_tigers(), 1)
+
+    def test_tiger_with_capture_is_not_locked(self):
+        board = Board(
+            np.array(
+                [
+                    [T, G, 0, 0, T],
+                    [G, G, 0, 0, 0],
+                    [0, 0, 0, 0, 0],
+                    [0, 0, 0, 0, 0],
+                    [T, 0, 0, 0, T],
+                ]
+            )
+        )
+
+        self.assertEqual(board.count_number_of_locked_tigers(), 0)
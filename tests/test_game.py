@@ -0,0 +1,106 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.game.game_state import GameState
+from src.game.game_types import BoardSquare, Capture, Movement
+
+
+class TestUndo(TestCase):
+    def test_undo_restores_position(self):
+        game = Game()
+        moves = [
+            BoardSquare(0, 1),
+            Movement(BoardSquare(4, 0), BoardSquare(3, 0)),
+            BoardSquare(1, 1),
+            Capture(
+                starting_square=BoardSquare(0, 0),
+                captured=BoardSquare(1, 1),
+                ending_square=BoardSquare(2, 2),
+            ),
+        ]
+
+        positions = []
+        records = []
+        for move in moves:
+            positions.append(
+                (game.board.board.copy(), GameState(**vars(game.game_state)))
+            )
+            records.append(game.ply(move))
+
+        self.assertEqual(game.game_state.captured_goats, 1)
+        self.assertEqual(game.game_state.player, GOAT_PLAYER)
+
+        for record, (board, game_state) in zip(
+            reversed(records), reversed(positions)
+        ):
+            game.undo(record)
+            np.testing.assert_array_equal(game.board.board, board)
+            self.assertEqual(game.game_state, game_state)
+
+        self.assertEqual(game.game_state.player, GOAT_PLAYER)
+        self.assertEqual(game.board.board[0, 0], TIGER_PLAYER)
+
+
+class TestZobristHash(TestCase):
+    def test_same_position_same_hash(self):
+        first = Game()
+        first.ply(BoardSquare(1, 1))
+        first.ply(Movement(BoardSquare(0, 0), BoardSquare(0, 1)))
+        first.ply(BoardSquare(2, 2))
+
+        second = Game()
+        second.ply(BoardSquare(2, 2))
+        second.ply(Movement(BoardSquare(0, 0), BoardSquare(0, 1)))
+        second.ply(BoardSquare(1, 1))
+
+        self.assertEqual(first.zobrist_hash(), second.zobrist_hash())
+
+    def test_hash_follows_moves_and_state(self):
+        game = Game()
+        initial = game.zobrist_hash()
+
+        record = game.ply(BoardSquare(1, 1))
+        self.assertNotEqual(game.zobrist_hash(), initial)
+        game.undo(record)
+        self.assertEqual(game.zobrist_hash(), initial)
+
+        game.game_state.player = TIGER_PLAYER
+        self.assertNotEqual(game.zobrist_hash(), initial)
+
+    def test_hash_of_changed_array(self):
+        game = Game()
+        game.ply(BoardSquare(1, 1))
+
+        other = Game()
+        other.board.board[1, 1] = GOAT_PLAYER
+        other.game_state.player = TIGER_PLAYER
+        other.game_state.positioned_goats = 1
+
+        self.assertEqual(game.zobrist_hash(), other.zobrist_hash())
+
+
+class TestWinner(TestCase):
+    def test_blocked_goats_lose(self):
+        T, G = TIGER_PLAYER, GOAT_PLAYER
+        game = Game()
+        game.board.board = np.array(
+            [
+                [0, T, G, G, G],
+                [T, T, G, G, G],
+                [G, G, G, G, G],
+                [G, G, G, G, G],
+                [G, G, G, G, T],
+            ]
+        )
+        game.game_state.positioned_goats = 20
+
+        self.assertEqual(game.available_move_codes(), b"")
+        self.assertTrue(game.is_game_over())
+        self.assertEqual(game.get_winner(), TIGER_PLAYER)
+
+        # The tigers to move aren't blocked
+        game.game_state.player = TIGER_PLAYER
+        self.assertIsNone(game.get_winner())
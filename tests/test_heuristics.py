@@ -0,0 +1,87 @@
+from random import Random
+from unittest import TestCase
+
+from src.constants import TIGER_PLAYER
+from src.game.game import Game
+from src.game.game_types import Capture
+from src.game.topology import square_index
+from src.minimax.batch_heuristics import boards_from_masks, heuristic_batch
+from src.minimax.heuristics import heuristic
+
+
+def _reference_heuristic(game: Game) -> int:
+    """The heuristic computed by generating the tiger moves."""
+    state = game.game_state
+    player = state.player
+    state.player = TIGER_PLAYER
+    tiger_moves = game.available_moves()
+    state.player = player
+
+    locked_tigers = 0
+    for tiger in game.board._get_piece_positions(TIGER_PLAYER):
+        index = square_index(tiger)
+        if not (
+            game.board._get_piece_movements(index)
+            or game.board._get_piece_capture_moves(index)
+        ):
+            locked_tigers += 1
+
+    tiger_score = sum(
+        50 if isinstance(move, Capture) else 5 for move in tiger_moves
+    )
+    return (
+        state.positioned_goats
+        - state.captured_goats
+        + 2 * locked_tigers
+        - 10 * state.captured_goats
+        - tiger_score
+    )
+
+
+class TestHeuristic(TestCase):
+    def test_matches_move_generation(self):
+        """The terms kept by the board must match the generated moves."""
+        random = Random(0)
+        for _ in range(50):
+            game = Game()
+            records = []
+            while not game.is_game_over() and len(records) < 80:
+                moves = game.available_moves()
+                if not moves:
+                    break
+                records.append(game.ply(random.choice(moves)))
+                self.assertEqual(heuristic(game), _reference_heuristic(game))
+
+                if random.random() < 0.2:
+                    game.undo(records.pop())
+                    self.assertEqual(
+                        heuristic(game), _reference_heuristic(game)
+                    )
+
+
+class TestHeuristicBatch(TestCase):
+    def test_matches_heuristic(self):
+        random = Random(1)
+        games = []
+        for _ in range(200):
+            game = Game()
+            for _ in range(random.randrange(0, 60)):
+                moves = game.available_moves()
+                if game.is_game_over() or not moves:
+                    break
+                game.ply(random.choice(moves))
+            games.append(game)
+
+        boards = boards_from_masks(
+            [game.board.tigers for game in games],
+            [game.board.goats for game in games],
+        )
+        values = heuristic_batch(
+            boards,
+            [game.game_state.positioned_goats for game in games],
+            [game.game_state.captured_goats for game in games],
+        )
+
+        self.assertEqual(values.tolist(), [heuristic(game) for game in games])
+        for game, board in zip(games, boards):
+            self.assertEqual(board.tolist(), game.board.board.ravel().tolist())
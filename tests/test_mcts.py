@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.game.game_types import BoardSquare, Movement
+from src.minimax.heuristics import heuristic
+from src.minimax.mcts import MonteCarloTreeSearch
+
+T = TIGER_PLAYER
+G = GOAT_PLAYER
+
+
+def _trap_in_one():
+    """Return a game where the goats trap the tigers by moving (1, 2) to
+    (0, 2), and don't with any other move."""
+    game = Game()
+    game.board.board = np.array(
+        [
+            [T, G, 0, G, T],
+            [G, G, G, G, G],
+            [G, 0, G, 0, G],
+            [G, G, 0, G, G],
+            [T, G, G, G, T],
+        ]
+    )
+    game.game_state.player = GOAT_PLAYER
+    game.game_state.positioned_goats = 20
+    game.game_state.captured_goats = 3
+    return game
+
+
+class TestMonteCarloTreeSearch(TestCase):
+    def test_legal_move_and_game_restored(self):
+        game = Game()
+        game.ply(game.available_moves()[7])
+        key = game.zobrist_hash()
+
+        result = MonteCarloTreeSearch(seed=0).search(game, iterations=100)
+
+        self.assertIn(result.move, game.available_moves())
+        self.assertEqual(result.move, result.principal_variation[0])
+        self.assertEqual(result.statistics.nodes, 100)
+        self.assertLessEqual(abs(result.value), 1)
+        self.assertEqual(game.zobrist_hash(), key)
+
+    def test_finds_the_winning_move(self):
+        move = Movement(BoardSquare(1, 2), BoardSquare(0, 2))
+        for prior in (None, heuristic):
+            mcts = MonteCarloTreeSearch(heuristic=prior, seed=0)
+            result = mcts.search(_trap_in_one(), iterations=500)
+
+            self.assertEqual(result.move, move)
+            self.assertEqual(result.value, 1)
+
+    def test_no_move_when_blocked(self):
+        game = Game()
+        game.board.board = np.array(
+            [
+                [0, T, G, G, G],
+                [T, T, G, G, G],
+                [G, G, G, G, G],
+                [G, G, G, G, G],
+                [G, G, G, G, T],
+            ]
+        )
+        game.game_state.positioned_goats = 20
+
+        result = MonteCarloTreeSearch(seed=0).search(game, iterations=10)
+
+        # The goats can't move, and lose
+        self.assertIsNone(result.move)
+        self.assertEqual(result.value, -1)
+
+    def test_tree_is_reused(self):
+        game = Game()
+        mcts = MonteCarloTreeSearch(seed=0)
+        result = mcts.search(game, iterations=300)
+        reply = result.principal_variation[1]
+        game.ply(result.move)
+        game.ply(reply)
+        nodes = len(mcts)
+
+        mcts.search(game, iterations=10)
+
+        # The root is now the grandchild, with the visits it already had,
+        # and the rest of the tree was dropped
+        self.assertLess(len(mcts), nodes)
+        self.assertGreater(mcts._visits[mcts._root], 10)
+        self.assertEqual(mcts._root, 0)
+
+        result = mcts.search(game, iterations=200)
+
+        self.assertIn(result.move, game.available_moves())
+
+    def test_root_expanded_past_max_nodes(self):
+        game = Game()
+        mcts = MonteCarloTreeSearch(max_nodes=10, seed=0)
+
+        result = mcts.search(game, iterations=5)
+
+        self.assertIn(result.move, game.available_moves())
+        self.assertEqual(len(mcts), len(game.available_moves()) + 1)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            MonteCarloTreeSearch().search(Game(), iterations=0)
+        with self.assertRaises(ValueError):
+            MonteCarloTreeSearch(max_nodes=0)
+
+    def test_time_budget(self):
+        result = MonteCarloTreeSearch(seed=0).search(Game(), time_budget=0.05)
+
+        self.assertIsNotNone(result.move)
+        self.assertLess(result.statistics.time, 1)
+        with self.assertRaises(ValueError):
+            MonteCarloTreeSearch().search(Game())
@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.game.game_types import BoardSquare, Movement
+from src.game.moves import encode_move
+from src.minimax.move_ordering import MoveOrdering
+
+T = TIGER_PLAYER
+G = GOAT_PLAYER
+
+
+class TestMoveOrdering(TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.game.board.board = np.array(
+            [
+                [T, G, 0, 0, T],
+                [0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+                [T, 0, 0, 0, T],
+            ]
+        )
+        self.game.game_state.positioned_goats = 1
+
+    def test_first_move_then_blocking_moves(self):
+        ordering = MoveOrdering()
+        moves = self.game.available_move_codes()
+
+        ordered = ordering.order(
+            self.game, moves, 0, encode_move(BoardSquare(3, 3))
+        )
+
+        self.assertEqual(ordered[0], encode_move(BoardSquare(3, 3)))
+        # Placing a goat in (0, 2) blocks the capture of (0, 1)
+        self.assertEqual(ordered[1], encode_move(BoardSquare(0, 2)))
+        self.assertCountEqual(ordered, moves)
+
+    def test_killers_and_history(self):
+        ordering = MoveOrdering()
+        ordering.record_cutoff(encode_move(BoardSquare(4, 2)), 3, 1)
+        ordering.record_cutoff(encode_move(BoardSquare(2, 2)), 1, 4)
+
+        ordered = ordering.order(
+            self.game, self.game.available_move_codes(), 3
+        )
+
+        self.assertEqual(
+            ordered[:3],
+            [
+                encode_move(BoardSquare(0, 2)),
+                encode_move(BoardSquare(4, 2)),
+                encode_move(BoardSquare(2, 2)),
+            ],
+        )
+
+    def test_keeps_two_killers(self):
+        ordering = MoveOrdering()
+        for move in (
+            Movement(BoardSquare(0, 0), BoardSquare(1, 0)),
+            BoardSquare(1, 1),
+            BoardSquare(2, 2),
+        ):
+            ordering.record_cutoff(encode_move(move), 0, 1)
+
+        self.assertEqual(
+            ordering.killers[0],
+            [encode_move(BoardSquare(2, 2)), encode_move(BoardSquare(1, 1))],
+        )
+
+    def test_age_forgets_killers_and_halves_history(self):
+        ordering = MoveOrdering()
+        ordering.record_cutoff(encode_move(BoardSquare(2, 2)), 1, 3)
+
+        ordering.age()
+
+        self.assertEqual(ordering.killers, [])
+        self.assertEqual(ordering.history[encode_move(BoardSquare(2, 2))], 4)
@@ -0,0 +1,66 @@
+import random
+from unittest import TestCase
+
+from src.game.game import Game
+from src.game.game_types import BoardSquare, Capture, Movement
+from src.game.moves import (
+    MOVE_CODES,
+    MOVES,
+    NUMBER_OF_MOVES,
+    decode_move,
+    encode_move,
+)
+from src.game.symmetry import SYMMETRIC_CODES, SYMMETRIES, transform_move
+
+
+class TestMoves(TestCase):
+    def test_codes_fit_in_a_byte(self):
+        self.assertLess(NUMBER_OF_MOVES, 256)
+        self.assertEqual(len(MOVE_CODES), NUMBER_OF_MOVES)
+
+        for code, move in enumerate(MOVES):
+            self.assertEqual(encode_move(move), code)
+            self.assertIs(decode_move(code), move)
+
+        self.assertEqual(encode_move(BoardSquare(1, 2)), 7)
+        self.assertIsInstance(decode_move(NUMBER_OF_MOVES - 1), Capture)
+        self.assertIsInstance(decode_move(25), Movement)
+
+    def test_invalid_moves_raise(self):
+        move = Movement(BoardSquare(0, 0), BoardSquare(3, 3))
+        with self.assertRaises(ValueError):
+            encode_move(move)
+        with self.assertRaises(ValueError):
+            Game().board.move(move)
+        with self.assertRaises(ValueError):
+            Game().ply(move)
+
+    def test_codes_match_moves(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            game = Game()
+            for _ in range(60):
+                if game.is_game_over():
+                    break
+
+                codes = game.available_move_codes()
+                moves = game.available_moves()
+                self.assertEqual([MOVES[code] for code in codes], moves)
+
+                # Making a move by its code gives the same position
+                code = rng.choice(codes)
+                key = game.zobrist_hash()
+                record = game.ply(MOVES[code])
+                expected = game.zobrist_hash()
+                game.undo(record)
+                self.assertEqual(game.zobrist_hash(), key)
+                game.ply_code(code)
+                self.assertEqual(game.zobrist_hash(), expected)
+
+    def test_symmetric_codes(self):
+        for symmetry in range(len(SYMMETRIES)):
+            for code, move in enumerate(MOVES):
+                self.assertEqual(
+                    SYMMETRIC_CODES[symmetry][code],
+                    encode_move(transform_move(move, symmetry)),
+                )
@@ -0,0 +1,50 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from src.game.game import Game
+from src.minimax.heuristics import heuristic
+from src.minimax.opening_book import (
+    OpeningBook,
+    book_move,
+    book_move_key,
+    build_book,
+)
+from src.minimax.search import search_best_move
+
+
+class TestOpeningBook(TestCase):
+    def test_move_keys(self):
+        game = Game()
+        game.ply(game.available_moves()[0])
+        for move in game.available_moves():
+            self.assertEqual(book_move(game, book_move_key(move)), move)
+
+    def test_lookup(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.bin")
+            count = build_book(path, plies=2, cutoff=2)
+            book = OpeningBook(path)
+
+            self.assertEqual(len(book), count)
+            # The initial position, and the first placements up to
+            # symmetry: the center, the inner corners, the inner and border
+            # middles, and the other border squares
+            self.assertEqual(count, 6)
+
+            game = Game()
+            for move in game.available_moves():
+                record = game.ply(move)
+                result = book.lookup(game)
+                expected = search_best_move(game, heuristic, cutoff=2)
+                # Moves of equal value may be chosen in another order
+                self.assertIn(result.move, game.available_moves())
+                self.assertEqual(result.value, expected.value)
+                self.assertEqual(result.statistics.cutoff, 2)
+
+                # Not in the book: two plies deep
+                game.ply(result.move)
+                self.assertIsNone(book.lookup(game))
+                game.undo(record)
+
+            del book
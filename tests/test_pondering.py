@@ -0,0 +1,63 @@
+import time
+from unittest import TestCase
+
+from src.game.game import Game
+from src.game.game_types import BoardSquare
+from src.minimax.heuristics import heuristic
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.pondering import Ponderer
+from src.minimax.search import search_best_move
+from src.minimax.transposition_table import TranspositionTable
+
+
+class TestPonderer(TestCase):
+    def test_plays_the_pondered_reply(self):
+        game = Game()
+        ponderer = Ponderer(heuristic, cutoff=3)
+        ponderer.start(game, BoardSquare(2, 2))
+        ponderer.wait()
+
+        game.ply(BoardSquare(2, 2))
+        result = ponderer.search(game)
+        expected = search_best_move(
+            game,
+            heuristic,
+            cutoff=3,
+            table=TranspositionTable(),
+            ordering=MoveOrdering(),
+        )
+
+        self.assertEqual((ponderer.hits, ponderer.misses), (1, 0))
+        self.assertEqual(result.value, expected.value)
+        self.assertIn(result.move, game.available_moves())
+
+    def test_symmetry(self):
+        game = Game()
+        ponderer = Ponderer(heuristic, cutoff=2, symmetry=True)
+        ponderer.start(game, BoardSquare(1, 1))
+        ponderer.wait()
+        self.assertTrue(ponderer._search.symmetry)
+
+        # Not the expected move, but its reply was searched as well
+        game.ply(BoardSquare(1, 3))
+        result = ponderer.search(game)
+        expected = search_best_move(game, heuristic, cutoff=2, symmetry=True)
+
+        self.assertEqual((ponderer.hits, ponderer.misses), (1, 0))
+        self.assertEqual(result.value, expected.value)
+        self.assertIn(result.move, game.available_moves())
+
+    def test_stop_interrupts_pondering(self):
+        game = Game()
+        ponderer = Ponderer(heuristic, time_budget=0.1)
+        ponderer.start(game)
+        time.sleep(0.2)
+
+        start = time.perf_counter()
+        ponderer.stop()
+        self.assertLess(time.perf_counter() - start, 1)
+
+        game.ply(BoardSquare(0, 1))
+        result = ponderer.search(game)
+        self.assertEqual(ponderer.misses, 1)
+        self.assertIn(result.move, game.available_moves())
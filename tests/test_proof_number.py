@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import TIGER_PLAYER
+from src.game.game import Game
+from src.game.game_types import BoardSquare, Capture
+from src.minimax.proof_number import (
+    INFINITE,
+    ProofNumberSearch,
+    ProofTable,
+    solve,
+)
+
+
+class TestProofNumberSearch(TestCase):
+    def test_capture_of_the_last_goat(self):
+        game = Game()
+        game.board.board = np.array(
+            [
+                [-1, 1, 0, 0, -1],
+                [0, 0, 0, 0, 0],
+                [0, 0, 1, 0, 0],
+                [0, 0, 0, 0, 0],
+                [-1, 0, 0, 0, -1],
+            ]
+        )
+        game.game_state.player = TIGER_PLAYER
+        game.game_state.positioned_goats = 10
+        game.game_state.captured_goats = 4
+
+        result = solve(game)
+
+        self.assertTrue(result.solved)
+        self.assertEqual(result.winner, TIGER_PLAYER)
+        self.assertEqual(
+            result.move,
+            Capture(BoardSquare(0, 0), BoardSquare(0, 1), BoardSquare(0, 2)),
+        )
+
+    def test_budget(self):
+        game = Game()
+
+        result = solve(game, max_nodes=500)
+
+        self.assertFalse(result.solved)
+        self.assertIsNone(result.winner)
+        # The game is left as it was
+        self.assertEqual(game.zobrist_hash(), Game().zobrist_hash())
+
+        reports = []
+        search = ProofNumberSearch(
+            game,
+            max_nodes=500,
+            report=lambda *numbers: reports.append(numbers),
+            report_every=100,
+        )
+        self.assertIsNone(search.prove(TIGER_PLAYER))
+        self.assertEqual(len(reports), 5)
+        self.assertTrue(all(0 < pn < INFINITE for _, pn, _ in reports))
+
+    def test_table_keeps_the_bigger_work(self):
+        table = ProofTable(max_memory=1)
+        self.assertEqual(len(table), 1)
+
+        table.store(1, 3, 4, work=10)
+        table.store(2, 5, 6, work=1)
+        self.assertEqual(table.probe(1), (3, 4))
+        self.assertEqual(table.probe(2), (1, 1))
+
+        table.store(2, 5, 6, work=20)
+        self.assertEqual(table.probe(2), (5, 6))
@@ -0,0 +1,103 @@
+import os
+import random
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.game.game_types import BoardSquare, Movement
+from src.game.records import (
+    GameRecord,
+    GameRecords,
+    append_records,
+    read_records,
+)
+
+
+def _random_record(seed: int) -> GameRecord:
+    rng = random.Random(seed)
+    game = Game()
+    plays = []
+    while not game.is_game_over() and len(plays) < 150:
+        moves = game.available_moves()
+        if not moves:
+            break
+        plays.append(rng.choice(moves))
+        game.ply(plays[-1])
+
+    return GameRecord.from_plays(
+        f"cutoff:{seed}", "mcts:time:0.1", game.get_winner(), plays, 4
+    )
+
+
+class TestGameRecords(TestCase):
+    def test_records_are_appended_and_read(self):
+        records = [_random_record(seed) for seed in range(5)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.bcr")
+            append_records(path, records[:2])
+            append_records(path, records[2:])
+
+            self.assertEqual(list(read_records(path)), records)
+            mapped = GameRecords(path)
+            self.assertEqual(len(mapped), len(records))
+            for index, record in enumerate(records):
+                self.assertEqual(mapped[index], record)
+                self.assertEqual(mapped.moves(index).tobytes(), record.moves)
+            # A byte per move, after the header and the settings
+            self.assertLess(
+                os.path.getsize(path),
+                sum(len(record.moves) + 32 for record in records),
+            )
+
+    def test_replay(self):
+        record = _random_record(7)
+        game = Game()
+        boards = record.boards()
+
+        self.assertEqual(len(boards), len(record.moves) + 1)
+        for ply, (position, play) in enumerate(
+            zip(record.positions(), record.plays + [None])
+        ):
+            self.assertEqual(position.zobrist_hash(), game.zobrist_hash())
+            self.assertTrue(
+                np.array_equal(boards[ply], game.board.board.reshape(-1))
+            )
+            if play is not None:
+                game.ply(play)
+
+        self.assertEqual(record.game().get_winner(), record.winner)
+        self.assertIn(record.winner, (GOAT_PLAYER, TIGER_PLAYER, None))
+
+    def test_invalid_records(self):
+        record = _random_record(0)
+        record.opening_plies = 256
+        with self.assertRaises(ValueError):
+            record.to_bytes()
+        record.opening_plies = -1
+        with self.assertRaises(ValueError):
+            record.to_bytes()
+
+        with self.assertRaises(ValueError):
+            # Not a move of the board
+            move = Movement(BoardSquare(0, 0), BoardSquare(4, 4))
+            GameRecord.from_plays("goat", "tiger", None, [move])
+
+    def test_invalid_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.bcr")
+            with open(path, "wb") as file:
+                file.write(b"not a record file")
+            with self.assertRaises(ValueError):
+                list(read_records(path))
+
+            os.remove(path)
+            append_records(path, [_random_record(0)])
+            with open(path, "r+b") as file:
+                file.truncate(os.path.getsize(path) - 1)
+            with self.assertRaises(ValueError):
+                list(read_records(path))
+            with self.assertRaises(ValueError):
+                GameRecords(path)
@@ -0,0 +1,220 @@
+from math import inf
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.minimax.batch_heuristics import heuristic_batch
+from src.minimax.heuristics import heuristic
+from src.minimax.minimax import alpha_beta_search
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.parallel import ParallelSearch
+from src.minimax.search import search_best_move
+from src.minimax.statistics import SearchStatistics
+from src.minimax.transposition_table import TranspositionTable
+
+T = TIGER_PLAYER
+G = GOAT_PLAYER
+
+
+def _positions():
+    yield Game()
+
+    game = Game()
+    game.board.board = np.array(
+        [
+            [T, 0, G, 0, T],
+            [0, G, 0, G, 0],
+            [0, 0, 0, 0, 0],
+            [0, G, 0, 0, 0],
+            [T, 0, G, 0, T],
+        ]
+    )
+    game.game_state.positioned_goats = 5
+    yield game
+
+    game = Game()
+    game.board.board = np.array(
+        [
+            [T, G, G, G, 0],
+            [G, G, 0, G, T],
+            [G, 0, T, G, G],
+            [G, G, 0, G, G],
+            [T, G, G, 0, G],
+        ]
+    )
+    game.game_state.positioned_goats = 20
+    game.game_state.captured_goats = 3
+    yield game
+
+
+def _value_after_captures(game: Game):
+    """Return the value of `game`, with the tigers to move, after the
+    captures they must play."""
+    winner = game.get_winner()
+    if winner is not None:
+        return winner * inf
+    if not game.board.evaluation_terms()[1]:
+        return heuristic(game)
+
+    values = []
+    for move in game.available_moves():
+        record = game.ply(move)
+        winner = game.get_winner()
+        values.append(winner * inf if winner is not None else heuristic(game))
+        game.undo(record)
+    return min(values)
+
+
+class TestSearchBestMove(TestCase):
+    def test_same_move_as_alpha_beta_search(self):
+        for game in _positions():
+            for cutoff in (1, 2):
+                root = alpha_beta_search(
+                    game=game, cutoff=cutoff, heuristic=heuristic
+                )
+                values = [child.value for child in root.children]
+                if game.game_state.player == GOAT_PLAYER:
+                    best = values.index(max(values))
+                else:
+                    best = values.index(min(values))
+
+                result = search_best_move(game, heuristic, cutoff=cutoff)
+
+                self.assertEqual(result.move, root.children[best].move)
+                self.assertEqual(result.value, values[best])
+                self.assertEqual(len(result.principal_variation), cutoff + 1)
+
+    def test_tree_search_passes_the_window_down(self):
+        for game in _positions():
+            statistics = SearchStatistics()
+            alpha_beta_search(
+                game=game, cutoff=3, heuristic=heuristic, statistics=statistics
+            )
+
+            result = search_best_move(game, heuristic, cutoff=3, pvs=False)
+
+            self.assertEqual(statistics.nodes, result.statistics.nodes)
+
+    def test_window_searches_give_same_move(self):
+        for game in _positions():
+            for cutoff in (2, 3, 4):
+                result = search_best_move(
+                    game, heuristic, cutoff=cutoff, pvs=False
+                )
+                pvs_result = search_best_move(game, heuristic, cutoff=cutoff)
+
+                self.assertEqual(pvs_result.move, result.move)
+                self.assertEqual(pvs_result.value, result.value)
+
+            result = search_best_move(
+                game, heuristic, time_budget=60, max_cutoff=4
+            )
+            aspiration_result = search_best_move(
+                game,
+                heuristic,
+                time_budget=60,
+                max_cutoff=4,
+                aspiration_window=5,
+            )
+            self.assertEqual(aspiration_result.move, result.move)
+            self.assertEqual(aspiration_result.value, result.value)
+
+    def test_batch_evaluation_gives_same_move(self):
+        for game in _positions():
+            result = search_best_move(game, heuristic, cutoff=2)
+            batch_result = search_best_move(
+                game, heuristic, cutoff=2, batch_heuristic=heuristic_batch
+            )
+
+            self.assertEqual(batch_result.move, result.move)
+            self.assertEqual(batch_result.value, result.value)
+
+    def test_quiescence_resolves_forced_captures(self):
+        for game in _positions():
+            values = []
+            for move in game.available_moves():
+                record = game.ply(move)
+                values.append(_value_after_captures(game))
+                game.undo(record)
+
+            result = search_best_move(
+                game, heuristic, cutoff=0, quiescence=True
+            )
+            batch_result = search_best_move(
+                game,
+                heuristic,
+                cutoff=0,
+                quiescence=True,
+                batch_heuristic=heuristic_batch,
+            )
+
+            self.assertEqual(result.value, max(values))
+            self.assertEqual(batch_result.value, max(values))
+
+    def test_reductions_search_fewer_nodes(self):
+        for game in _positions():
+            result = search_best_move(game, heuristic, cutoff=4)
+            reduced_result = search_best_move(
+                game, heuristic, cutoff=4, reductions=True
+            )
+
+            self.assertIn(reduced_result.move, game.available_moves())
+            self.assertGreater(reduced_result.statistics.reductions, 0)
+            self.assertLess(
+                reduced_result.statistics.nodes, result.statistics.nodes
+            )
+
+    def test_symmetry_gives_same_value(self):
+        for game in _positions():
+            for cutoff in (1, 2, 3):
+                result = search_best_move(game, heuristic, cutoff=cutoff)
+                symmetric_result = search_best_move(
+                    game,
+                    heuristic,
+                    cutoff=cutoff,
+                    table=TranspositionTable(),
+                    symmetry=True,
+                )
+
+                self.assertEqual(symmetric_result.value, result.value)
+                self.assertLessEqual(
+                    symmetric_result.statistics.nodes, result.statistics.nodes
+                )
+
+    def test_game_is_restored(self):
+        game = Game()
+        before = game.zobrist_hash()
+
+        search_best_move(game, heuristic, time_budget=0.05)
+
+        self.assertEqual(game.zobrist_hash(), before)
+
+
+class TestParallelSearch(TestCase):
+    def test_same_move_as_search_best_move(self):
+        with ParallelSearch(heuristic, workers=2) as parallel:
+            for game in _positions():
+                for cutoff in (1, 2):
+                    for ordering in (None, MoveOrdering()):
+                        result = search_best_move(
+                            game, heuristic, cutoff=cutoff, ordering=ordering
+                        )
+                        if ordering is not None:
+                            # The search changed it
+                            ordering = MoveOrdering()
+                        parallel_result = parallel.search(
+                            game, cutoff, ordering=ordering
+                        )
+
+                        self.assertEqual(parallel_result.move, result.move)
+                        self.assertEqual(parallel_result.value, result.value)
+                        statistics = parallel_result.statistics
+                        self.assertEqual(
+                            statistics.max_depth, result.statistics.max_depth
+                        )
+                        self.assertEqual(statistics.cutoff, cutoff)
+                        self.assertEqual(
+                            statistics.depth_nodes, [statistics.nodes]
+                        )
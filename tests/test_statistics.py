@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+from math import inf, nan
+from unittest import TestCase
+
+from src.game.game import Game
+from src.minimax.heuristics import heuristic
+from src.minimax.minimax import alpha_beta_search
+from src.minimax.move_ordering import MoveOrdering
+from src.minimax.search import search_best_move
+from src.minimax.statistics import SearchStatistics, log_statistics
+from src.minimax.transposition_table import TranspositionTable
+
+
+def _count_nodes(node) -> int:
+    return 1 + sum(_count_nodes(child) for child in node.children)
+
+
+class TestSearchStatistics(TestCase):
+    def test_search_best_move_counters(self):
+        result = search_best_move(
+            Game(),
+            heuristic,
+            time_budget=0.2,
+            table=TranspositionTable(),
+            ordering=MoveOrdering(),
+        )
+        statistics = result.statistics
+
+        self.assertGreater(statistics.nodes, statistics.leaves)
+        # The search that ran out of time may have gone a ply deeper
+        self.assertIn(
+            statistics.max_depth,
+            (statistics.cutoff + 1, statistics.cutoff + 2),
+        )
+        self.assertEqual(
+            statistics.beta_cutoffs, sum(statistics.cutoff_indexes)
+        )
+        self.assertEqual(len(statistics.depth_nodes), statistics.cutoff)
+        self.assertLessEqual(sum(statistics.depth_nodes), statistics.nodes)
+        self.assertGreater(statistics.table_probes, statistics.table_hits)
+        self.assertGreater(statistics.effective_branching_factor, 1)
+
+    def test_alpha_beta_search_counters(self):
+        statistics = SearchStatistics()
+        root = alpha_beta_search(
+            game=Game(), cutoff=2, heuristic=heuristic, statistics=statistics
+        )
+
+        self.assertEqual(statistics.nodes, _count_nodes(root))
+        self.assertEqual(statistics.max_depth, 3)
+        self.assertGreater(statistics.beta_cutoffs, 0)
+
+    def test_log_statistics(self):
+        statistics = SearchStatistics(nodes=10, leaves=7)
+        statistics.record_cutoff(2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "statistics.jsonl")
+            log_statistics(path, statistics, move="(0, 1)")
+            log_statistics(path, statistics, move="(0, 2)")
+
+            with open(path) as file:
+                lines = [json.loads(line) for line in file]
+
+        self.assertEqual(
+            [line["move"] for line in lines], ["(0, 1)", "(0, 2)"]
+        )
+        self.assertEqual(lines[0]["cutoff_indexes"], [0, 0, 1])
+        self.assertEqual(lines[0]["first_move_cutoff_rate"], 0)
+
+    def test_log_non_finite_values(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "statistics.jsonl")
+            for value in (inf, -inf, nan):
+                log_statistics(path, SearchStatistics(), value=value)
+
+            with open(path) as file:
+                # Fails on the NaN and Infinity that aren't valid JSON
+                lines = [
+                    json.loads(line, parse_constant=self.fail) for line in file
+                ]
+
+        self.assertEqual(
+            [line["value"] for line in lines], ["inf", "-inf", None]
+        )
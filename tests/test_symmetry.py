@@ -0,0 +1,81 @@
+import random
+from dataclasses import replace
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+
+from src.game.game import Game
+from src.game.symmetry import (
+    INVERSES,
+    SYMMETRIES,
+    canonical_hash,
+    transform_mask,
+    transform_move,
+)
+from src.game.topology import JUMP_TRIPLES, NEIGHBORS
+
+
+def _random_game(seed: int, plies: int) -> Game:
+    rng = random.Random(seed)
+    game = Game()
+    for _ in range(plies):
+        if game.is_game_over():
+            break
+        game.ply(rng.choice(game.available_moves()))
+
+    return game
+
+
+def _transformed(game: Game, symmetry: int) -> Game:
+    tigers, goats = game.board.snapshot()[:2]
+    tigers = transform_mask(tigers, symmetry)
+    goats = transform_mask(goats, symmetry)
+    board = np.array(
+        [
+            TIGER_PLAYER if tigers >> i & 1 else GOAT_PLAYER * (goats >> i & 1)
+            for i in range(25)
+        ]
+    )
+
+    image = Game()
+    image.board.board = board.reshape(5, 5)
+    image.game_state = replace(game.game_state)
+    return image
+
+
+class TestSymmetry(TestCase):
+    def test_symmetries_keep_the_lines(self):
+        triples = set(JUMP_TRIPLES)
+        for symmetry in SYMMETRIES:
+            for square, neighbors in enumerate(NEIGHBORS):
+                self.assertEqual(
+                    set(NEIGHBORS[symmetry[square]]),
+                    {symmetry[neighbor] for neighbor in neighbors},
+                )
+            self.assertEqual(
+                {tuple(symmetry[i] for i in triple) for triple in triples},
+                triples,
+            )
+
+    def test_inverses(self):
+        mask = 0b1011001110001010110100111
+        for symmetry, inverse in enumerate(INVERSES):
+            image = transform_mask(mask, symmetry)
+            self.assertEqual(transform_mask(image, inverse), mask)
+
+    def test_symmetric_positions_share_hash_and_moves(self):
+        for seed in range(20):
+            game = _random_game(seed, seed % 12)
+            key, _ = canonical_hash(game)
+            for symmetry in range(len(SYMMETRIES)):
+                image = _transformed(game, symmetry)
+                self.assertEqual(canonical_hash(image)[0], key)
+                self.assertEqual(
+                    sorted(map(str, image.available_moves())),
+                    sorted(
+                        str(transform_move(move, symmetry))
+                        for move in game.available_moves()
+                    ),
+                )
@@ -0,0 +1,237 @@
+import tempfile
+from math import inf
+from unittest import TestCase
+
+import numpy as np
+
+from src.constants import TIGER_PLAYER, TOTAL_NUMBER_OF_GOATS
+from src.game.game import Game
+from src.game.game_types import Capture
+from src.minimax.batch_heuristics import heuristic_batch
+from src.minimax.heuristics import heuristic
+from src.minimax.proof_number import solve
+from src.minimax.search import search_best_move
+from src.minimax.tablebase import (
+    DRAW,
+    Tablebase,
+    level_path,
+    level_size,
+    position_index,
+    position_masks,
+    solve_level,
+)
+
+
+def _game(tigers: int, goats: int, player: int, captured: int) -> Game:
+    board = np.zeros(25, dtype=int)
+    for square in range(25):
+        if tigers >> square & 1:
+            board[square] = -1
+        elif goats >> square & 1:
+            board[square] = 1
+
+    game = Game()
+    game.board.board = board.reshape(5, 5)
+    game.game_state.player = player
+    game.game_state.positioned_goats = TOTAL_NUMBER_OF_GOATS
+    game.game_state.captured_goats = captured
+    return game
+
+
+class TestTablebase(TestCase):
+    # A level that doesn't depend on others: with 4 goats already
+    # captured, any capture wins. It's not reachable in a game (there
+    # would be 16 goats), but the rules are the same.
+    GOATS = 20
+    CAPTURED = 4
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        path = level_path(cls.directory.name, cls.GOATS, cls.CAPTURED)
+        out = np.memmap(
+            path, dtype=np.int16, mode="w+", shape=level_size(cls.GOATS)
+        )
+        solve_level(cls.GOATS, cls.CAPTURED, None, out)
+        out.flush()
+        del out
+
+        cls.tablebase = Tablebase(cls.directory.name)
+        cls.codes = cls.tablebase.levels[cls.GOATS, cls.CAPTURED]
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.tablebase, cls.codes
+        cls.directory.cleanup()
+
+    def test_index_round_trip(self):
+        index = np.random.default_rng(0).integers(0, len(self.codes), 1000)
+        tigers, goats, player = position_masks(index, self.GOATS)
+
+        self.assertTrue((np.bitwise_count(tigers) == 4).all())
+        self.assertTrue((np.bitwise_count(goats) == self.GOATS).all())
+        self.assertFalse((tigers & goats).any())
+        np.testing.assert_array_equal(
+            position_index(tigers, goats, player), index
+        )
+
+    def test_results_match_search(self):
+        rng = np.random.default_rng(1)
+        for plies in range(1, 5):
+            # Positions won in `plies` plies by either side
+            index = np.flatnonzero(np.abs(self.codes) == plies + 1)
+            for position in rng.choice(index, 5):
+                tigers, goats, player = position_masks(
+                    np.array([position]), self.GOATS
+                )
+                game = _game(int(tigers[0]), int(goats[0]), int(player[0]), 4)
+                code = self.tablebase.probe(game)
+                self.assertEqual(code, self.codes[position])
+
+                result = search_best_move(game, heuristic, cutoff=plies)
+                self.assertEqual(result.value, inf if code > 0 else -inf)
+
+                # A cutoff searches one more ply than it, so this is one
+                # ply less than needed to see the end
+                if plies > 1:
+                    result = search_best_move(
+                        game, heuristic, cutoff=plies - 2
+                    )
+                    self.assertNotEqual(abs(result.value), inf)
+
+    def test_proof_number_search_matches(self):
+        rng = np.random.default_rng(2)
+        for plies in (1, 2, 5, 9, 13):
+            index = np.flatnonzero(np.abs(self.codes) == plies + 1)
+            for position in rng.choice(index, 5):
+                tigers, goats, player = position_masks(
+                    np.array([position]), self.GOATS
+                )
+                game = _game(int(tigers[0]), int(goats[0]), int(player[0]), 4)
+                code = self.codes[position]
+
+                result = solve(game, max_nodes=100_000)
+                self.assertTrue(result.solved)
+                self.assertEqual(result.winner, 1 if code > 0 else -1)
+                if result.winner == game.game_state.player:
+                    # The move keeps the win
+                    game.ply(result.move)
+                    self.assertEqual(self.tablebase.value(game), inf * code)
+
+        for position in rng.choice(np.flatnonzero(self.codes == DRAW), 10):
+            tigers, goats, player = position_masks(
+                np.array([position]), self.GOATS
+            )
+            game = _game(int(tigers[0]), int(goats[0]), int(player[0]), 4)
+
+            # Draws may not be disproven within the budget, but no winner
+            # may be proven
+            result = solve(game, max_nodes=20_000)
+            self.assertIsNone(result.winner)
+
+    def test_search_uses_tablebase(self):
+        position = np.flatnonzero(self.codes == 10)[0]
+        tigers, goats, player = position_masks(
+            np.array([position]), self.GOATS
+        )
+        game = _game(int(tigers[0]), int(goats[0]), int(player[0]), 4)
+
+        result = search_best_move(
+            game, heuristic, cutoff=0, tablebase=self.tablebase
+        )
+
+        self.assertEqual(result.value, inf)
+
+    def test_batched_leaves_use_tablebase(self):
+        rng = np.random.default_rng(3)
+        won = 0
+        for _ in range(20):
+            # A goat left to place, after which the positions are in the
+            # tablebase
+            squares = rng.permutation(25)
+            game = _game(
+                sum(1 << int(square) for square in squares[:4]),
+                sum(1 << int(square) for square in squares[4:23]),
+                TIGER_PLAYER,
+                4,
+            )
+            game.game_state.positioned_goats = TOTAL_NUMBER_OF_GOATS - 1
+
+            result = search_best_move(
+                game, heuristic, cutoff=1, tablebase=self.tablebase
+            )
+            batched = search_best_move(
+                game,
+                heuristic,
+                cutoff=1,
+                batch_heuristic=heuristic_batch,
+                tablebase=self.tablebase,
+            )
+
+            self.assertEqual(batched.value, result.value)
+            won += abs(result.value) == inf
+
+        self.assertGreater(won, 0)
+
+    def test_positions_outside_tablebase(self):
+        self.assertIsNone(self.tablebase.probe(Game()))
+        self.assertIn(DRAW, self.codes)
+
+
+class TestChainedLevels(TestCase):
+    # A level whose captures lead to another: with 3 goats captured, a
+    # capture reaches the level with 4, and the last goat. They aren't
+    # reachable in a game either.
+    LEVELS = ((0, 4), (1, 3))
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        next_level = None
+        for goats, captured in cls.LEVELS:
+            path = level_path(cls.directory.name, goats, captured)
+            out = np.memmap(
+                path, dtype=np.int16, mode="w+", shape=level_size(goats)
+            )
+            solve_level(goats, captured, next_level, out)
+            out.flush()
+            next_level = out
+
+        del next_level, out
+        cls.tablebase = Tablebase(cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.tablebase
+        cls.directory.cleanup()
+
+    def test_results_match_search(self):
+        goats, captured = self.LEVELS[1]
+        codes = self.tablebase.levels[goats, captured]
+        rng = np.random.default_rng(4)
+        captures = 0
+        for plies in range(1, 5):
+            index = np.flatnonzero(np.abs(codes) == plies + 1)
+            for position in rng.choice(index, 5):
+                tigers, goat_masks, player = position_masks(
+                    np.array([position]), goats
+                )
+                game = _game(
+                    int(tigers[0]),
+                    int(goat_masks[0]),
+                    int(player[0]),
+                    captured,
+                )
+                code = self.tablebase.probe(game)
+                self.assertEqual(code, codes[position])
+
+                result = search_best_move(game, heuristic, cutoff=plies - 1)
+                self.assertEqual(result.value, inf if code > 0 else -inf)
+                self.assertEqual(self.tablebase.value(game), result.value)
+                captures += any(
+                    isinstance(play, Capture)
+                    for play in result.principal_variation
+                )
+
+        # Some of the wins go through the next level
+        self.assertGreater(captures, 0)
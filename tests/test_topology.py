@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from src.game.game_types import BoardSquare
+from src.game.topology import (
+    JUMP_TRIPLES,
+    JUMPS,
+    NEIGHBORS,
+    SQUARES,
+    square_index,
+)
+from src.utils import neighboring_squares
+
+
+class TestTopology(TestCase):
+    def test_neighbors(self):
+        self.assertCountEqual(
+            neighboring_squares(BoardSquare(0, 0)),
+            [BoardSquare(0, 1), BoardSquare(1, 0), BoardSquare(1, 1)],
+        )
+        # Squares without diagonal lines
+        self.assertCountEqual(
+            neighboring_squares(BoardSquare(1, 2)),
+            [
+                BoardSquare(0, 2),
+                BoardSquare(2, 2),
+                BoardSquare(1, 1),
+                BoardSquare(1, 3),
+            ],
+        )
+
+    def test_neighbors_are_symmetric(self):
+        for index, neighbors in enumerate(NEIGHBORS):
+            for neighbor in neighbors:
+                self.assertIn(index, NEIGHBORS[neighbor])
+
+    def test_jumps_follow_lines(self):
+        for start, over, landing in JUMP_TRIPLES:
+            self.assertIn(over, NEIGHBORS[start])
+            self.assertIn(landing, NEIGHBORS[over])
+            self.assertEqual(over - start, landing - over)
+
+    def test_jumps_of_square(self):
+        jumps = [
+            (SQUARES[over], SQUARES[landing])
+            for over, landing in JUMPS[square_index(BoardSquare(2, 1))]
+        ]
+
+        self.assertCountEqual(
+            jumps,
+            [
+                (BoardSquare(1, 1), BoardSquare(0, 1)),
+                (BoardSquare(3, 1), BoardSquare(4, 1)),
+                (BoardSquare(2, 2), BoardSquare(2, 3)),
+            ],
+        )
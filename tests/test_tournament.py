@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from src.constants import GOAT_PLAYER, TIGER_PLAYER
+from src.game.game import Game
+from src.game.records import read_records
+from src.tournament import EngineSettings, play_game, run_tournament
+
+
+T = TIGER_PLAYER
+G = GOAT_PLAYER
+
+
+def _blocked_goats() -> Game:
+    """Return a game where the goats are to move and can't."""
+    game = Game()
+    game.board.board = np.array(
+        [
+            [0, T, G, G, G],
+            [T, T, G, G, G],
+            [G, G, G, G, G],
+            [G, G, G, G, G],
+            [G, G, G, G, T],
+        ]
+    )
+    game.game_state.positioned_goats = 20
+    return game
+
+
+class TestTournament(TestCase):
+    def test_parse_settings(self):
+        self.assertEqual(
+            EngineSettings.parse("cutoff:3"), EngineSettings(cutoff=3)
+        )
+        self.assertEqual(
+            EngineSettings.parse("heuristic:time:0.5"),
+            EngineSettings(time_budget=0.5),
+        )
+        self.assertEqual(
+            EngineSettings.parse("time:0.5:reductions"),
+            EngineSettings(time_budget=0.5, reductions=True),
+        )
+        self.assertEqual(
+            EngineSettings.parse("cutoff:4:quiescence:symmetry").name,
+            "heuristic:cutoff:4:quiescence:symmetry",
+        )
+        self.assertEqual(
+            EngineSettings.parse("mcts:iterations:500:prior").name,
+            "mcts:iterations:500:prior",
+        )
+        self.assertEqual(
+            EngineSettings.parse("mcts:time:0.5"),
+            EngineSettings(engine="mcts", time_budget=0.5),
+        )
+        with self.assertRaises(ValueError):
+            EngineSettings.parse("unknown:cutoff:3")
+        with self.assertRaises(ValueError):
+            EngineSettings.parse("mcts:cutoff:3")
+        with self.assertRaises(ValueError):
+            EngineSettings.parse("cutoff:3:unknown")
+
+    def test_game_ends_in_draw_after_max_plies(self):
+        engine = EngineSettings(cutoff=0)
+        result = play_game(engine, engine, seed=1, max_plies=6)
+
+        self.assertEqual(result.plies, 6)
+        self.assertIsNone(result.winner)
+        self.assertEqual(len(result.opening), 4)
+
+    def test_blocked_player_loses(self):
+        tiger = EngineSettings(cutoff=1)
+        for goat in (
+            EngineSettings(cutoff=2),
+            EngineSettings.parse("mcts:iterations:10"),
+        ):
+            with patch("src.tournament.Game", return_value=_blocked_goats()):
+                result = play_game(goat, tiger, seed=0, opening_plies=0)
+
+            self.assertEqual(result.winner, "tiger")
+            self.assertEqual(result.plies, 0)
+            self.assertEqual(result.record.winner, TIGER_PLAYER)
+
+    def test_results_are_appended(self):
+        engines = [EngineSettings(cutoff=0), EngineSettings(cutoff=1)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            records_path = os.path.join(directory, "games.bcr")
+            for _ in range(2):
+                run_tournament(
+                    engines,
+                    1,
+                    path,
+                    workers=1,
+                    max_plies=10,
+                    records=records_path,
+                )
+
+            with open(path) as file:
+                lines = [json.loads(line) for line in file]
+            records = list(read_records(records_path))
+
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(
+            {(line["goat"], line["tiger"]) for line in lines},
+            {
+                ("heuristic:cutoff:0", "heuristic:cutoff:1"),
+                ("heuristic:cutoff:1", "heuristic:cutoff:0"),
+            },
+        )
+        self.assertEqual(
+            sorted((record.goat, record.moves) for record in records),
+            sorted((line["goat"], bytes(line["moves"])) for line in lines),
+        )
+        self.assertTrue(all(len(record.moves) == 10 for record in records))
@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from src.minimax.transposition_table import EXACT, TranspositionTable
+
+
+class TestTranspositionTable(TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(max_memory=2**12)
+        # Keys that fall in the same slot
+        self.first = 1
+        self.second = 1 + len(self.table)
+
+    def test_keeps_deeper_entry(self):
+        self.table.store(self.first, 5, EXACT, 10, 0)
+        self.table.store(self.second, 2, EXACT, 20, 1)
+
+        self.assertIsNotNone(self.table.probe(self.first))
+        self.assertIsNone(self.table.probe(self.second))
+
+    def test_entries_of_older_searches_are_replaced(self):
+        self.table.store(self.first, 5, EXACT, 10, 0)
+        self.table.new_search()
+
+        self.assertEqual(self.table.probe(self.first).value, 10)
+
+        self.table.store(self.second, 2, EXACT, 20, 1)
+
+        self.assertIsNone(self.table.probe(self.first))
+        self.assertEqual(self.table.probe(self.second).value, 20)